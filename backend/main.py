@@ -2,17 +2,58 @@
 FastAPI entry point — mounts all routers, CORS, and serves the frontend.
 """
 # api
+import asyncio
+import hashlib
+import importlib
+import logging
+import mimetypes
+import os
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 
-# Ensure the 'backend' directory is in the path for internal imports
-sys.path.append(str(Path(__file__).parent))
+# Internal imports are top-level (core., services., routers., store), so the
+# 'backend' directory must be importable. `uvicorn main:app` from backend/
+# already has it on sys.path — only add it when launched from elsewhere
+# (e.g. `uvicorn backend.main:app`), so finders don't scan it twice.
+_BACKEND_DIR = str(Path(__file__).resolve().parent)
+if _BACKEND_DIR not in {str(Path(p or ".").resolve()) for p in sys.path}:
+    sys.path.insert(0, _BACKEND_DIR)
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Lifespan — warm the store off the event loop, then start the auto-fetcher
+# ---------------------------------------------------------------------------
+async def _bg_init():
+    import store
+    from services.fetcher_service import run_auto_fetcher
+
+    # Nothing awaits this task until shutdown, so log failures here rather
+    # than leave them to "exception was never retrieved" at exit.
+    try:
+        # Disk bootstrap runs in a worker thread so /api/health answers immediately
+        await asyncio.to_thread(store.initialize_from_disk)
+        await run_auto_fetcher()
+    except Exception:
+        logger.exception("[STARTUP] Background init failed")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    task = asyncio.create_task(_bg_init())
+    yield
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
 
-from routers import analysis, charts, data, export, filters, indices, sync
 
 # ---------------------------------------------------------------------------
 # App
@@ -21,38 +62,49 @@ app = FastAPI(
     title="Index Gamma Exposure API",
     description="REST API for option chain gamma exposure analysis (Nifty, BankNifty, Sensex)",
     version="1.0.0",
+    lifespan=lifespan,
+    # orjson for every router (charts/analysis already opted in per router)
+    default_response_class=ORJSONResponse,
 )
 
-@app.on_event("startup")
-async def startup_event():
-    import store
-    store.initialize_from_disk()
-    
-    # Start auto-fetcher
-    from services.fetcher_service import run_auto_fetcher
-    import asyncio
-    asyncio.create_task(run_auto_fetcher())
-
 # ---------------------------------------------------------------------------
-# CORS — allow browser requests from any origin (dev convenience)
+# CORS — any origin by default (dev convenience); FRONTEND_ORIGIN pins it.
+# Explicit method/header lists let Starlette answer preflights from its
+# precomputed headers instead of echoing the request back.
 # ---------------------------------------------------------------------------
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=[o.strip() for o in os.getenv("FRONTEND_ORIGIN", "*").split(",") if o.strip()],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
 )
 
+# ---------------------------------------------------------------------------
+# Compression — chart figures are hundreds of KB of float arrays and repeated
+# keys, which gzip shrinks several-fold. Level 5 is most of level 9's ratio
+# at a fraction of its CPU; tiny bodies (health, 304s) are left alone.
+# ---------------------------------------------------------------------------
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # ---------------------------------------------------------------------------
 # Routers
 # ---------------------------------------------------------------------------
-app.include_router(indices.router)
-app.include_router(data.router)
-app.include_router(analysis.router)
-app.include_router(charts.router)
-app.include_router(export.router)
-app.include_router(sync.router)
-app.include_router(filters.router)
+# Each router drags in pandas/plotly/etc., so only the ones listed in
+# API_ROUTERS (comma-separated, default: all) are imported. Mounting still
+# happens at import time: routes added after the "/" static mount below would
+# never be reached.
+_ROUTER_MODULES = ("indices", "data", "analysis", "charts", "export", "sync", "filters")
+
+
+def _include(name: str) -> None:
+    mod = importlib.import_module(f"routers.{name}")
+    app.include_router(mod.router)
+
+
+_enabled = os.getenv("API_ROUTERS")
+for _name in _ROUTER_MODULES:
+    if _enabled is None or _name in _enabled.split(","):
+        _include(_name)
 
 # ---------------------------------------------------------------------------
 # Health check  (must be BEFORE the static file mount)
@@ -65,9 +117,37 @@ def health():
 # ---------------------------------------------------------------------------
 # Serve frontend static files (catch-all — must be LAST)
 # ---------------------------------------------------------------------------
+# The SPA is ~150 KB, so it is read into memory once at import and served with
+# a content-hash ETag — no per-request stat()/open(). Restart to pick up edits.
 FRONTEND_DIR = Path(__file__).parent.parent / "frontend"
 
+
+def _load_frontend(root: Path) -> dict[str, tuple[bytes, str, str]]:
+    """{relative posix path: (body, etag, content type)} for every file under root."""
+    files = {}
+    for path in root.rglob("*"):
+        if not path.is_file():
+            continue
+        body = path.read_bytes()
+        etag = '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+        ctype = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        files[path.relative_to(root).as_posix()] = (body, etag, ctype)
+    return files
+
+
 if FRONTEND_DIR.exists():
-    app.mount("/", StaticFiles(directory=str(FRONTEND_DIR), html=True), name="frontend")
+    _FRONTEND_FILES = _load_frontend(FRONTEND_DIR)
+
+    @app.api_route("/{full_path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+    def frontend(full_path: str, request: Request):
+        key = full_path.strip("/")
+        entry = _FRONTEND_FILES.get(key) or _FRONTEND_FILES.get(f"{key}/index.html".lstrip("/"))
+        if entry is None:
+            raise HTTPException(status_code=404, detail="Not Found")
+        body, etag, ctype = entry
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type=ctype, headers=headers)
 
 # Debug expiry issue for stocks, fix timestamp in git - supabase
\ No newline at end of file
@@ -11,6 +11,7 @@ GET  /health             Liveness probe for Render
 from __future__ import annotations
 
 import logging
+import time
 from contextlib import asynccontextmanager
 from typing import Optional
 
@@ -66,6 +67,15 @@ app.add_middleware(
 # Supabase client (reused across requests)
 _supabase = db.get_client(config.SUPABASE_URL, config.SUPABASE_KEY)
 
+# Last GET /data response as one (key, at, payload) tuple, replaced whole so a
+# concurrent poll never pairs a fresh key with a stale payload. Repeated sync
+# polls inside DATA_CACHE_TTL seconds reuse it instead of re-querying
+# Supabase; DELETE /data bumps the epoch once its update has landed, so a poll
+# right after a sync never sees the rows it just removed.
+DATA_CACHE_TTL = 1.5
+_data_epoch = 0
+_last_data: tuple = (None, 0.0, None)
+
 
 # ---------------------------------------------------------------------------
 # Request / Response schemas
@@ -103,12 +113,21 @@ def get_data(since: Optional[str] = Query(None, description="ISO-8601 timestamp
     Return all unsynced option chain snapshots.
     Optionally filter to rows captured after `since`.
     """
-    rows = db.get_unsynced(_supabase, since=since)
-    return {
+    global _last_data
+    key = (since, _data_epoch)
+    now = time.monotonic()
+    cached_key, cached_at, cached_payload = _last_data
+    if cached_key == key and now - cached_at < DATA_CACHE_TTL:
+        return cached_payload
+
+    rows = db.get_pending(_supabase, since=since)
+    payload = {
         "count": len(rows),
         "since": since,
         "snapshots": rows,
     }
+    _last_data = (key, now, payload)
+    return payload
 
 
 @app.delete("/data")
@@ -117,9 +136,15 @@ def delete_data(body: DeleteDataRequest):
     Mark the provided snapshot IDs as synced.
     The local app calls this after successfully saving the CSV files.
     """
+    global _data_epoch, _last_data
     if not body.ids:
         raise HTTPException(status_code=400, detail="No IDs provided")
-    ok = db.mark_synced(_supabase, body.ids)
+    ok = db.delete_rows(_supabase, body.ids)
+    # Invalidate only after the delete: a poll that read the rows meanwhile
+    # cached them under the old epoch, which no later poll matches. Done on
+    # failure too, since some chunks may have been deleted.
+    _data_epoch += 1
+    _last_data = (None, 0.0, None)
     if not ok:
         raise HTTPException(status_code=500, detail="Failed to mark rows as synced")
     return {"success": True, "synced_count": len(body.ids)}
@@ -6,17 +6,79 @@ self-contained so the Render service has no dependency on the local app.
 from __future__ import annotations
 
 import calendar
+import hashlib
 import logging
-from datetime import datetime, timedelta, timezone
-from typing import Optional
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from math import isfinite
+from operator import itemgetter
+from statistics import median
+from typing import TYPE_CHECKING, Optional
 from zoneinfo import ZoneInfo
 
-import pandas as pd
-import requests
-import json
+import orjson
+
+# numpy / pandas / requests are imported inside the functions that use them so
+# that importing this module (uvicorn boot, Render health check) stays cheap.
+if TYPE_CHECKING:
+    import pandas as pd
+    import requests
 
 logger = logging.getLogger(__name__)
 
+IST = ZoneInfo("Asia/Kolkata")
+
+
+def now_ist() -> datetime:
+    """Current wall-clock time in IST."""
+    return datetime.now(IST)
+
+
+# ---------------------------------------------------------------------------
+# HTTP session — one pooled keep-alive connection set shared by all fetches
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def _get_session() -> "requests.Session":
+    """Create the shared Session on first use."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+    ))
+    return session
+
+
+# sha256 of the last token Upstox answered 401 to. Until a different token is
+# supplied (POST /set-token), runs skip the API instead of re-hitting it with a
+# token that is known to be dead.
+_bad_token_hash: Optional[str] = None
+
+
+def _token_hash(access_token: str) -> str:
+    return hashlib.sha256(access_token.encode()).hexdigest()
+
+
+def token_rejected(access_token: str) -> bool:
+    """True if Upstox already returned 401 for this exact token."""
+    return _bad_token_hash is not None and _token_hash(access_token) == _bad_token_hash
+
+
+@lru_cache(maxsize=4)
+def _auth_headers(access_token: str) -> dict:
+    """Upstox request headers, built once per token."""
+    return {
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+        "Authorization": f"Bearer {access_token}",
+    }
+
 
 # ---------------------------------------------------------------------------
 # Expiry helpers
@@ -26,58 +88,83 @@ def get_active_expiries(instrument_key: str, access_token: str) -> list[str]:
     """Fetch active expiry dates from Upstox (Real-time)."""
     url = "https://api.upstox.com/v2/option/contract"
     params = {"instrument_key": instrument_key}
-    headers = {"Accept": "application/json", "Authorization": f"Bearer {access_token}"}
     try:
-        resp = requests.get(url, params=params, headers=headers, timeout=10)
+        resp = _get_session().get(url, params=params, headers=_auth_headers(access_token), timeout=10)
         resp.raise_for_status()
-        data = resp.json().get("data", [])
+        data = orjson.loads(resp.content).get("data", [])
         return sorted(list(set(item.get("expiry") for item in data if item.get("expiry"))))
     except Exception as exc:
         logger.error("[EXPIRY-API] Failed for %s: %s", instrument_key, exc)
         return []
 
 
-def get_next_expiry(index_name: str, indices: dict, access_token: str, cutoff_hour: int = 16) -> str:
+# Expiry resolved from the Upstox API, keyed on
+# (instrument_key, today.toordinal(), past_cutoff). The answer can only change
+# when the day rolls over or the cutoff hour passes, so the scheduler asks the
+# contract endpoint at most twice per instrument per day.
+_api_expiry_cache: dict[tuple[str, int, bool], str] = {}
+
+
+def get_next_expiry(index_name: str, indices: dict, access_token: str, cutoff_hour: int = 16,
+                    now: Optional[datetime] = None) -> str:
     """Return next expiry date (YYYY-MM-DD) fetching from Upstox API.
     
     Falls back to calculation logic if API lookup fails.
     For stocks, uses RELIANCE as proxy for generic equity derivatives series.
+    `now` is the IST clock to evaluate against (defaults to the current time).
     """
-    ist = ZoneInfo("Asia/Kolkata")
-    now = datetime.now(ist)
+    now = now or now_ist()
     today = now.date()
+    past_cutoff = now.hour >= cutoff_hour
     index_config = indices.get(index_name)
     if not index_config:
         raise ValueError(f"Unknown index/stock: {index_name}")
 
     # 1. API Lookup — use the instrument's own key (ISIN format for stocks)
     lookup_key = index_config["instrument_key"]
-    
+    cache_key = (lookup_key, today.toordinal(), past_cutoff)
+    cached = _api_expiry_cache.get(cache_key)
+    if cached:
+        return cached
+
     api_expiries = get_active_expiries(lookup_key, access_token)
     if api_expiries:
+        expiry = api_expiries[-1]
         for exp_str in api_expiries:
             exp_date = datetime.strptime(exp_str, "%Y-%m-%d").date()
-            if exp_date > today: return exp_str
-            if exp_date == today:
-                if now.hour < cutoff_hour:
-                    return exp_str
-        return api_expiries[-1]
-
-    # 2. Fallback Calculation
+            if exp_date > today or (exp_date == today and not past_cutoff):
+                expiry = exp_str
+                break
+        # Drop earlier days' entries so the cache stays one day's worth.
+        for stale in [k for k in _api_expiry_cache if k[1] != cache_key[1]]:
+            del _api_expiry_cache[stale]
+        _api_expiry_cache[cache_key] = expiry
+        return expiry
+
+    # 2. Fallback Calculation (failures are not cached — retry the API next cycle)
     logger.info("[EXPIRY-FALLBACK] Backing up to calculation for %s", index_name)
-    expiry_type = index_config["expiry_type"]
-    expiry_day = index_config.get("expiry_day", 1)
+    return _expiry_cached(
+        index_name, today.toordinal(), past_cutoff,
+        index_config["expiry_type"], index_config.get("expiry_day", 1),
+    )
+
+
+@lru_cache(maxsize=64)
+def _expiry_cached(index_name: str, ordinal: int, past_cutoff: bool,
+                   expiry_type: str, expiry_day: int) -> str:
+    """Calendar-based expiry for the day `ordinal` (pure, so memoized)."""
+    today = date.fromordinal(ordinal)
 
     if expiry_type == "weekly":
-        days_until = (expiry_day - now.weekday()) % 7
-        expiry_date = (now + timedelta(days=days_until)).date()
-        if expiry_date == today and now.hour >= cutoff_hour:
+        days_until = (expiry_day - today.weekday()) % 7
+        expiry_date = today + timedelta(days=days_until)
+        if expiry_date == today and past_cutoff:
             expiry_date += timedelta(days=7)
         elif expiry_date < today:
             expiry_date += timedelta(days=7)
 
     elif expiry_type == "monthly":
-        year, month = now.year, now.month
+        year, month = today.year, today.month
         def last_weekday(y: int, m: int, wd: int):
             _, last = calendar.monthrange(y, m)
             d = datetime(y, m, last)
@@ -85,7 +172,7 @@ def get_next_expiry(index_name: str, indices: dict, access_token: str, cutoff_ho
                 d -= timedelta(days=1)
             return d.date()
         expiry_date = last_weekday(year, month, expiry_day)
-        if expiry_date == today and now.hour >= cutoff_hour:
+        if expiry_date == today and past_cutoff:
             month += 1
             if month == 13: month, year = 1, year + 1
             expiry_date = last_weekday(year, month, expiry_day)
@@ -95,14 +182,14 @@ def get_next_expiry(index_name: str, indices: dict, access_token: str, cutoff_ho
             expiry_date = last_weekday(year, month, expiry_day)
 
     elif expiry_type == "monthly_last_tuesday":
-        year, month = now.year, now.month
+        year, month = today.year, today.month
         def last_tuesday(y: int, m: int):
             _, last = calendar.monthrange(y, m)
             d = datetime(y, m, last)
             while d.weekday() != 1: d -= timedelta(days=1)
             return d.date()
         expiry_date = last_tuesday(year, month)
-        if expiry_date == today and now.hour >= cutoff_hour:
+        if expiry_date == today and past_cutoff:
             month += 1
             if month == 13: month, year = 1, year + 1
             expiry_date = last_tuesday(year, month)
@@ -120,33 +207,90 @@ def get_next_expiry(index_name: str, indices: dict, access_token: str, cutoff_ho
 # API fetch
 # ---------------------------------------------------------------------------
 
-def fetch_option_chain(
+# Per-leg (column suffix, payload section, payload key), in Parquet column order.
+_LEG_FIELDS = (
+    ("ltp",       "market_data",   "ltp"),
+    ("oi",        "market_data",   "oi"),
+    ("iv",        "option_greeks", "iv"),
+    ("delta",     "option_greeks", "delta"),
+    ("gamma",     "option_greeks", "gamma"),
+    ("theta",     "option_greeks", "theta"),
+    ("vega",      "option_greeks", "vega"),
+    ("vanna",     "option_greeks", "vanna"),
+    ("charm",     "option_greeks", "charm"),
+    ("pop",       "option_greeks", "pop"),
+    ("vol",       "market_data",   "volume"),
+    ("close",     "market_data",   "close"),
+    ("bid_price", "market_data",   "bid_price"),
+    ("bid_qty",   "market_data",   "bid_qty"),
+    ("ask_price", "market_data",   "ask_price"),
+    ("ask_qty",   "market_data",   "ask_qty"),
+    ("prev_oi",   "market_data",   "prev_oi"),
+)
+
+# Built once at import: payload leg → ((output column, section, key), ...), oi_chg column
+_RENAME_MAP: dict[str, tuple[tuple[tuple[str, str, str], ...], str]] = {
+    f"{leg}_options": (
+        tuple((f"{leg}_{col}", section, key) for col, section, key in _LEG_FIELDS),
+        f"{leg}_oi_chg",
+    )
+    for leg in ("call", "put")
+}
+
+
+def _flatten(item: dict) -> dict:
+    """One option-chain entry → one flat row (column order matches the Parquet schema)."""
+    co, po = item["call_options"], item["put_options"]
+    row = {
+        "Strike":  item.get("strike_price"),
+        "Gamma":   co["option_greeks"].get("gamma"),
+        "Call_OI": co["market_data"].get("oi"),
+        "Put_OI":  po["market_data"].get("oi"),
+        "Spot":    item.get("underlying_spot_price"),
+        "expiry":  item.get("expiry"),
+        "PCR":     item.get("pcr"),
+    }
+    for leg, (fields, chg_col) in _RENAME_MAP.items():
+        opt = item[leg]
+        for col, section, key in fields:
+            row[col] = opt[section].get(key)
+        md = opt["market_data"]
+        row[chg_col] = (md.get("oi") or 0) - (md.get("prev_oi") or 0)
+    return row
+
+
+def fetch_option_rows(
     index_name: str,
     access_token: str,
     api_url: str,
     indices: dict,
     cutoff_hour: int = 9,
     expiry_date: Optional[str] = None,
-) -> tuple[Optional[pd.DataFrame], Optional[str]]:
-    """Fetch option chain with robust fallback."""
+    now: Optional[datetime] = None,
+) -> tuple[Optional[list[dict]], Optional[str]]:
+    """Fetch option chain with robust fallback → flat rows sorted by strike."""
+    global _bad_token_hash
     index_config = indices.get(index_name)
     if not index_config:
         return None, f"Unknown index: {index_name}"
+    if token_rejected(access_token):
+        return None, "Access token rejected (401); waiting for a new token"
 
     if expiry_date is None:
-        expiry_date = get_next_expiry(index_name, indices, access_token, cutoff_hour)
+        expiry_date = get_next_expiry(index_name, indices, access_token, cutoff_hour, now)
 
     params = {"instrument_key": index_config["instrument_key"], "expiry_date": expiry_date}
-    headers = {
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-        "Authorization": f"Bearer {access_token}"
-    }
+    headers = _auth_headers(access_token)
+    session = _get_session()
 
     try:
-        resp = requests.get(api_url, params=params, headers=headers, timeout=15)
+        resp = session.get(api_url, params=params, headers=headers, timeout=15)
+        if resp.status_code == 401:
+            _bad_token_hash = _token_hash(access_token)
+            logger.error("[AUTH] Upstox rejected the access token (401) — pausing fetches until it changes")
+            return None, "Access token rejected (401)"
         resp.raise_for_status()
-        raw = resp.json()
+        raw = orjson.loads(resp.content)
         option_data = raw.get("data", [])
 
         # Robust Fallback Logic
@@ -155,9 +299,9 @@ def fetch_option_chain(
             logger.info("[EXPIRY FALLBACK] No data for %s, trying auto-discovery...", expiry_date)
             p_auto = {"instrument_key": index_config["instrument_key"]}
             try:
-                r_auto = requests.get(api_url, params=p_auto, headers=headers, timeout=15)
+                r_auto = session.get(api_url, params=p_auto, headers=headers, timeout=15)
                 r_auto.raise_for_status()
-                auto_data = r_auto.json().get("data", [])
+                auto_data = orjson.loads(r_auto.content).get("data", [])
                 if auto_data:
                     option_data = auto_data
                     expiry_date = auto_data[0].get("expiry", expiry_date)
@@ -175,9 +319,9 @@ def fetch_option_chain(
                 logger.info("[EXPIRY FALLBACK] Trying holiday candidate: %s", hc)
                 params["expiry_date"] = hc
                 try:
-                    resp_h = requests.get(api_url, params=params, headers=headers, timeout=15)
+                    resp_h = session.get(api_url, params=params, headers=headers, timeout=15)
                     resp_h.raise_for_status()
-                    h_data = resp_h.json().get("data", [])
+                    h_data = orjson.loads(resp_h.content).get("data", [])
                     if h_data:
                         option_data = h_data
                         expiry_date = hc
@@ -225,9 +369,9 @@ def fetch_option_chain(
                 logger.info("[EXPIRY FALLBACK] Trying deep candidate: %s...", fb)
                 params["expiry_date"] = fb
                 try:
-                    r2 = requests.get(api_url, params=params, headers=headers, timeout=15)
+                    r2 = session.get(api_url, params=params, headers=headers, timeout=15)
                     r2.raise_for_status()
-                    option_data = r2.json().get("data", [])
+                    option_data = orjson.loads(r2.content).get("data", [])
                     if option_data:
                         expiry_date = fb
                         logger.info("[EXPIRY FALLBACK] Success with %s", fb)
@@ -237,86 +381,86 @@ def fetch_option_chain(
         if not option_data:
             return None, f"No data for {index_name} on {expiry_date}"
 
-        records = []
-        for item in option_data:
-            co, po = item["call_options"], item["put_options"]
-            records.append({
-                "Strike":       item.get("strike_price"),
-                "Gamma":        co["option_greeks"].get("gamma"),
-                "Call_OI":      co["market_data"].get("oi"),
-                "Put_OI":       po["market_data"].get("oi"),
-                "Spot":         item.get("underlying_spot_price"),
-                "expiry":       item.get("expiry"),
-                "PCR":          item.get("pcr"),
-                "call_ltp":     co["market_data"].get("ltp"),
-                "call_oi":      co["market_data"].get("oi"),
-                "call_iv":      co["option_greeks"].get("iv"),
-                "call_delta":   co["option_greeks"].get("delta"),
-                "call_gamma":   co["option_greeks"].get("gamma"),
-                "call_theta":   co["option_greeks"].get("theta"),
-                "call_vega":    co["option_greeks"].get("vega"),
-                "call_vanna":   co["option_greeks"].get("vanna"),
-                "call_charm":   co["option_greeks"].get("charm"),
-                "call_pop":     co["option_greeks"].get("pop"),
-                "call_vol":     co["market_data"].get("volume"),
-                "call_close":   co["market_data"].get("close"),
-                "call_bid_price": co["market_data"].get("bid_price"),
-                "call_bid_qty":   co["market_data"].get("bid_qty"),
-                "call_ask_price": co["market_data"].get("ask_price"),
-                "call_ask_qty":   co["market_data"].get("ask_qty"),
-                "call_prev_oi": co["market_data"].get("prev_oi"),
-                "call_oi_chg":  (co["market_data"].get("oi") or 0) - (co["market_data"].get("prev_oi") or 0),
-                "put_ltp":      po["market_data"].get("ltp"),
-                "put_oi":       po["market_data"].get("oi"),
-                "put_iv":       po["option_greeks"].get("iv"),
-                "put_delta":    po["option_greeks"].get("delta"),
-                "put_gamma":    po["option_greeks"].get("gamma"),
-                "put_theta":    po["option_greeks"].get("theta"),
-                "put_vega":     po["option_greeks"].get("vega"),
-                "put_vanna":    po["option_greeks"].get("vanna"),
-                "put_charm":    po["option_greeks"].get("charm"),
-                "put_pop":      po["option_greeks"].get("pop"),
-                "put_vol":      po["market_data"].get("volume"),
-                "put_close":    po["market_data"].get("close"),
-                "put_bid_price": po["market_data"].get("bid_price"),
-                "put_bid_qty":   po["market_data"].get("bid_qty"),
-                "put_ask_price": po["market_data"].get("ask_price"),
-                "put_ask_qty":   po["market_data"].get("ask_qty"),
-                "put_prev_oi":  po["market_data"].get("prev_oi"),
-                "put_oi_chg":   (po["market_data"].get("oi") or 0) - (po["market_data"].get("prev_oi") or 0),
-            })
-
-        df = pd.DataFrame(records).sort_values("Strike").reset_index(drop=True)
-        return df, None
+        rows = [_flatten(item) for item in option_data if item.get("strike_price") is not None]
+        rows.sort(key=itemgetter("Strike"))
+        return rows, None
     except Exception as exc: return None, f"Error: {exc}"
 
 
+def fetch_option_chain(
+    index_name: str,
+    access_token: str,
+    api_url: str,
+    indices: dict,
+    cutoff_hour: int = 9,
+    expiry_date: Optional[str] = None,
+    now: Optional[datetime] = None,
+) -> tuple[Optional[pd.DataFrame], Optional[str]]:
+    """DataFrame view of fetch_option_rows() for callers that still want pandas."""
+    rows, err = fetch_option_rows(index_name, access_token, api_url, indices, cutoff_hour, expiry_date, now)
+    if err:
+        return None, err
+    import pandas as pd
+    return pd.DataFrame(rows), None
+
+
 # ---------------------------------------------------------------------------
 # Strike filter
 # ---------------------------------------------------------------------------
 
 def filter_near_strikes(df: pd.DataFrame, radius: int = 20) -> pd.DataFrame:
     """Keep ±radius strikes around the MEDIAN spot."""
+    import numpy as np
+
     ltp = float(df["Spot"].median())
-    strikes = sorted(df["Strike"].unique())
-    closest = min(strikes, key=lambda x: abs(x - ltp))
-    idx = strikes.index(closest)
-    low, high = max(idx - radius, 0), min(idx + radius + 1, len(strikes))
-    return df[df["Strike"].isin(strikes[low:high])].reset_index(drop=True)
+    strikes = np.sort(df["Strike"].unique())
+    idx = int(np.abs(strikes - ltp).argmin())
+    low, high = max(idx - radius, 0), min(idx + radius + 1, strikes.size)
+    lo_v, hi_v = strikes[low], strikes[high - 1]
+
+    values = df["Strike"].to_numpy()
+    if df["Strike"].is_monotonic_increasing:
+        # fetch_option_chain returns rows sorted by strike → slice, no mask
+        start = int(np.searchsorted(values, lo_v, side="left"))
+        stop  = int(np.searchsorted(values, hi_v, side="right"))
+        return df.iloc[start:stop].reset_index(drop=True)
+    return df[(values >= lo_v) & (values <= hi_v)].reset_index(drop=True)
+
+
+def filter_near_rows(rows: list[dict], radius: int = 20) -> list[dict]:
+    """List-of-dicts twin of filter_near_strikes(); `rows` must be sorted by strike."""
+    spots = [r["Spot"] for r in rows if r["Spot"] is not None]
+    if not spots:
+        return rows
+    ltp = median(spots)
+    keys = [r["Strike"] for r in rows]
+    strikes = sorted(set(keys))
+    i = bisect_left(strikes, ltp)
+    if i == len(strikes) or (i > 0 and ltp - strikes[i - 1] <= strikes[i] - ltp):
+        i -= 1
+    lo_v = strikes[max(i - radius, 0)]
+    hi_v = strikes[min(i + radius, len(strikes) - 1)]
+    return rows[bisect_left(keys, lo_v):bisect_right(keys, hi_v)]
 
 
 # ---------------------------------------------------------------------------
 # Market hours check
 # ---------------------------------------------------------------------------
 
-def is_market_hours(open_h: int = 9, open_m: int = 15, close_h: int = 15, close_m: int = 38) -> bool:
-    """True Mon–Fri, 09:30–15:30 IST."""
-    ist = ZoneInfo("Asia/Kolkata")
-    now = datetime.now(ist)
-    if now.weekday() >= 5: return False
-    m_open  = now.replace(hour=open_h,  minute=open_m,  second=0, microsecond=0)
-    m_close = now.replace(hour=close_h, minute=close_m, second=0, microsecond=0)
-    return m_open <= now <= m_close
+@lru_cache(maxsize=8)
+def _market_mask(open_h: int, open_m: int, close_h: int, close_m: int) -> bytes:
+    """One byte per minute of the week (Mon 00:00 = 0): 1 while the market is open."""
+    open_min, close_min = open_h * 60 + open_m, close_h * 60 + close_m
+    day = bytes(1 if open_min <= m < close_min else 0 for m in range(1440))
+    return day * 5 + bytes(1440 * 2)   # Sat/Sun closed
+
+
+def is_market_hours(open_h: int = 9, open_m: int = 15, close_h: int = 15, close_m: int = 38,
+                    now: Optional[datetime] = None) -> bool:
+    """True Mon–Fri, 09:30–15:30 IST (open minute inclusive, close minute exclusive)."""
+    now = now or now_ist()
+    mask = _market_mask(open_h, open_m, close_h, close_m)
+    return mask[now.weekday() * 1440 + now.hour * 60 + now.minute] == 1
 
 
 
@@ -327,36 +471,55 @@ def is_market_hours(open_h: int = 9, open_m: int = 15, close_h: int = 15, close_
 FETCH_CONCURRENCY = 5   # number of instruments fetched in parallel
 
 def _fetch_one(instrument_name: str, token: str, api_url: str,
-               all_instruments: dict, radius: int, cutoff: int) -> dict | None:
+               all_instruments: dict, radius: int, cutoff: int,
+               now: Optional[datetime] = None) -> dict | None:
     """Fetch and process a single instrument. Returns snapshot dict or None on error."""
-    import numpy as np
-    df, err = fetch_option_chain(instrument_name, token, api_url, all_instruments, cutoff)
-    if err or df is None or df.empty:
+    rows, err = fetch_option_rows(instrument_name, token, api_url, all_instruments, cutoff, now=now)
+    if err or not rows:
         logger.warning("[COLLECT] %s skip: %s", instrument_name, err)
         return None
-    df_filtered = filter_near_strikes(df, radius)
-    expiry_date = df_filtered["expiry"].iloc[0] if "expiry" in df_filtered.columns else "unknown"
-    df_cleaned  = df_filtered.replace([np.inf, -np.inf], np.nan)
-    logger.info("[COLLECT] %s → %d rows", instrument_name, len(df_filtered))
+    rows = filter_near_rows(rows, radius)
+    # JSON (and Supabase) has no inf — null it like DataFrame.to_json() did
+    for row in rows:
+        for k, v in row.items():
+            if isinstance(v, float) and not isfinite(v):
+                row[k] = None
+    logger.info("[COLLECT] %s → %d rows", instrument_name, len(rows))
     return {
         "index_name":  instrument_name,
-        "expiry_date": expiry_date,
-        "data":        json.loads(df_cleaned.to_json(orient="records", date_format="iso")),
+        "expiry_date": rows[0]["expiry"] or "unknown",
+        "data":        rows,
     }
 
 
-def collect_all(token: str, api_url: str, indices: dict, stocks: dict, radius: int, cutoff: int) -> list[dict]:
-    """Fetch all instruments concurrently (up to FETCH_CONCURRENCY at a time)."""
+def collect_all(token: str, api_url: str, indices: dict, stocks: dict, radius: int, cutoff: int,
+                concurrency: int = FETCH_CONCURRENCY, now: Optional[datetime] = None,
+                market_hours: tuple[int, int, int, int] = (9, 15, 15, 38),
+                force: bool = False) -> list[dict]:
+    """Fetch all instruments concurrently (up to `concurrency` at a time).
+
+    One `now` snapshot is shared by every instrument, so a run that straddles
+    the cutoff minute can't resolve different expiries for different symbols.
+    Outside `market_hours` (open_h, open_m, close_h, close_m) nothing is
+    fetched unless `force` is set (manual triggers).
+    """
     from concurrent.futures import ThreadPoolExecutor, as_completed
 
+    now = now or now_ist()
+    if not force and not is_market_hours(*market_hours, now=now):
+        logger.debug("[COLLECT] Market closed, skipping")
+        return []
+    if token_rejected(token):
+        logger.warning("[COLLECT] Access token was rejected last cycle, skipping until it is replaced")
+        return []
     all_instruments = {**indices, **stocks}
     logger.info("[COLLECT] Fetching %d instrument(s) with concurrency=%d",
-                len(all_instruments), FETCH_CONCURRENCY)
+                len(all_instruments), concurrency)
 
     results = []
-    with ThreadPoolExecutor(max_workers=FETCH_CONCURRENCY) as pool:
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
         futures = {
-            pool.submit(_fetch_one, name, token, api_url, all_instruments, radius, cutoff): name
+            pool.submit(_fetch_one, name, token, api_url, all_instruments, radius, cutoff, now): name
             for name in all_instruments
         }
         for future in as_completed(futures):
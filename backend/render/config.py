@@ -2,12 +2,15 @@
 config.py — Environment-based configuration for the Render collector service.
 All secrets are injected as environment variables on the Render dashboard.
 """
+import csv
 import os
 from pathlib import Path
-from dotenv import load_dotenv
-import pandas as pd
+from types import MappingProxyType
 
-load_dotenv()
+# Render / GitHub Actions inject the env directly — only parse .env locally
+if not (os.getenv("RENDER") or os.getenv("GITHUB_ACTIONS")):
+    from dotenv import load_dotenv
+    load_dotenv()
 
 # ---------------------------------------------------------------------------
 # Supabase
@@ -29,6 +32,7 @@ UPSTOX_ACCESS_TOKEN: str = os.getenv("UPSTOX_ACCESS_TOKEN", "")
 # ---------------------------------------------------------------------------
 COLLECT_INTERVAL_MINS: int = int(os.getenv("COLLECT_INTERVAL_MINS", "15"))
 FILTER_STRIKES_RADIUS: int = int(os.getenv("FILTER_STRIKES_RADIUS", "20"))
+COLLECT_CONCURRENCY: int = int(os.getenv("COLLECT_CONCURRENCY", "5"))   # parallel instrument fetches
 
 # Market hours (IST) — Mon–Fri only
 MARKET_OPEN_H,  MARKET_OPEN_M  = 9,  30
@@ -38,7 +42,7 @@ CUTOFF_HOUR = 16
 # ---------------------------------------------------------------------------
 # Index definitions (mirrors backend/core/config.py)
 # ---------------------------------------------------------------------------
-INDICES: dict = {
+INDICES: MappingProxyType = MappingProxyType({
     "Nifty": {
         "instrument_key": "NSE_INDEX|Nifty 50",
         "lot_size": 75,
@@ -57,7 +61,7 @@ INDICES: dict = {
         "expiry_type": "weekly",
         "expiry_day": 3,   # Thursday
     },
-}
+})
 
 # ---------------------------------------------------------------------------
 # Stock definitions (loaded from stocks.csv)
@@ -65,16 +69,17 @@ INDICES: dict = {
 STOCKS_CSV = Path(__file__).resolve().parent.parent.parent / "stocks.csv"
 STOCKS: dict[str, dict] = {}
 if STOCKS_CSV.exists():
-    df = pd.read_csv(STOCKS_CSV)
-    for _, row in df.iterrows():
-        name = row["Name"].strip()
-        key = row["Key"].strip()
-        STOCKS[name] = {
-            "instrument_key": key,
-            "lot_size": 1,  # Assume 1 for stocks, adjust if needed
-            "expiry_type": "monthly",
-            "expiry_day": 3, # Thursday for stocks
-        }
+    # csv module rather than pandas — keeps pandas off the service's import path
+    with open(STOCKS_CSV, mode="r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            name = row["Name"].strip()
+            key = row["Key"].strip()
+            STOCKS[name] = {
+                "instrument_key": key,
+                "lot_size": 1,  # Assume 1 for stocks, adjust if needed
+                "expiry_type": "monthly",
+                "expiry_day": 3, # Thursday for stocks
+            }
 else:
     pass # stocks.csv not found
 
@@ -7,12 +7,14 @@ Data is saved to Supabase. No web server needed.
 
 Run locally:  python cron_job.py
 """
+import asyncio
 import logging
 import os
 import sys
 
-from dotenv import load_dotenv
-load_dotenv()
+if not (os.getenv("RENDER") or os.getenv("GITHUB_ACTIONS")):
+    from dotenv import load_dotenv
+    load_dotenv()
 
 logging.basicConfig(
     level=logging.INFO,
@@ -41,10 +43,13 @@ import db
 
 
 def main():
+    now = collector.now_ist()
+
     # 1. Market hours check — exit early if outside Mon–Fri 09:30–15:30 IST
     if not collector.is_market_hours(
         config.MARKET_OPEN_H,  config.MARKET_OPEN_M,
         config.MARKET_CLOSE_H, config.MARKET_CLOSE_M,
+        now=now,
     ):
         logger.info("Outside market hours. Nothing to collect. Exiting.")
         sys.exit(0)
@@ -68,6 +73,10 @@ def main():
         stocks=config.STOCKS,
         radius=config.FILTER_STRIKES_RADIUS,
         cutoff=config.CUTOFF_HOUR,
+        concurrency=config.COLLECT_CONCURRENCY,
+        now=now,
+        market_hours=(config.MARKET_OPEN_H,  config.MARKET_OPEN_M,
+                      config.MARKET_CLOSE_H, config.MARKET_CLOSE_M),
     )
 
     if not snapshots:
@@ -75,7 +84,7 @@ def main():
         sys.exit(1)
 
     # 5. Insert into Supabase
-    inserted = db.insert_snapshots(client, snapshots)
+    inserted = asyncio.run(db.insert_snapshots_async(client, snapshots))
     if inserted == 0:
         logger.error("Failed to insert snapshots into Supabase. Aborting.")
         sys.exit(1)
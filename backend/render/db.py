@@ -4,19 +4,31 @@ db.py — Supabase client wrapper for option_snapshots and tokens tables.
 from __future__ import annotations
 
 import logging
-from typing import Optional
+import threading
+import time
+from typing import Iterator, Optional
 
+import orjson
 from supabase import create_client, Client
+from supabase.lib.client_options import ClientOptions
 
 logger = logging.getLogger(__name__)
 
 _client: Optional[Client] = None
+_client_lock = threading.Lock()
 
 
 def get_client(url: str, key: str) -> Client:
+    """Process-wide Supabase client (one httpx keep-alive pool for every caller).
+
+    The app module, the scheduler thread and cron_job can all ask for it at
+    start-up, so creation is double-checked under a lock.
+    """
     global _client
     if _client is None:
-        _client = create_client(url, key)
+        with _client_lock:
+            if _client is None:
+                _client = create_client(url, key, options=ClientOptions(postgrest_client_timeout=30))
     return _client
 
 
@@ -24,12 +36,23 @@ def get_client(url: str, key: str) -> Client:
 # Tokens table
 # ---------------------------------------------------------------------------
 
+# (token, time.monotonic() when read). The token rotates once a day via
+# set_token(), so the scheduler only re-reads it from Supabase hourly.
+TOKEN_TTL_SECS = 3600
+_token_cache: Optional[tuple[str, float]] = None
+
+
 def get_token(client: Client) -> Optional[str]:
     """Retrieve the stored Upstox access token."""
+    global _token_cache
+    if _token_cache and time.monotonic() - _token_cache[1] < TOKEN_TTL_SECS:
+        return _token_cache[0]
     try:
         res = client.table("tokens").select("token").eq("id", 1).execute()
         if res.data:
-            return res.data[0]["token"]
+            token = res.data[0]["token"]
+            _token_cache = (token, time.monotonic())
+            return token
     except Exception as exc:
         logger.error("get_token failed: %s", exc)
     return None
@@ -37,6 +60,7 @@ def get_token(client: Client) -> Optional[str]:
 
 def set_token(client: Client, token: str) -> bool:
     """Upsert the Upstox access token (id=1 is the single row)."""
+    global _token_cache
     from datetime import datetime
     import zoneinfo
     ist = zoneinfo.ZoneInfo("Asia/Kolkata")
@@ -45,6 +69,7 @@ def set_token(client: Client, token: str) -> bool:
         client.table("tokens").upsert(
             {"id": 1, "token": token, "updated_at": now_ist}
         ).execute()
+        _token_cache = (token, time.monotonic())
         return True
     except Exception as exc:
         logger.error("set_token failed: %s", exc)
@@ -55,17 +80,34 @@ def set_token(client: Client, token: str) -> bool:
 # option_snapshots table
 # ---------------------------------------------------------------------------
 
-def insert_snapshots(client: Client, snapshots: list[dict]) -> int:
-    """
-    Insert a list of snapshots.
-    Each snapshot: {"index_name": str, "expiry_date": str, "data": list[dict]}
-    Returns number of rows inserted.
+def _insert_raw(client: Client, table: str, rows: list[dict]) -> int:
+    """INSERT rows with an orjson-encoded body; returns rows written.
 
-    Timestamps are stored in IST so that the local sync router can use
-    captured_at directly as the filename without any UTC→IST conversion.
+    The query builder's .insert() hands rows to httpx, which re-encodes the
+    whole nested `data` tree with stdlib json. Posting pre-encoded bytes on the
+    same PostgREST session (same auth headers) skips that. `data` stays a JSON
+    array in the body — pre-stringifying it would land as a jsonb *string*.
+
+    return=minimal: PostgREST answers 201 with no body instead of echoing every
+    inserted row (jsonb included) back; a 2xx means all rows were written.
     """
-    if not snapshots:
-        return 0
+    res = client.postgrest.session.post(
+        f"/{table}",
+        content=orjson.dumps(rows),
+        headers={"Content-Type": "application/json", "Prefer": "return=minimal"},
+    )
+    res.raise_for_status()
+    return len(rows)
+
+
+# Rows per INSERT request. Each row carries a whole filtered chain (~20 KB), so
+# 50 keeps a request around 1 MB — well under PostgREST's body limit — while a
+# full stock run still goes out in a handful of round-trips.
+INSERT_BATCH_SIZE = 50
+
+
+def _snapshot_rows(snapshots: list[dict]) -> tuple[list[dict], str]:
+    """option_snapshots rows for one run, all stamped with the same captured_at."""
     from datetime import datetime
     from zoneinfo import ZoneInfo
 
@@ -86,43 +128,114 @@ def insert_snapshots(client: Client, snapshots: list[dict]) -> int:
         }
         for s in snapshots
     ]
+    return rows, now_ist
+
+
+def _insert_batch(client: Client, rows: list[dict], i: int) -> int:
+    batch = rows[i : i + INSERT_BATCH_SIZE]
     try:
-        res = client.table("option_snapshots").insert(rows).execute()
-        count = len(res.data) if res.data else 0
-        logger.info("Inserted %d snapshot rows (captured_at IST: %s)", count, now_ist)
-        return count
+        return _insert_raw(client, "option_snapshots", batch)
     except Exception as exc:
-        logger.error("insert_snapshots failed: %s", exc)
+        logger.error("insert_snapshots failed (rows %d-%d): %s", i, i + len(batch), exc)
         return 0
 
 
-def get_pending(client: Client, since: Optional[str] = None) -> list[dict]:
+def insert_snapshots(client: Client, snapshots: list[dict]) -> int:
     """
-    Return all pending (not-yet-synced) snapshots.
-    Rows are deleted after sync, so this simply fetches everything present.
+    Insert a list of snapshots.
+    Each snapshot: {"index_name": str, "expiry_date": str, "data": list[dict]}
+    Returns number of rows inserted.
+
+    Timestamps are stored in IST so that the local sync router can use
+    captured_at directly as the filename without any UTC→IST conversion.
+    """
+    if not snapshots:
+        return 0
+    rows, now_ist = _snapshot_rows(snapshots)
+    count = sum(_insert_batch(client, rows, i) for i in range(0, len(rows), INSERT_BATCH_SIZE))
+    logger.info("Inserted %d snapshot rows (captured_at IST: %s)", count, now_ist)
+    return count
+
+
+async def insert_snapshots_async(client: Client, snapshots: list[dict]) -> int:
+    """insert_snapshots() with the batches sent concurrently.
+
+    The sync client's httpx session is thread-safe, so each batch runs in a
+    worker thread and the round-trips overlap instead of adding up.
+    """
+    import asyncio
+
+    if not snapshots:
+        return 0
+    rows, now_ist = _snapshot_rows(snapshots)
+    counts = await asyncio.gather(*(
+        asyncio.to_thread(_insert_batch, client, rows, i)
+        for i in range(0, len(rows), INSERT_BATCH_SIZE)
+    ))
+    count = sum(counts)
+    logger.info("Inserted %d snapshot rows (captured_at IST: %s)", count, now_ist)
+    return count
+
+
+def iter_pending(client: Client, since: Optional[str] = None, page: int = 500) -> Iterator[dict]:
+    """
+    Yield pending (not-yet-synced) snapshots, `page` rows per request.
+    Rows are deleted after sync, so this simply walks everything present.
     Optional `since`: ISO-8601 timestamp — only return rows captured after this time.
+
+    Paged with .range() so one request never carries the whole backlog (and
+    Supabase's 1000-row max-rows cap can't silently truncate it).
     """
-    try:
+    offset = 0
+    while True:
         query = (
             client.table("option_snapshots")
             .select("id, index_name, expiry_date, captured_at, data")
             .order("captured_at", desc=False)
+            .order("id", desc=False)   # stable order across pages
         )
         if since:
             query = query.gte("captured_at", since)
-        res = query.execute()
-        return res.data or []
+        res = query.range(offset, offset + page - 1).execute()
+        rows = res.data or []
+        yield from rows
+        if len(rows) < page:
+            return
+        offset += page
+
+
+def get_pending(client: Client, since: Optional[str] = None) -> list[dict]:
+    """All pending snapshots as a list (see iter_pending).
+
+    Pages are still collected in memory; paging bounds each request, not the
+    response. If a later page fails, the rows already read are returned —
+    they are the oldest, and the next sync picks up the rest.
+    """
+    rows: list[dict] = []
+    try:
+        for row in iter_pending(client, since=since):
+            rows.append(row)
     except Exception as exc:
-        logger.error("get_pending failed: %s", exc)
-        return []
+        logger.error("get_pending failed after %d rows: %s", len(rows), exc)
+    return rows
+
+
+# .in_() is sent as a query-string list; >500 IDs blows the URL limit
+DELETE_CHUNK = 400
 
 
 def delete_rows(client: Client, ids: list[int]) -> bool:
-    """Hard-delete synced snapshot rows to keep the table lean."""
+    """Hard-delete synced snapshot rows to keep the table lean.
+
+    One `id=in.(...)` request per DELETE_CHUNK ids rather than per row.
+    """
     if not ids:
         return True
+    # A retried sync can resend ids; duplicates only lengthen the in.(...) URLs
+    ids = sorted(set(ids))
     try:
-        client.table("option_snapshots").delete().in_("id", ids).execute()
+        for i in range(0, len(ids), DELETE_CHUNK):
+            client.table("option_snapshots").delete().in_("id", ids[i : i + DELETE_CHUNK]).execute()
         logger.info("Deleted %d synced rows", len(ids))
         return True
     except Exception as exc:
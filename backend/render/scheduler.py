@@ -4,6 +4,7 @@ Runs collect_all() every COLLECT_INTERVAL_MINS during NSE market hours.
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -20,9 +21,11 @@ _scheduler: AsyncIOScheduler | None = None
 
 def _collection_job():
     """Scheduled task: collect data if in market hours."""
+    now = collector.now_ist()
     if not collector.is_market_hours(
         config.MARKET_OPEN_H,  config.MARKET_OPEN_M,
         config.MARKET_CLOSE_H, config.MARKET_CLOSE_M,
+        now=now,
     ):
         logger.info("[SCHEDULER] Outside market hours, skipping.")
         return
@@ -40,12 +43,19 @@ def _collection_job():
         token=token,
         api_url=config.API_URL,
         indices=config.INDICES,
+        stocks=config.STOCKS,
         radius=config.FILTER_STRIKES_RADIUS,
         cutoff=config.CUTOFF_HOUR,
+        concurrency=config.COLLECT_CONCURRENCY,
+        now=now,
+        market_hours=(config.MARKET_OPEN_H,  config.MARKET_OPEN_M,
+                      config.MARKET_CLOSE_H, config.MARKET_CLOSE_M),
     )
 
     if snapshots:
-        inserted = db.insert_snapshots(client, snapshots)
+        # Sync jobs run in APScheduler's executor thread (no running loop there),
+        # so the concurrent insert gets its own short-lived loop.
+        inserted = asyncio.run(db.insert_snapshots_async(client, snapshots))
         logger.info("[SCHEDULER] Inserted %d snapshot(s) into Supabase.", inserted)
     else:
         logger.warning("[SCHEDULER] No data collected this cycle.")
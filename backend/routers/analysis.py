@@ -6,11 +6,18 @@ Routes:
   GET /api/data-table/{index}
 """
 
+import warnings
+from datetime import date
+from functools import lru_cache
 from typing import Optional, List
-from fastapi import APIRouter, HTTPException
+
+import numpy as np
+import orjson
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 
 import store
-from core.config import GAMMA_CAGE_WIDTH, INDICES, STOCKS
+from core.config import GAMMA_CAGE_WIDTH, INSTRUMENTS
 from services.calculations import (
     calculate_flip_point,
     calculate_vol_surface,
@@ -37,12 +44,12 @@ from services.calculations import (
 from services.historical_service import get_level_migration, get_historical_prices
 from services.signal_engine import compute_signals
 
-router = APIRouter(prefix="/api", tags=["analysis"])
+router = APIRouter(prefix="/api", tags=["analysis"], default_response_class=ORJSONResponse)
 
 
 def _require_data(index: str):
     # accept both indices and stocks
-    if index not in {**INDICES, **STOCKS}:
+    if index not in INSTRUMENTS:
         raise HTTPException(status_code=404, detail=f"Unknown index: {index}")
     
     import store
@@ -58,17 +65,28 @@ def _require_data(index: str):
 @router.get("/metrics/{index}")
 def get_metrics(index: str):
     """Return key metrics: spot, ATM, flip point, regime, gamma cage, power zones."""
-    df = _require_data(index)
+    _require_data(index)
+    return _metrics_payload(index, store.version(index), date.today().toordinal())
+
+
+@lru_cache(maxsize=16)
+def _metrics_payload(index: str, version: int, day: int) -> dict:
+    """All metrics are deterministic in the snapshot (and today's date, for DTE),
+    so build them once per store version per day."""
+    df = store.get_data(index)
 
     spot        = float(df["Spot"].iloc[0])
-    atm         = float(get_atm_strike(df))
-    flip        = float(calculate_flip_point(df))
+    # Same store keys as the chart router's _atm/_flip/_power_zones, so the
+    # metrics and the regime/IV/OI charts of one snapshot share these
+    atm         = float(store.get_or_compute(index, "atm", lambda: get_atm_strike(df)))
+    flip        = float(store.get_or_compute(index, ("flip",), lambda: calculate_flip_point(df)))
     regime       = get_dealer_regime(spot, flip)
     cage, vacuum = get_gamma_cage(df, atm, GAMMA_CAGE_WIDTH)
-    power_zones  = [float(p) for p in get_power_zones(df, top_n=3)]
+    power_zones  = [float(p) for p in store.get_or_compute(
+        index, ("power_zones",), lambda: get_power_zones(df, 3, "Abs_GEX"))]
     
     try:
-        qp_data = calculate_quant_power(df, spot)
+        qp_data = store.get_or_compute(index, ("quant_power", 75, day), lambda: calculate_quant_power(df, spot))
         qp_strike = qp_data["quant_power"]
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Quant Power error: {exc}") from exc
@@ -104,7 +122,7 @@ def get_metrics(index: str):
         "power_zones": power_zones,
         "filepath":    store.get_filepath(index),
         "cum_gex":     float(df["Total_GEX"].sum()) if "Total_GEX" in df.columns else 0.0,
-        "cum_dex":     float(calculate_delta_exposure(df).Total_DEX.sum()) if "Spot" in df.columns else 0.0,
+        "cum_dex":     float(store.get_or_compute(index, ("dex", 75, day), lambda: calculate_delta_exposure(df)).Total_DEX.sum()) if "Spot" in df.columns else 0.0,
         "max_pain":    max_pain_strike,
         "pin_risk":    pin_risk,
         "pin_label":   pin_label,
@@ -141,32 +159,59 @@ DISPLAY_COLS = [
 ]
 
 
-@router.get("/data-table/{index}")
-def get_data_table(index: str, limit: int = 40):
-    """Return the data table rows as JSON (up to limit rows)."""
-    df = _require_data(index)
-
+@lru_cache(maxsize=32)
+def _table_json(index: str, version: int, limit: int) -> bytes:
+    """Serialised data-table payload; `version` (store.version) keys the cache."""
+    df = store.get_data(index)
     available = [c for c in DISPLAY_COLS if c in df.columns]
     subset = df[available].head(limit)
 
-    return {
+    return orjson.dumps({
         "index":   index,
         "columns": available,
         "rows":    subset.to_dict(orient="records"),
         "total":   len(df),
-    }
+    }, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+@router.get("/data-table/{index}")
+def get_data_table(index: str, limit: int = 40):
+    """Return the data table rows as JSON (up to limit rows)."""
+    _require_data(index)
+    return Response(content=_table_json(index, store.version(index), limit),
+                    media_type="application/json")
 
 
 # ---------------------------------------------------------------------------
 # Statistics
 # ---------------------------------------------------------------------------
 
+_DESCRIBE_ROWS = ("count", "mean", "std", "min", "25%", "50%", "75%", "max")
+
+
+def _describe(df) -> dict:
+    """df.describe().round(4).to_dict() in one vectorised pass over the numeric block."""
+    num = df.select_dtypes("number")
+    arr = num.to_numpy(dtype=float, na_value=np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)   # all-NaN columns → NaN, as describe()
+        cnt = np.sum(~np.isnan(arr), axis=0).astype(float)
+        mean = np.nanmean(arr, axis=0)
+        std = np.nanstd(arr, axis=0, ddof=1)
+        q = np.nanpercentile(arr, [0, 25, 50, 75, 100], axis=0)
+    table = np.round(np.vstack([cnt, mean, std, q[0], q[1], q[2], q[3], q[4]]), 4)
+    return {
+        col: dict(zip(_DESCRIBE_ROWS, table[:, j].tolist()))
+        for j, col in enumerate(num.columns)
+    }
+
+
 @router.get("/stats/{index}")
 def get_stats(index: str):
     """Return describe() statistics for the loaded DataFrame."""
     df = _require_data(index)
 
-    stats = df.describe().round(4).to_dict()
+    stats = _describe(df)
     return {
         "index":       index,
         "stats":       stats,
@@ -228,11 +273,7 @@ def get_god_tier_metrics(index: str):
     
     # 1. Dealer Reflexivity
     # Check lot size
-    lot_size = 75
-    if index in INDICES:
-        lot_size = INDICES[index]["lot_size"]
-    elif index in STOCKS:
-        lot_size = STOCKS[index].get("lot_size", 1)
+    lot_size = INSTRUMENTS[index]["lot_size"]
         
     reflexivity = calculate_dealer_reflexivity(df, spot, lot_size=lot_size)
     
@@ -287,11 +328,7 @@ def get_max_pain(index: str):
 def get_gamma_range(index: str):
     """Return gamma-adjusted expected move vs straddle-implied move."""
     df = _require_data(index)
-    lot_size = 75
-    if index in INDICES:
-        lot_size = INDICES[index]["lot_size"]
-    elif index in STOCKS:
-        lot_size = STOCKS[index].get("lot_size", 1)
+    lot_size = INSTRUMENTS[index]["lot_size"]
     return calculate_gamma_adjusted_range(df, lot_size=lot_size)
 
 
@@ -340,7 +377,7 @@ def get_fii_alignment(index: str):
     df = _require_data(index)
     from services.participant_service import get_fii_gamma_correlation
     spot = float(df["Spot"].iloc[0])
-    flip = float(calculate_flip_point(df))
+    flip = float(store.get_or_compute(index, ("flip",), lambda: calculate_flip_point(df)))
     gamma_regime = 1 if spot > flip else -1
     return get_fii_gamma_correlation(gamma_regime, flip, spot)
 
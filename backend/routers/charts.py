@@ -6,18 +6,24 @@ chart_type options:
   gex | regime | call_put | iv_smile | rr_bf
 """
 
-from fastapi import APIRouter, HTTPException
+from collections import OrderedDict
+from datetime import date
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
+import orjson
 import numpy as np
 import pandas as pd
 from pathlib import Path
 import logging
+import threading
+import time
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
-import json
 import store
-from core.config import INDICES, STOCKS, DATA_DIR
-from services.upstox_service import load_data_file
+from core.config import INSTRUMENTS, DATA_DIR
+from services.upstox_service import load_data_file_cached
 from services.calculations import (
     calculate_vol_surface,
     calculate_delta_exposure,
@@ -44,6 +50,9 @@ from services.calculations import (
     calculate_pcr_volume,
     calculate_system_gamma_score,
     calculate_flip_point,
+    calculate_quant_power,
+    get_atm_strike,
+    get_power_zones,
 )
 from services.chart_service import (
     build_dealer_regime_map,
@@ -129,42 +138,294 @@ from services.historical_service import (
 from services.calculations import calculate_realized_vol, calculate_greek_sensitivity_grid
 from services.flow_service import classify_option_flow
 
-router = APIRouter(prefix="/api", tags=["charts"])
+router = APIRouter(prefix="/api", tags=["charts"], default_response_class=ORJSONResponse)
 
-CHART_TYPES = {"gex", "dex", "vex", "cex", "cum_gex", "cum_dex", "cum_vex", "cum_cex", "regime", "iv_smile", "iv_cone", "rr_bf", "quant_power", "oi_dist", "oi_flow", "oi_change", "premium_flow", "compare_oi_change", "flow_intensity", "strike_pressure", "vtl", "migration", "vol_spread", "ignition", "momentum", "reflexivity", "liquidity", "stickiness", "apex", "gamma_profile", "gamma_density", "cum_steepness", "systemic_pulse", "total_gex", "total_dex", "iv_tracker", "vol_surface_3d", "gex_dex_combined", "bs_pricing", "oi_tracker", "vwgex", "spread_heatmap", "oi_buildup", "gex_decay", "hedge_flow", "max_pain", "gamma_range", "participant", "fii_alignment", "pcr_volume", "system_gamma", "sig_composite", "sig_flip", "sig_wall_decay", "sig_iv_divergence", "sig_oi_asymmetry", "sig_delta_accel", "oi_heatmap", "oi_importance", "oi_evolution", "oi_lifecycle", "max_pain_migration", "daily_study", "cross_expiry_study"}
+CHART_TYPES: frozenset = frozenset({"gex", "dex", "vex", "cex", "cum_gex", "cum_dex", "cum_vex", "cum_cex", "regime", "iv_smile", "iv_cone", "rr_bf", "quant_power", "oi_dist", "oi_flow", "oi_change", "premium_flow", "compare_oi_change", "flow_intensity", "strike_pressure", "vtl", "migration", "vol_spread", "ignition", "momentum", "reflexivity", "liquidity", "stickiness", "apex", "gamma_profile", "gamma_density", "cum_steepness", "systemic_pulse", "total_gex", "total_dex", "iv_tracker", "vol_surface_3d", "gex_dex_combined", "bs_pricing", "oi_tracker", "vwgex", "spread_heatmap", "oi_buildup", "gex_decay", "hedge_flow", "max_pain", "gamma_range", "participant", "fii_alignment", "pcr_volume", "system_gamma", "sig_composite", "sig_flip", "sig_wall_decay", "sig_iv_divergence", "sig_oi_asymmetry", "sig_delta_accel", "oi_heatmap", "oi_importance", "oi_evolution", "oi_lifecycle", "max_pain_migration", "daily_study", "cross_expiry_study"})
+_CHART_TYPES_DETAIL = f"Unknown chart type. Valid: {', '.join(sorted(CHART_TYPES))}"
+
+_CHART_CACHE_SIZE = 256
+_CHART_CACHE: "OrderedDict[tuple, bytes]" = OrderedDict()
+_chart_cache_lock = threading.Lock()
+
+
+def _chart_cache_get(key: tuple):
+    with _chart_cache_lock:
+        figure = _CHART_CACHE.get(key)
+        if figure is not None:
+            _CHART_CACHE.move_to_end(key)
+        return figure
+
+
+def _figure_default(obj):
+    if isinstance(obj, (np.integer, np.floating)): return float(obj)
+    # Arrays orjson can't take natively (object dtype, non-contiguous views)
+    if isinstance(obj, np.ndarray): return obj.tolist()
+    return str(obj)
+
+
+def _encode_figure(fig) -> bytes:
+    """Builder output (fig.to_dict()) → JSON bytes, encoded once here.
+
+    orjson writes NaN/inf as null, where json.dumps emitted bare NaN tokens.
+    """
+    return orjson.dumps(fig, default=_figure_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _figure_body(index: str, chart_type: str, figure: bytes, tail: bytes = b"") -> bytes:
+    """{"index", "chart_type", "figure"} with the figure spliced in as raw JSON.
+
+    Embedding it as a JSON *string* meant escaping every quote of a large
+    payload and a second JSON.parse in the browser (charts.js accepts both).
+    tail is extra pre-encoded members, e.g. b',"summary":{...}'.
+    """
+    return b"".join((
+        b'{"index":', orjson.dumps(index),
+        b',"chart_type":', orjson.dumps(chart_type),
+        b',"figure":', figure, tail, b"}",
+    ))
+
+
+def _figure_response(index: str, chart_type: str, figure: bytes, headers: Optional[dict] = None) -> Response:
+    return Response(content=_figure_body(index, chart_type, figure), media_type="application/json", headers=headers)
+
+
+def _members_tail(members: dict) -> bytes:
+    """Extra top-level members (summary, ...) pre-encoded for _figure_body."""
+    return b"".join(
+        b"," + orjson.dumps(name) + b":"
+        + orjson.dumps(value, default=_figure_default, option=orjson.OPT_SERIALIZE_NUMPY)
+        for name, value in members.items()
+    )
+
+
+def _figure_members_response(index: str, chart_type: str, fig, **members) -> Response:
+    """_figure_response plus extra top-level members (summary, ...), all in
+    one orjson pass instead of a json.dumps'd figure string inside the dict."""
+    return Response(
+        content=_figure_body(index, chart_type, _encode_figure(fig), _members_tail(members)),
+        media_type="application/json",
+    )
+
+
+def _chart_cache_put(key: tuple, figure: bytes) -> None:
+    with _chart_cache_lock:
+        _CHART_CACHE[key] = figure
+        _CHART_CACHE.move_to_end(key)
+        while len(_CHART_CACHE) > _CHART_CACHE_SIZE:
+            _CHART_CACHE.popitem(last=False)
+
+
+# Per-strike exposure frames, shared by the net/abs and cumulative variants
+# of each chart (gex & cum_gex, dex & cum_dex, ...). Builders only read them.
+_EXPOSURE_FNS = {
+    "gex": calculate_gex,
+    "dex": calculate_delta_exposure,
+    "vex": calculate_vanna_exposure,
+    "cex": calculate_charm_exposure,
+}
+
+
+def _exposure_frame(kind: str, index: str, lot_size: int) -> pd.DataFrame:
+    # day in the key: vanna/charm derive DTE from today's date
+    return store.get_or_compute(
+        index, (kind, lot_size, date.today().toordinal()),
+        lambda: _EXPOSURE_FNS[kind](store.get_data(index), lot_size=lot_size),
+    )
+
+
+def _quant_power(index: str, df: pd.DataFrame) -> dict:
+    # Shared with /analysis/metrics (same key), so a refresh that asks for
+    # both the metrics and the quant-power chart computes it once
+    return store.get_or_compute(
+        index, ("quant_power", 75, date.today().toordinal()),
+        lambda: calculate_quant_power(df, float(_spot(df))),
+    )
+
+
+def _flip(index: str, kind: str = None) -> float:
+    # Flip point of one exposure frame, shared by its net and cumulative
+    # charts, or of the snapshot itself (kind=None; same key as /analysis)
+    if kind is None:
+        return store.get_or_compute(
+            index, ("flip",), lambda: calculate_flip_point(store.get_data(index)),
+        )
+    return store.get_or_compute(
+        index, ("flip", kind, _lot(index), date.today().toordinal()),
+        lambda: calculate_flip_point(_exposure_frame(kind, index, _lot(index))),
+    )
+
+
+def _atm(index: str, df: pd.DataFrame) -> float:
+    # Snapshot ATM, shared by the regime map, IV smile, the OI strike maps
+    # and /analysis/metrics
+    return store.get_or_compute(index, "atm", lambda: get_atm_strike(df))
+
+
+def _power_zones(index: str, kind: str = None) -> list:
+    # Top-3 |exposure| strikes behind the zone bands: one exposure frame's
+    # (kind), or the snapshot's Abs_GEX for the regime map (kind=None)
+    if kind is None:
+        return store.get_or_compute(
+            index, ("power_zones",),
+            lambda: get_power_zones(store.get_data(index), 3, "Abs_GEX"),
+        )
+    return store.get_or_compute(
+        index, ("power_zones", kind, _lot(index), date.today().toordinal()),
+        lambda: get_power_zones(_exposure_frame(kind, index, _lot(index)), 3, f"Abs_{kind.upper()}"),
+    )
+
+
+def _lot(index: str) -> int:
+    return INSTRUMENTS.get(index, {}).get("lot_size", 75)
+
+
+def _spot(df: pd.DataFrame):
+    return df["Spot"].iloc[0]
+
+
+# Charts built purely from the loaded snapshot (no history on disk, no other
+# indices): chart_type -> (df, index, mode) -> figure. Built once at import so
+# get_chart dispatches with one dict lookup. Their JSON is cached per (index,
+# chart_type, mode, store.version, day) — day because several calculators
+# derive DTE from today's date.
+_SNAPSHOT_BUILDERS = {
+    "gex":            lambda df, i, m: build_gamma_chart(_exposure_frame("gex", i, _lot(i)), i, mode=m, flip=_flip(i, "gex"), top_zones=_power_zones(i, "gex")),
+    "dex":            lambda df, i, m: build_delta_chart(_exposure_frame("dex", i, _lot(i)), i, mode=m, flip=_flip(i, "dex"), top_zones=_power_zones(i, "dex")),
+    "cum_gex":        lambda df, i, m: build_cumulative_gamma_chart(_exposure_frame("gex", i, _lot(i)), i, mode=m, flip=_flip(i, "gex")),
+    "cum_dex":        lambda df, i, m: build_cumulative_delta_chart(_exposure_frame("dex", i, _lot(i)), i, mode=m, flip=_flip(i, "dex")),
+    "vex":            lambda df, i, m: build_vanna_chart(_exposure_frame("vex", i, _lot(i)), i, mode=m, flip=_flip(i, "vex"), top_zones=_power_zones(i, "vex")),
+    "cum_vex":        lambda df, i, m: build_cumulative_vanna_chart(_exposure_frame("vex", i, _lot(i)), i, mode=m, flip=_flip(i, "vex")),
+    "cex":            lambda df, i, m: build_charm_chart(_exposure_frame("cex", i, _lot(i)), i, mode=m, flip=_flip(i, "cex"), top_zones=_power_zones(i, "cex")),
+    "cum_cex":        lambda df, i, m: build_cumulative_charm_chart(_exposure_frame("cex", i, _lot(i)), i, mode=m, flip=_flip(i, "cex")),
+    "regime":         lambda df, i, m: build_dealer_regime_map(df, i, atm=_atm(i, df), flip=_flip(i), top_zones=_power_zones(i)),
+    "iv_smile":       lambda df, i, m: build_iv_smile(df, atm=_atm(i, df)),
+    "iv_cone":        lambda df, i, m: build_iv_cone_chart(calculate_iv_cone(df), i),
+    "oi_dist":        lambda df, i, m: build_standard_oi_chart(df, i, atm=_atm(i, df)),
+    "oi_flow":        lambda df, i, m: build_oi_flow_chart(df, i, atm=_atm(i, df)),
+    "oi_change":      lambda df, i, m: build_oi_change_chart(df, i, atm=_atm(i, df)),
+    "premium_flow":   lambda df, i, m: build_premium_flow_chart(df, i, atm=_atm(i, df)),
+    "rr_bf":          lambda df, i, m: build_rr_bf(df, i),
+    "quant_power":    lambda df, i, m: build_quant_power_chart(df, i, qp_data=_quant_power(i, df)),
+    "ignition":       lambda df, i, m: build_ignition_heatmap(calculate_greek_sensitivity_grid(df, _spot(df)), i),
+    "reflexivity":    lambda df, i, m: build_dealer_reflexivity_chart(calculate_dealer_reflexivity(df, _spot(df), lot_size=_lot(i)), i),
+    "liquidity":      lambda df, i, m: build_liquidity_depth_chart(calculate_liquidity_profile(df), i),
+    "stickiness":     lambda df, i, m: build_stickiness_chart(calculate_gex_stickiness(df), i),
+    "apex":           lambda df, i, m: build_delta_apex_chart(calculate_delta_neutral_apex(df, _spot(df), lot_size=_lot(i)), i),
+    "gamma_profile":  lambda df, i, m: build_gamma_profile_chart(calculate_gamma_concentration(df), i),
+    "gamma_density":  lambda df, i, m: build_gamma_density_chart(calculate_gamma_density_profile(df, _spot(df), lot_size=_lot(i)), i),
+    "cum_steepness":  lambda df, i, m: build_cum_steepness_chart(calculate_cum_gex_steepness(df, _spot(df)), i),
+    "bs_pricing":     lambda df, i, m: build_bs_pricing_chart(calculate_bs_pricing(df), i),
+    "vwgex":          lambda df, i, m: build_vwgex_chart(calculate_volume_weighted_gex(df, lot_size=_lot(i)), i, mode=m),
+    "spread_heatmap": lambda df, i, m: build_spread_heatmap_chart(calculate_spread_heatmap(_exposure_frame("gex", i, _lot(i))), i),
+    "oi_buildup":     lambda df, i, m: build_oi_buildup_chart(classify_oi_buildup(df), i),
+    "gex_decay":      lambda df, i, m: build_gex_decay_chart(calculate_gex_decay(df, lot_size=_lot(i)), i),
+    "hedge_flow":     lambda df, i, m: build_hedge_flow_chart(calculate_hedge_flow_simulation(df, _spot(df), lot_size=_lot(i)), i),
+    "pcr_volume":     lambda df, i, m: build_pcr_comparison_chart(calculate_pcr_volume(df), i),
+}
+
+
+def _vtl_chart(df, i, m):
+    vtl_res = calculate_vtl(df, _spot(df))
+    return build_vtl_chart(vtl_res, _spot(df), i), {"summary": {
+        "vtl": vtl_res['vtl'],
+        "distance_pct": vtl_res['distance_pct'],
+        "direction": vtl_res['direction'],
+    }}
+
+
+def _max_pain_chart(df, i, m):
+    pain_data = calculate_max_pain(df)
+    return build_max_pain_chart(pain_data, i), {"summary": {
+        "max_pain": pain_data["max_pain_strike"],
+        "pin_risk": pain_data["pin_risk_score"],
+        "pin_label": pain_data["pin_label"],
+        "distance_pct": pain_data["distance_pct"],
+    }}
+
+
+def _gamma_range_chart(df, i, m):
+    range_data = calculate_gamma_adjusted_range(df, lot_size=_lot(i))
+    return build_gamma_adjusted_range_chart(range_data, i), {"summary": {
+        "implied_move": range_data["implied_move_pct"],
+        "adjusted_move": range_data["adjusted_move_pct"],
+        "gamma_multiplier": range_data["gamma_multiplier"],
+        "regime": range_data["regime"],
+    }}
+
+
+# Snapshot-pure charts that also carry top-level members next to the figure:
+# chart_type -> (df, index, mode) -> (figure, members). Same cache key and
+# ETag as _SNAPSHOT_BUILDERS, but the whole response body is cached.
+_SNAPSHOT_SUMMARY_BUILDERS = {
+    "vtl":         _vtl_chart,
+    "max_pain":    _max_pain_chart,
+    "gamma_range": _gamma_range_chart,
+}
+_SNAPSHOT_CHARTS = frozenset(_SNAPSHOT_BUILDERS) | frozenset(_SNAPSHOT_SUMMARY_BUILDERS)
+
+# Charts built from the expiry's snapshot history on disk:
+# chart_type -> (index, expiry, mode) -> figure. Not cached — new files land
+# without a store version bump.
+_HISTORY_BUILDERS = {
+    "migration":    lambda i, e, m: build_migration_chart(get_level_migration(i, e), i),
+    "momentum":     lambda i, e, m: build_momentum_chart(get_flow_momentum(i, e), i),
+    "oi_heatmap":   lambda i, e, m: build_oi_heatmap_chart(get_oi_heatmap(i, e), i, mode=m),
+    "oi_evolution": lambda i, e, m: build_oi_evolution_chart(get_oi_evolution(i, e), i),
+    "oi_lifecycle": lambda i, e, m: build_oi_lifecycle_chart(get_oi_lifecycle(i, e), i),
+}
+
+
+# Resolved once — DATA_DIR is fixed for the life of the process
+_DATA_ROOT = Path(DATA_DIR).resolve()
+
+
+def _stat_snapshot(index: str, expiry: str, name: str) -> tuple:
+    """(path, mtime_ns) of a snapshot file: data/INDEX/EXPIRY/file, or legacy
+    data/EXPIRY/file for Nifty. mtime_ns is None if neither exists.
+
+    One stat both gates existence and keys the caches below, so a rewritten
+    file (e.g. a re-sync) never serves a stale comparison.
+    """
+    path = _DATA_ROOT / index / expiry / name
+    try:
+        return path, path.stat().st_mtime_ns
+    except OSError:
+        pass
+    if index == "Nifty":
+        path = _DATA_ROOT / expiry / name
+        try:
+            return path, path.stat().st_mtime_ns
+        except OSError:
+            pass
+    return path, None
 
 
 @router.get("/charts/compare/{index}/{chart_type}")
 def get_compare_chart(index: str, chart_type: str, expiry: str, file1: str, file2: str):
     """Compare two snapshots and return delta chart."""
-    logger.info("[COMPARE] index=%s, type=%s, expiry=%s, f1=%s, f2=%s", index, chart_type, expiry, file1, file2)
+    logger.debug("[COMPARE] index=%s, type=%s, expiry=%s, f1=%s, f2=%s", index, chart_type, expiry, file1, file2)
     
-    if index not in {**INDICES, **STOCKS}:
+    if index not in INSTRUMENTS:
         raise HTTPException(status_code=404, detail=f"Unknown index: {index}")
         
-    # Build paths and verify
-    data_path = Path(DATA_DIR).resolve()
-    
-    # Try new structure first: data/INDEX/EXPIRY/file
-    path_1 = data_path / index / expiry / file1
-    path_2 = data_path / index / expiry / file2
-    
-    # Fallback to legacy structure: data/EXPIRY/file (for Nifty)
-    if not path_1.exists() and index == "Nifty":
-        path_1 = data_path / expiry / file1
-    if not path_2.exists() and index == "Nifty":
-        path_2 = data_path / expiry / file2
+    path_1, mtime_1 = _stat_snapshot(index, expiry, file1)
+    path_2, mtime_2 = _stat_snapshot(index, expiry, file2)
     
     logger.debug("[COMPARE] Final Path 1: %s", path_1)
     logger.debug("[COMPARE] Final Path 2: %s", path_2)
     
-    if not path_1.exists() or not path_2.exists():
+    if mtime_1 is None or mtime_2 is None:
         msg = f"Data files not found. Searched: {path_1} and {path_2}"
         logger.error("[COMPARE] ERROR: %s", msg)
         raise HTTPException(status_code=404, detail=msg)
         
-    df1, err1 = load_data_file(str(path_1))
-    df2, err2 = load_data_file(str(path_2))
+    cache_key = ("compare", index, chart_type, str(path_1), mtime_1, str(path_2), mtime_2)
+    figure = _chart_cache_get(cache_key)
+    if figure is not None:
+        return _figure_response(index, chart_type, figure)
+
+    df1, err1 = load_data_file_cached(str(path_1), mtime_1)
+    df2, err2 = load_data_file_cached(str(path_2), mtime_2)
     
     if err1 or err2:
         raise HTTPException(status_code=500, detail=f"Error loading comparison files: {err1 or err2}")
@@ -175,34 +436,36 @@ def get_compare_chart(index: str, chart_type: str, expiry: str, file1: str, file
         else:
             raise HTTPException(status_code=400, detail="Comparison not implemented for this chart type")
             
-        return {"index": index, "chart_type": chart_type, "figure": json_str}
+        figure = _encode_figure(json_str)
         
     except Exception as exc:
         logger.error("[COMPARE] Build error: %s", exc)
         raise HTTPException(status_code=500, detail=f"Comparison error: {exc}")
 
+    _chart_cache_put(cache_key, figure)
+    return _figure_response(index, chart_type, figure)
+
 
 @router.get("/charts/direction/{index}/{chart_type}")
 def get_direction_chart(index: str, chart_type: str, expiry: str, file1: str, file2: str):
     """Directional flow analysis based on two snapshots."""
-    from pathlib import Path
-    
-    if index not in {**INDICES, **STOCKS}:
+    if index not in INSTRUMENTS:
         raise HTTPException(status_code=404, detail=f"Unknown index: {index}")
         
-    data_path = Path(DATA_DIR).resolve()
-    
-    # Path resolution (same logic as compare)
-    path_1 = data_path / index / expiry / file1
-    path_2 = data_path / index / expiry / file2
-    if not path_1.exists() and index == "Nifty": path_1 = data_path / expiry / file1
-    if not path_2.exists() and index == "Nifty": path_2 = data_path / expiry / file2
+    path_1, mtime_1 = _stat_snapshot(index, expiry, file1)
+    path_2, mtime_2 = _stat_snapshot(index, expiry, file2)
     
-    if not path_1.exists() or not path_2.exists():
+    if mtime_1 is None or mtime_2 is None:
         raise HTTPException(status_code=404, detail="Data files not found for direction analysis")
         
-    df1, _ = load_data_file(str(path_1))
-    df2, _ = load_data_file(str(path_2))
+    # Cached as the whole response body, since the summary is part of it
+    cache_key = ("direction", index, chart_type, str(path_1), mtime_1, str(path_2), mtime_2)
+    body = _chart_cache_get(cache_key)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+
+    df1, _ = load_data_file_cached(str(path_1), mtime_1)
+    df2, _ = load_data_file_cached(str(path_2), mtime_2)
     
     try:
         flow_data = classify_option_flow(df2, df1, index) # df_now=df2 (later), df_prev=df1 (earlier)
@@ -214,104 +477,68 @@ def get_direction_chart(index: str, chart_type: str, expiry: str, file1: str, fi
         else:
             raise HTTPException(status_code=400, detail="Unknown direction chart type")
             
-        return {
-            "index": index, 
-            "chart_type": chart_type, 
-            "figure": json_str,
-            "summary": {
-                "calls": {"pressure": flow_data['calls']['pressure'], "label": flow_data['calls']['label']},
-                "puts": {"pressure": flow_data['puts']['pressure'], "label": flow_data['puts']['label']}
-            }
-        }
+        summary = orjson.dumps({
+            "calls": {"pressure": flow_data['calls']['pressure'], "label": flow_data['calls']['label']},
+            "puts": {"pressure": flow_data['puts']['pressure'], "label": flow_data['puts']['label']}
+        }, default=_figure_default, option=orjson.OPT_SERIALIZE_NUMPY)
+        body = _figure_body(index, chart_type, _encode_figure(json_str), b',"summary":' + summary)
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Direction analysis error: {exc}")
 
+    _chart_cache_put(cache_key, body)
+    return Response(content=body, media_type="application/json")
+
+
+# store.version restarts at 1 with the process, so ETags carry a boot token to
+# never match a validator a browser kept from a previous run.
+_ETAG_BOOT = format(time.time_ns(), "x")
+
 
 @router.get("/charts/{index}/{chart_type}")
-def get_chart(index: str, chart_type: str, mode: str = "net"):
+def get_chart(request: Request, index: str, chart_type: str, mode: str = "net"):
     """Return Plotly JSON string for the requested chart."""
-    if index not in {**INDICES, **STOCKS}:
+    if index not in INSTRUMENTS:
         raise HTTPException(status_code=404, detail=f"Unknown index: {index}")
     if chart_type not in CHART_TYPES:
         raise HTTPException(
             status_code=400,
-            detail=f"Unknown chart type. Valid: {', '.join(sorted(CHART_TYPES))}",
+            detail=_CHART_TYPES_DETAIL,
         )
     if not store.has_data(index):
         raise HTTPException(status_code=404, detail="No data loaded for this index")
 
+    cache_key = None
+    etag_headers = None
+    if chart_type in _SNAPSHOT_CHARTS:
+        version, day = store.version(index), date.today().toordinal()
+        # Snapshot charts are a pure function of this key, so it doubles as
+        # a validator: unchanged polls get a 304 with no rebuild or body.
+        etag = f'W/"{_ETAG_BOOT}-{version}-{day}-{chart_type}-{mode}"'
+        etag_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=etag_headers)
+        cache_key = (index, chart_type, mode, version, day)
+        cached = _chart_cache_get(cache_key)
+        if cached is not None:
+            if chart_type in _SNAPSHOT_SUMMARY_BUILDERS:
+                return Response(content=cached, media_type="application/json", headers=etag_headers)
+            return _figure_response(index, chart_type, cached, etag_headers)
+
     df = store.get_data(index)
 
     try:
-        if chart_type == "gex":
-            cfg = {**INDICES, **STOCKS}.get(index, {})
-            df_gex = calculate_gex(df, lot_size=cfg.get("lot_size", 75))
-            json_str = build_gamma_chart(df_gex, index, mode=mode)
-        elif chart_type == "dex":
-            cfg = {**INDICES, **STOCKS}.get(index, {})
-            df_dex   = calculate_delta_exposure(df, lot_size=cfg.get("lot_size", 75))
-            json_str = build_delta_chart(df_dex, index, mode=mode)
-        elif chart_type == "cum_gex":
-            cfg = {**INDICES, **STOCKS}.get(index, {})
-            df_gex = calculate_gex(df, lot_size=cfg.get("lot_size", 75))
-            json_str = build_cumulative_gamma_chart(df_gex, index, mode=mode)
-        elif chart_type == "cum_dex":
-            cfg = {**INDICES, **STOCKS}.get(index, {})
-            df_dex   = calculate_delta_exposure(df, lot_size=cfg.get("lot_size", 75))
-            json_str = build_cumulative_delta_chart(df_dex, index, mode=mode)
-        elif chart_type == "vex":
-            cfg = {**INDICES, **STOCKS}.get(index, {})
-            df_vex   = calculate_vanna_exposure(df, lot_size=cfg.get("lot_size", 75))
-            json_str = build_vanna_chart(df_vex, index, mode=mode)
-        elif chart_type == "cum_vex":
-            cfg = {**INDICES, **STOCKS}.get(index, {})
-            df_vex   = calculate_vanna_exposure(df, lot_size=cfg.get("lot_size", 75))
-            json_str = build_cumulative_vanna_chart(df_vex, index, mode=mode)
-        elif chart_type == "cex":
-            cfg = {**INDICES, **STOCKS}.get(index, {})
-            df_cex   = calculate_charm_exposure(df, lot_size=cfg.get("lot_size", 75))
-            json_str = build_charm_chart(df_cex, index, mode=mode)
-        elif chart_type == "cum_cex":
-            cfg = {**INDICES, **STOCKS}.get(index, {})
-            df_cex   = calculate_charm_exposure(df, lot_size=cfg.get("lot_size", 75))
-            json_str = build_cumulative_charm_chart(df_cex, index, mode=mode)
-        elif chart_type == "regime":
-            json_str = build_dealer_regime_map(df, index)
-        elif chart_type == "iv_smile":
-            json_str = build_iv_smile(df)
-        elif chart_type == "iv_cone":
-            df_cone  = calculate_iv_cone(df)
-            json_str = build_iv_cone_chart(df_cone, index)
-        elif chart_type == "oi_dist":
-            json_str = build_standard_oi_chart(df, index)
-        elif chart_type == "oi_flow":
-            json_str = build_oi_flow_chart(df, index)
-        elif chart_type == "oi_change":
-            json_str = build_oi_change_chart(df, index)
-        elif chart_type == "premium_flow":
-            json_str = build_premium_flow_chart(df, index)
-        elif chart_type == "rr_bf":
-            json_str = build_rr_bf(df, index)
-        elif chart_type == "vtl":
-            vtl_res  = calculate_vtl(df, df["Spot"].iloc[0])
-            json_str = build_vtl_chart(vtl_res, df["Spot"].iloc[0], index)
-            return {
-                "index": index,
-                "chart_type": chart_type,
-                "figure": json_str,
-                "summary": {
-                    "vtl": vtl_res['vtl'],
-                    "distance_pct": vtl_res['distance_pct'],
-                    "direction": vtl_res['direction']
-                }
-            }
-        elif chart_type == "quant_power":
-            json_str = build_quant_power_chart(df, index)
-        elif chart_type == "migration":
+        builder = _SNAPSHOT_BUILDERS.get(chart_type)
+        if builder is not None:
+            json_str = builder(df, index, mode)
+        elif chart_type in _SNAPSHOT_SUMMARY_BUILDERS:
+            json_str, members = _SNAPSHOT_SUMMARY_BUILDERS[chart_type](df, index, mode)
+            body = _figure_body(index, chart_type, _encode_figure(json_str), _members_tail(members))
+            _chart_cache_put(cache_key, body)
+            return Response(content=body, media_type="application/json", headers=etag_headers)
+        elif chart_type in _HISTORY_BUILDERS:
             expiry = df["expiry"].iloc[0] if "expiry" in df.columns else None
             if not expiry: raise HTTPException(status_code=400, detail="Expiry not found")
-            mig_data = get_level_migration(index, expiry)
-            json_str = build_migration_chart(mig_data, index)
+            json_str = _HISTORY_BUILDERS[chart_type](index, expiry, mode)
         elif chart_type == "vol_spread":
             spot = df["Spot"].iloc[0]
             expiry = df["expiry"].iloc[0] if "expiry" in df.columns else None
@@ -325,46 +552,6 @@ def get_chart(index: str, chart_type: str, mode: str = "net"):
                 "sentiment": "Oversold Vol" if vs["ATM_IV"] < rv else "Overpriced Vol (Premium Harvesting)"
             }
             json_str = build_vol_spread_chart(vol_data, index)
-        elif chart_type == "ignition":
-            spot = df["Spot"].iloc[0]
-            grid_data = calculate_greek_sensitivity_grid(df, spot)
-            json_str = build_ignition_heatmap(grid_data, index)
-        elif chart_type == "momentum":
-            expiry = df["expiry"].iloc[0] if "expiry" in df.columns else None
-            if not expiry: raise HTTPException(status_code=400, detail="Expiry not found")
-            mom_data = get_flow_momentum(index, expiry)
-            json_str = build_momentum_chart(mom_data, index)
-        elif chart_type == "reflexivity":
-            spot = df["Spot"].iloc[0]
-            cfg = {**INDICES, **STOCKS}.get(index, {})
-            lot_size = cfg.get("lot_size", 75)
-            reflex_data = calculate_dealer_reflexivity(df, spot, lot_size=lot_size)
-            json_str = build_dealer_reflexivity_chart(reflex_data, index)
-        elif chart_type == "liquidity":
-            liq_data = calculate_liquidity_profile(df)
-            json_str = build_liquidity_depth_chart(liq_data, index)
-        elif chart_type == "stickiness":
-            sticky_df = calculate_gex_stickiness(df)
-            json_str = build_stickiness_chart(sticky_df, index)
-        elif chart_type == "apex":
-            spot = df["Spot"].iloc[0]
-            cfg = {**INDICES, **STOCKS}.get(index, {})
-            lot_size = cfg.get("lot_size", 75)
-            apex_data = calculate_delta_neutral_apex(df, spot, lot_size=lot_size)
-            json_str = build_delta_apex_chart(apex_data, index)
-        elif chart_type == "gamma_profile":
-            conc_data = calculate_gamma_concentration(df)
-            json_str = build_gamma_profile_chart(conc_data, index)
-        elif chart_type == "gamma_density":
-            spot = df["Spot"].iloc[0]
-            cfg = {**INDICES, **STOCKS}.get(index, {})
-            lot_size = cfg.get("lot_size", 75)
-            density_data = calculate_gamma_density_profile(df, spot, lot_size=lot_size)
-            json_str = build_gamma_density_chart(density_data, index)
-        elif chart_type == "cum_steepness":
-            spot = df["Spot"].iloc[0]
-            steepness = calculate_cum_gex_steepness(df, spot)
-            json_str = build_cum_steepness_chart(steepness, index)
         elif chart_type == "iv_tracker":
             expiry = df["expiry"].iloc[0] if "expiry" in df.columns else None
             if not expiry: raise HTTPException(status_code=400, detail="Expiry not found")
@@ -418,64 +605,6 @@ def get_chart(index: str, chart_type: str, mode: str = "net"):
             
             oi_data = get_intraday_oi_tracker(index, expiry, filter_day=filter_day)
             json_str = build_intraday_oi_chart(oi_data, index, mode=mode)
-        elif chart_type == "bs_pricing":
-            df_bs = calculate_bs_pricing(df)
-            json_str = build_bs_pricing_chart(df_bs, index)
-        elif chart_type == "vwgex":
-            cfg = {**INDICES, **STOCKS}.get(index, {})
-            lot_size = cfg.get("lot_size", 75)
-            df_vw = calculate_volume_weighted_gex(df, lot_size=lot_size)
-            json_str = build_vwgex_chart(df_vw, index, mode=mode)
-        elif chart_type == "spread_heatmap":
-            cfg = {**INDICES, **STOCKS}.get(index, {})
-            lot_size = cfg.get("lot_size", 75)
-            df_gex = calculate_gex(df, lot_size=lot_size)
-            spread_data = calculate_spread_heatmap(df_gex)
-            json_str = build_spread_heatmap_chart(spread_data, index)
-        elif chart_type == "oi_buildup":
-            df_bu = classify_oi_buildup(df)
-            json_str = build_oi_buildup_chart(df_bu, index)
-        elif chart_type == "gex_decay":
-            cfg = {**INDICES, **STOCKS}.get(index, {})
-            lot_size = cfg.get("lot_size", 75)
-            df_decay = calculate_gex_decay(df, lot_size=lot_size)
-            json_str = build_gex_decay_chart(df_decay, index)
-        elif chart_type == "hedge_flow":
-            spot = df["Spot"].iloc[0]
-            cfg = {**INDICES, **STOCKS}.get(index, {})
-            lot_size = cfg.get("lot_size", 75)
-            sim_data = calculate_hedge_flow_simulation(df, spot, lot_size=lot_size)
-            json_str = build_hedge_flow_chart(sim_data, index)
-        elif chart_type == "max_pain":
-            pain_data = calculate_max_pain(df)
-            json_str = build_max_pain_chart(pain_data, index)
-            return {
-                "index": index,
-                "chart_type": chart_type,
-                "figure": json_str if not isinstance(json_str, dict) else json.dumps(json_str, default=lambda o: float(o) if isinstance(o, (np.integer, np.floating)) else o),
-                "summary": {
-                    "max_pain": pain_data["max_pain_strike"],
-                    "pin_risk": pain_data["pin_risk_score"],
-                    "pin_label": pain_data["pin_label"],
-                    "distance_pct": pain_data["distance_pct"],
-                }
-            }
-        elif chart_type == "gamma_range":
-            cfg = {**INDICES, **STOCKS}.get(index, {})
-            lot_size = cfg.get("lot_size", 75)
-            range_data = calculate_gamma_adjusted_range(df, lot_size=lot_size)
-            json_str = build_gamma_adjusted_range_chart(range_data, index)
-            return {
-                "index": index,
-                "chart_type": chart_type,
-                "figure": json_str if not isinstance(json_str, dict) else json.dumps(json_str, default=lambda o: float(o) if isinstance(o, (np.integer, np.floating)) else o),
-                "summary": {
-                    "implied_move": range_data["implied_move_pct"],
-                    "adjusted_move": range_data["adjusted_move_pct"],
-                    "gamma_multiplier": range_data["gamma_multiplier"],
-                    "regime": range_data["regime"],
-                }
-            }
         elif chart_type == "participant":
             from services.participant_service import get_participant_summary
             participant_data = get_participant_summary(last_n_days=20)
@@ -483,13 +612,10 @@ def get_chart(index: str, chart_type: str, mode: str = "net"):
         elif chart_type == "fii_alignment":
             from services.participant_service import get_fii_gamma_correlation
             spot = df["Spot"].iloc[0]
-            flip = calculate_flip_point(df)
+            flip = _flip(index)
             gamma_regime = 1 if spot > flip else -1
             alignment = get_fii_gamma_correlation(gamma_regime, flip, spot)
             json_str = build_fii_gamma_alignment_chart(alignment, index)
-        elif chart_type == "pcr_volume":
-            pcr_data = calculate_pcr_volume(df)
-            json_str = build_pcr_comparison_chart(pcr_data, index)
         elif chart_type == "system_gamma":
             data_map = {}
             for idx_name in ["Nifty", "BankNifty", "Sensex"]:
@@ -515,28 +641,25 @@ def get_chart(index: str, chart_type: str, mode: str = "net"):
             builder = chart_builders[chart_type]
             json_str = builder(sig_data, index)
             if chart_type == "sig_composite":
-                return {
-                    "index": index,
-                    "chart_type": chart_type,
-                    "figure": json_str if not isinstance(json_str, dict) else json.dumps(json_str, default=lambda o: float(o) if isinstance(o, (np.integer, np.floating)) else o),
-                    "summary": {
+                return _figure_members_response(
+                    index, chart_type, json_str,
+                    summary={
                         "composite_score": sig_data.get("composite_score", 0),
                         "urgency": sig_data.get("urgency", ""),
                         "bias": sig_data.get("directional_bias", ""),
                         "snapshots": sig_data.get("snapshots_analyzed", 0),
-                    }
-                }
+                    },
+                )
         elif chart_type == "cross_expiry_study":
             study_data = get_cross_expiry_study(index)
             if "error" in study_data:
                 raise HTTPException(status_code=404, detail=study_data["error"])
             json_str = build_cross_expiry_study_chart(study_data, index)
-            return {
-                "index": index, "chart_type": chart_type,
-                "figure": json.dumps(json_str, default=lambda o: float(o) if isinstance(o, (np.integer, np.floating)) else o) if isinstance(json_str, dict) else json_str,
-                "summary": study_data.get("overall", {}),
-                "max_pain": {k: v for k, v in study_data.get("max_pain", {}).items() if k != "records"},
-            }
+            return _figure_members_response(
+                index, chart_type, json_str,
+                summary=study_data.get("overall", {}),
+                max_pain={k: v for k, v in study_data.get("max_pain", {}).items() if k != "records"},
+            )
         elif chart_type == "daily_study":
             expiry = df["expiry"].iloc[0] if "expiry" in df.columns else None
             if not expiry: raise HTTPException(status_code=400, detail="Expiry not found")
@@ -544,56 +667,38 @@ def get_chart(index: str, chart_type: str, mode: str = "net"):
             if "error" in study_data:
                 raise HTTPException(status_code=404, detail=study_data["error"])
             json_str = build_daily_study_chart(study_data, index)
-            return {
-                "index": index, "chart_type": chart_type,
-                "figure": json.dumps(json_str, default=lambda o: float(o) if isinstance(o, (np.integer, np.floating)) else o) if isinstance(json_str, dict) else json_str,
-                "summary": study_data.get("summary", {}),
-            }
-        elif chart_type == "oi_heatmap":
-            expiry = df["expiry"].iloc[0] if "expiry" in df.columns else None
-            if not expiry: raise HTTPException(status_code=400, detail="Expiry not found")
-            heatmap_data = get_oi_heatmap(index, expiry)
-            json_str = build_oi_heatmap_chart(heatmap_data, index, mode=mode)
+            return _figure_members_response(
+                index, chart_type, json_str,
+                summary=study_data.get("summary", {}),
+            )
         elif chart_type == "oi_importance":
             expiry = df["expiry"].iloc[0] if "expiry" in df.columns else None
             if not expiry: raise HTTPException(status_code=400, detail="Expiry not found")
             importance_data = get_strike_importance(index, expiry)
             json_str = build_strike_importance_chart(importance_data, index, mode=mode)
-            return {
-                "index": index, "chart_type": chart_type,
-                "figure": json.dumps(json_str, default=lambda o: float(o) if isinstance(o, (np.integer, np.floating)) else o) if isinstance(json_str, dict) else json_str,
-                "summary": {
+            return _figure_members_response(
+                index, chart_type, json_str,
+                summary={
                     "top_call_strike": importance_data["call_ranking"][0]["strike"] if importance_data.get("call_ranking") else None,
                     "top_put_strike": importance_data["put_ranking"][0]["strike"] if importance_data.get("put_ranking") else None,
                     "snapshots": importance_data.get("total_snapshots", 0),
-                }
-            }
-        elif chart_type == "oi_evolution":
-            expiry = df["expiry"].iloc[0] if "expiry" in df.columns else None
-            if not expiry: raise HTTPException(status_code=400, detail="Expiry not found")
-            evo_data = get_oi_evolution(index, expiry)
-            json_str = build_oi_evolution_chart(evo_data, index)
-        elif chart_type == "oi_lifecycle":
-            expiry = df["expiry"].iloc[0] if "expiry" in df.columns else None
-            if not expiry: raise HTTPException(status_code=400, detail="Expiry not found")
-            lifecycle_data = get_oi_lifecycle(index, expiry)
-            json_str = build_oi_lifecycle_chart(lifecycle_data, index)
+                },
+            )
         elif chart_type == "max_pain_migration":
             expiry = df["expiry"].iloc[0] if "expiry" in df.columns else None
             if not expiry: raise HTTPException(status_code=400, detail="Expiry not found")
             migration_data = get_max_pain_migration(index, expiry)
             json_str = build_max_pain_migration_chart(migration_data, index)
             latest = migration_data.get("history", [{}])[-1]
-            return {
-                "index": index, "chart_type": chart_type,
-                "figure": json.dumps(json_str, default=lambda o: float(o) if isinstance(o, (np.integer, np.floating)) else o) if isinstance(json_str, dict) else json_str,
-                "summary": {
+            return _figure_members_response(
+                index, chart_type, json_str,
+                summary={
                     "current_max_pain": latest.get("max_pain"),
                     "distance_pct": latest.get("distance_pct"),
-                }
-            }
+                },
+            )
         elif chart_type == "gex_dex_combined":
-            cfg = {**INDICES, **STOCKS}.get(index, {})
+            cfg = INSTRUMENTS.get(index, {})
             lot_size = cfg.get("lot_size", 75)
             spot = float(df["Spot"].iloc[0])
 
@@ -628,19 +733,8 @@ def get_chart(index: str, chart_type: str, mode: str = "net"):
 
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(status_code=500, detail=f"Chart error: {exc}") from exc
-    # Explicitly serialize the figure to JSON on the backend to avoid 
-    # FastAPI's encoder potentially failing on complex Plotly dicts.
-    if isinstance(json_str, dict):
-        # We can use Plotly's JSON encoder if it was a Figure, 
-        # but here we already have a dict or string.
-        # But wait, json_str might have been from fig.to_dict().
-        # Let's just use standard json.dumps for the dict form.
-        def npy_encoder(obj):
-            if isinstance(obj, (np.integer, np.floating)): return float(obj)
-            if isinstance(obj, np.ndarray): return obj.tolist()
-            return obj
-        json_str = json.dumps(json_str, default=npy_encoder)
-
-    return {"index": index, "chart_type": chart_type, "figure": json_str}
-
 
+    figure = _encode_figure(json_str)
+    if cache_key is not None:
+        _chart_cache_put(cache_key, figure)
+    return _figure_response(index, chart_type, figure, etag_headers)
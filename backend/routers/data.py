@@ -9,6 +9,7 @@ Routes:
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
@@ -21,11 +22,10 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 import store
-from core.config import FILTER_STRIKES_RADIUS, INDICES, DATA_DIR, STOCKS
+from core.config import FILTER_STRIKES_RADIUS, INSTRUMENTS, DATA_DIR
 from services.calculations import calculate_gex
 from services.upstox_service import (
     fetch_option_chain_data,
-    filter_near_strikes,
     get_available_files,
     get_next_expiry,
     load_data_file,
@@ -42,8 +42,7 @@ router = APIRouter(prefix="/api", tags=["data"])
 @router.get("/files/{index}")
 def list_files(index: str):
     """Return all saved data files for the given index/stock, grouped by expiry."""
-    all_instruments = {**INDICES, **STOCKS}
-    if index not in all_instruments:
+    if index not in INSTRUMENTS:
         raise HTTPException(status_code=404, detail=f"Unknown index/stock: {index}")
     files = get_available_files(index, data_dir=DATA_DIR)
     return {"index": index, "files": files}
@@ -56,10 +55,9 @@ def list_files(index: str):
 @router.get("/next-expiry/{index}")
 def next_expiry(index: str):
     """Return the next expiry date for the given index/stock."""
-    all_instruments = {**INDICES, **STOCKS}
-    if index not in all_instruments:
+    if index not in INSTRUMENTS:
         raise HTTPException(status_code=404, detail=f"Unknown index/stock: {index}")
-    return {"index": index, "expiry": get_next_expiry(index, all_instruments)}
+    return {"index": index, "expiry": get_next_expiry(index, INSTRUMENTS)}
 
 
 # ---------------------------------------------------------------------------
@@ -70,12 +68,74 @@ class FetchRequest(BaseModel):
     indices: Optional[List[str]] = None  # None = all indices and stocks
 
 
+# At most this many instruments are fetched from Upstox at once (same cap
+# as the auto-fetcher).
+FETCH_CONCURRENCY = 5
+
+
+def _fetch_one(index_name: str, batch_timestamp: str) -> dict:
+    """Fetch, filter, save and load one instrument; returns its result entry."""
+    try:
+        logger.debug("[FETCH] Processing %s...", index_name)
+        
+        if index_name not in INSTRUMENTS:
+            error_msg = f"Unknown index/stock: {index_name}"
+            logger.warning("[FETCH] ✗ %s: %s", index_name, error_msg)
+            return {"index": index_name, "success": False, "error": error_msg}
+
+        logger.debug("[FETCH] Getting next expiry for %s", index_name)
+        expiry = get_next_expiry(index_name, INSTRUMENTS)
+        logger.debug("[FETCH] Next expiry: %s", expiry)
+        
+        logger.debug("[FETCH] Fetching option chain data...")
+        # Strike window applied on the payload, before the frame is built
+        df, error = fetch_option_chain_data(index_name, expiry_date=expiry, indices=INSTRUMENTS,
+                                            filter_radius=FILTER_STRIKES_RADIUS)
+
+        if error:
+            error_msg = f"Failed to fetch data: {error}"
+            logger.error("[FETCH] ✗ %s: %s", index_name, error_msg)
+            return {"index": index_name, "success": False, "error": error_msg}
+
+        logger.debug("[FETCH] Fetched %d rows (±%d strike window)", len(df), FILTER_STRIKES_RADIUS)
+        
+        lot_size    = INSTRUMENTS[index_name]["lot_size"]
+        df_filtered = calculate_gex(df, lot_size)
+        logger.debug("[FETCH] Calculated GEX for %d strikes", len(df_filtered))
+
+        logger.debug("[FETCH] Calling save_data with data_dir=%s, timestamp=%s", DATA_DIR, batch_timestamp)
+        filepath = save_data(df_filtered, index_name, data_dir=DATA_DIR, timestamp_str=batch_timestamp)
+        logger.debug("[FETCH] save_data returned: %s", filepath)
+
+        logger.debug("[FETCH] Setting data in store...")
+        # Auto-load into store
+        store.set_data(index_name, df_filtered, filepath)
+        logger.debug("[FETCH] ✓ Store updated for %s", index_name)
+
+        logger.info("[FETCH] ✓ %s completed successfully", index_name)
+        return {
+            "index":     index_name,
+            "success":   True,
+            "strikes":   len(df_filtered),
+            "filepath":  filepath,
+            "expiry":    expiry,
+        }
+    
+    except Exception as e:
+        error_msg = f"Exception during fetch for {index_name}: {type(e).__name__}: {e}"
+        logger.error("[ERROR-FETCH] %s", error_msg)
+        return {
+            "index": index_name,
+            "success": False,
+            "error": str(e)
+        }
+
+
 @router.post("/fetch")
-def fetch_data(body: FetchRequest):
+async def fetch_data(body: FetchRequest):
     """Fetch live option chain data from Upstox API for one or all indices/stocks."""
     logger.info("[FETCH] Request for indices=%s", body.indices)
-    all_instruments = {**INDICES, **STOCKS}
-    target_indices = body.indices or list(all_instruments.keys())
+    target_indices = body.indices or list(INSTRUMENTS.keys())
     logger.debug("[FETCH] Target indices/stocks: %s", target_indices)
 
     # Generate a single IST timestamp for this entire batch so every instrument
@@ -84,68 +144,18 @@ def fetch_data(body: FetchRequest):
     batch_timestamp = datetime.now(ist).strftime("%d_%H%M%S")
     logger.debug("[FETCH] Batch timestamp (IST): %s", batch_timestamp)
 
-    results = []
-
-    for index_name in target_indices:
-        try:
-            logger.info("[FETCH] Processing %s...", index_name)
-            
-            if index_name not in all_instruments:
-                error_msg = f"Unknown index/stock: {index_name}"
-                logger.warning("[FETCH] ✗ %s: %s", index_name, error_msg)
-                results.append({"index": index_name, "success": False, "error": error_msg})
-                continue
-
-            logger.debug("[FETCH] Getting next expiry for %s", index_name)
-            expiry = get_next_expiry(index_name, all_instruments)
-            logger.info("[FETCH] Next expiry: %s", expiry)
-            
-            logger.debug("[FETCH] Fetching option chain data...")
-            df, error = fetch_option_chain_data(index_name, expiry_date=expiry, indices=all_instruments)
-
-            if error:
-                error_msg = f"Failed to fetch data: {error}"
-                logger.error("[FETCH] ✗ %s: %s", index_name, error_msg)
-                results.append({"index": index_name, "success": False, "error": error_msg})
-                continue
-
-            logger.debug("[FETCH] Fetched %d rows, filtering strikes...", len(df))
-            df_filtered = filter_near_strikes(df, FILTER_STRIKES_RADIUS)
-            logger.debug("[FETCH] After filter: %d strikes", len(df_filtered))
-            
-            lot_size    = all_instruments[index_name]["lot_size"]
-            df_filtered = calculate_gex(df_filtered, lot_size)
-            logger.debug("[FETCH] Calculated GEX for %d strikes", len(df_filtered))
-
-            logger.debug("[FETCH] Calling save_data with data_dir=%s, timestamp=%s", DATA_DIR, batch_timestamp)
-            filepath = save_data(df_filtered, index_name, data_dir=DATA_DIR, timestamp_str=batch_timestamp)
-            logger.info("[FETCH] save_data returned: %s", filepath)
-
-            logger.debug("[FETCH] Setting data in store...")
-            # Auto-load into store
-            store.set_data(index_name, df_filtered, filepath)
-            logger.info("[FETCH] ✓ Store updated for %s", index_name)
-
-            results.append({
-                "index":     index_name,
-                "success":   True,
-                "strikes":   len(df_filtered),
-                "filepath":  filepath,
-                "expiry":    expiry,
-            })
-            logger.info("[FETCH] ✓ %s completed successfully", index_name)
-        
-        except Exception as e:
-            error_msg = f"Exception during fetch for {index_name}: {type(e).__name__}: {e}"
-            logger.error("[ERROR-FETCH] %s", error_msg)
-            results.append({
-                "index": index_name,
-                "success": False,
-                "error": str(e)
-            })
+    # Instruments are independent, so their round trips overlap; each
+    # runs the blocking fetch/save path on a worker thread.
+    sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+    async def run(index_name: str) -> dict:
+        async with sem:
+            return await asyncio.to_thread(_fetch_one, index_name, batch_timestamp)
+
+    results = await asyncio.gather(*(run(name) for name in target_indices))
 
-    logger.info("[FETCH] endpoint returning results")
-    return {"results": results}
+    logger.info("[FETCH] Done: %d/%d succeeded", sum(r["success"] for r in results), len(results))
+    return {"results": list(results)}
 
 
 # ---------------------------------------------------------------------------
@@ -161,8 +171,7 @@ class LoadRequest(BaseModel):
 @router.post("/load")
 def load_data(body: LoadRequest):
     """Load a previously saved CSV file into the in-memory store."""
-    all_instruments = {**INDICES, **STOCKS}
-    if body.index not in all_instruments:
+    if body.index not in INSTRUMENTS:
         raise HTTPException(status_code=404, detail=f"Unknown index/stock: {body.index}")
 
     # Try new structure first, then legacy
@@ -179,7 +188,7 @@ def load_data(body: LoadRequest):
 
     # Recalculate GEX if missing (backward compat)
     if "Total_GEX" not in df.columns:
-        lot_size = all_instruments[body.index]["lot_size"]
+        lot_size = INSTRUMENTS[body.index]["lot_size"]
         df = calculate_gex(df, lot_size)
 
     store.set_data(body.index, df, str(filepath))
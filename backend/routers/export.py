@@ -3,22 +3,31 @@ Export router — download the active DataFrame as CSV.
 Route: GET /api/export/{index}
 """
 
-import io
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 
 import store
-from core.config import INDICES, STOCKS
+from core.config import INSTRUMENTS
 
 router = APIRouter(prefix="/api", tags=["export"])
 
+# Rows encoded per yielded chunk; keeps only one slice of CSV text alive.
+EXPORT_CHUNK_ROWS = 10_000
+
+
+def _iter_csv(df):
+    """Yield df as CSV text: the header, then EXPORT_CHUNK_ROWS rows at a time."""
+    yield df.head(0).to_csv(index=False)
+    for start in range(0, len(df), EXPORT_CHUNK_ROWS):
+        yield df.iloc[start : start + EXPORT_CHUNK_ROWS].to_csv(index=False, header=False)
+
 
 @router.get("/export/{index}")
 def export_csv(index: str):
     """Stream the loaded DataFrame as a CSV file download."""
-    if index not in {**INDICES, **STOCKS}:
+    if index not in INSTRUMENTS:
         raise HTTPException(status_code=404, detail=f"Unknown index: {index}")
     if not store.has_data(index):
         raise HTTPException(status_code=404, detail="No data loaded for this index")
@@ -27,12 +36,8 @@ def export_csv(index: str):
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename  = f"{index.lower()}_analysis_{timestamp}.csv"
 
-    buffer = io.StringIO()
-    df.to_csv(buffer, index=False)
-    buffer.seek(0)
-
     return StreamingResponse(
-        iter([buffer.getvalue()]),
+        _iter_csv(df),
         media_type="text/csv",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
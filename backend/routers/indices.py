@@ -2,39 +2,40 @@
 
 from fastapi import APIRouter
 
-from core.config import DEFAULT_INDEX, INDICES, STOCKS
+from core.config import DEFAULT_INDEX, INSTRUMENTS, STOCKS
 
 router = APIRouter(prefix="/api", tags=["indices"])
 
+# Static for the life of the process — built once at import
+_INDICES_PAYLOAD = {
+    "indices": list(INSTRUMENTS.keys()),
+    "default": DEFAULT_INDEX,
+    "metadata": {
+        name: {
+            "lot_size":    cfg["lot_size"],
+            "expiry_type": cfg["expiry_type"],
+            "type":        "stock" if name in STOCKS else "index",
+        }
+        for name, cfg in INSTRUMENTS.items()
+    },
+}
+
 
 @router.get("/indices")
 def list_indices():
     """Return all configured indices and stocks with metadata."""
-    all_instruments = {**INDICES, **STOCKS}
-    return {
-        "indices": list(all_instruments.keys()),
-        "default": DEFAULT_INDEX,
-        "metadata": {
-            name: {
-                "lot_size":    cfg["lot_size"],
-                "expiry_type": cfg["expiry_type"],
-                "type":        "stock" if name in STOCKS else "index",
-            }
-            for name, cfg in all_instruments.items()
-        },
-    }
+    return _INDICES_PAYLOAD
 
 @router.get("/indices/status")
 def indices_status():
     """Return the current load status and metadata for all indices and stocks."""
     import store
-    all_instruments = {**INDICES, **STOCKS}
     return {
         "status": {
             name: {
                 "hasData": store.has_data(name),
                 "filepath": store.get_filepath(name),
             }
-            for name in all_instruments
+            for name in INSTRUMENTS
         }
     }
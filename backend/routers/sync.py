@@ -11,6 +11,8 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
@@ -116,6 +118,116 @@ def _get_supabase():
     return _supabase
 
 
+# ---------------------------------------------------------------------------
+# Snapshot frames & writer
+#
+# Parquet writes are independent per snapshot, so they run on a thread pool.
+# store.set_data is guarded per index and only moves forward in captured_at,
+# so the dashboard ends on the newest snapshot no matter which worker
+# finishes last.
+# ---------------------------------------------------------------------------
+SYNC_WORKERS = 8
+
+_index_locks: dict[str, threading.Lock] = {}
+_index_locks_guard = threading.Lock()
+
+
+def _index_lock(index_name: str) -> threading.Lock:
+    with _index_locks_guard:
+        lock = _index_locks.get(index_name)
+        if lock is None:
+            lock = _index_locks[index_name] = threading.Lock()
+        return lock
+
+
+def _snapshot_filenames(snapshots: list) -> list:
+    """Parquet filename for every snapshot, parsed in one vectorized pass.
+
+    Supabase REST API always returns timestamptz as UTC regardless of the
+    timezone-aware value inserted — so we must always convert to IST here.
+    Naive values are treated as UTC; unparseable ones fall back to now.
+    """
+    ts = pd.to_datetime(
+        pd.Series([s.get("captured_at", "") for s in snapshots], dtype=object),
+        utc=True, errors="coerce", format="ISO8601",
+    )
+    now = pd.Timestamp.now(tz=ZoneInfo("Asia/Kolkata"))
+    # Round down to the nearest 15-minute interval
+    names = ts.dt.tz_convert("Asia/Kolkata").fillna(now).dt.floor("15min").dt.strftime("%d_%H%M%S")
+    return (names + ".parquet").tolist()
+
+
+def _snapshot_path(snap: dict, filename: str) -> Path:
+    return Path(DATA_DIR) / snap["index_name"] / snap["expiry_date"] / filename
+
+
+def _snapshot_frames(group: list) -> list:
+    """Build the DataFrames for a group of same-shape snapshots of one index.
+
+    All rows are stacked into one frame so column inference, reordering and
+    calculate_gex run once per group instead of once per snapshot, then the
+    stack is sliced back apart by row offset.
+    """
+    index_name = group[0][0]["index_name"]
+    stacked: list = []
+    sizes: list = []
+    snap_ids: list = []
+    for snap, _ in group:
+        stacked.extend(snap["data"])
+        sizes.append(len(snap["data"]))
+        snap_ids.extend([snap["id"]] * len(snap["data"]))
+
+    # Convert to DataFrame and force canonical column order before saving
+    df = _reorder_df(pd.DataFrame(stacked))
+    if "Total_GEX" not in df.columns and index_name in INDICES:
+        df["_snap_id"] = snap_ids   # spot is per snapshot, not per stack
+        df = calculate_gex(df, INDICES[index_name]["lot_size"], by="_snap_id")
+        df = _reorder_df(df.drop(columns="_snap_id"))
+
+    frames, offset = [], 0
+    for size in sizes:
+        frames.append(df.iloc[offset : offset + size].reset_index(drop=True))
+        offset += size
+    return frames
+
+
+def _save_snapshot(snap: dict, filepath: Path, df: pd.DataFrame, newest: dict):
+    """Write one snapshot's frame to filepath and return its id.
+
+    newest maps index_name -> captured_at last pushed to the store in this
+    sync; it is shared by all workers of one batch.
+    """
+    index_name  = snap["index_name"]
+    captured_at = snap.get("captured_at", "")
+
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(filepath, engine="pyarrow", compression="zstd", index=False)
+    logger.debug("[SYNC] Saved: %s (%d strikes)", filepath, len(df))
+
+    # Update in-memory store so dashboard reflects sync immediately
+    with _index_lock(index_name):
+        if captured_at >= newest.get(index_name, ""):
+            newest[index_name] = captured_at
+            store.set_data(index_name, df, str(filepath))
+
+    return snap["id"]
+
+
+DELETE_CHUNK   = 400
+DELETE_WORKERS = 4
+
+
+def _delete_chunk(client, ids: list, i: int) -> int:
+    """Delete ids[i : i + DELETE_CHUNK]; returns how many were deleted (0 on failure)."""
+    chunk = ids[i : i + DELETE_CHUNK]
+    try:
+        client.table("option_snapshots").delete().in_("id", chunk).execute()
+        return len(chunk)
+    except Exception as exc:
+        logger.warning("[SYNC] Chunk delete failed (ids %d-%d): %s", i, i + len(chunk), exc)
+        return 0
+
+
 class SyncRequest(BaseModel):
     since: Optional[str] = None   # ISO-8601: only sync rows after this timestamp
 
@@ -178,75 +290,50 @@ def sync_from_supabase(body: SyncRequest = SyncRequest()):
         logger.info("[SYNC] Nothing to sync — all up to date")
         return {"synced": 0, "skipped": 0, "message": "No new data in Supabase."}
 
-    # 2. Save each snapshot to disk
+    # 2. Save snapshots to disk.
+    # Skips are decided up front, in captured_at order, so when two snapshots
+    # round into the same 15-min file the earlier one still wins exactly as
+    # it did when this loop ran serially. The rest are grouped by shape,
+    # built one frame per group (_snapshot_frames) and written in parallel.
+    _get_canonical_cols()   # warm the lazy global before the workers race on it
     synced_ids  = []
     saved_count = 0
     skip_count  = 0
     total       = len(snapshots)
 
-    for i, snap in enumerate(snapshots, start=1):
-        snap_id     = snap["id"]
-        index_name  = snap["index_name"]
-        expiry_date = snap["expiry_date"]
-        rows        = snap["data"]
-        captured_at = snap.get("captured_at", "")
-
-        logger.info("[SYNC] [%d/%d] %s | captured_at=%s", i, total, index_name, captured_at)
-
+    groups: dict = {}
+    claimed: set = set()
+    for snap, filename in zip(snapshots, _snapshot_filenames(snapshots)):
+        rows = snap["data"]
         if not rows:
-            logger.warning("[SYNC] Empty payload for %s, skipping", snap_id)
-            synced_ids.append(snap_id)
+            logger.warning("[SYNC] Empty payload for %s, skipping", snap["id"])
+            synced_ids.append(snap["id"])
             skip_count += 1
             continue
 
-        # Build filename from captured_at.
-        # Supabase REST API always returns timestamptz as UTC regardless of the
-        # timezone-aware value inserted — so we must always convert to IST here.
-        try:
-            from datetime import timezone as _tz
-            from zoneinfo import ZoneInfo as _ZI
-            ts = datetime.fromisoformat(captured_at)
-            if ts.tzinfo is None:
-                ts = ts.replace(tzinfo=_tz.utc)   # treat naive as UTC
-            ts_ist = ts.astimezone(_ZI("Asia/Kolkata"))
-            # Round down to the nearest 15-minute interval
-            rounded_minute = (ts_ist.minute // 15) * 15
-            ts_ist = ts_ist.replace(minute=rounded_minute, second=0, microsecond=0)
-            filename = ts_ist.strftime("%d_%H%M%S") + ".parquet"
-        except Exception:
-            from zoneinfo import ZoneInfo
-            now = datetime.now(ZoneInfo("Asia/Kolkata"))
-            rounded_minute = (now.minute // 15) * 15
-            now = now.replace(minute=rounded_minute, second=0, microsecond=0)
-            filename = now.strftime("%d_%H%M%S") + ".parquet"
-
-        folder = Path(DATA_DIR) / index_name / expiry_date
-        folder.mkdir(parents=True, exist_ok=True)
-        filepath = folder / filename
-
-        # Deduplicate — skip if file already exists
-        if filepath.exists():
-            logger.info("[SYNC] Already exists, skipping: %s", filename)
-            synced_ids.append(snap_id)
+        # Deduplicate — skip if file already exists (on disk or earlier in this batch)
+        filepath = _snapshot_path(snap, filename)
+        if filepath in claimed or filepath.exists():
+            logger.info("[SYNC] Already exists, skipping: %s", filepath.name)
+            synced_ids.append(snap["id"])
             skip_count += 1
             continue
-
-        # Convert to DataFrame and force canonical column order before saving
-        df = pd.DataFrame(rows)
-        df = _reorder_df(df)
-        if "Total_GEX" not in df.columns and index_name in INDICES:
-            df = calculate_gex(df, INDICES[index_name]["lot_size"])
-            df = _reorder_df(df)
-
-        df.to_parquet(filepath, engine="pyarrow", index=False)
-        logger.debug("[SYNC] Saved: %s (%d strikes)", filename, len(df))
-        logger.info("[SYNC] Saved: %s", filepath)
-
-        # Update in-memory store so dashboard reflects sync immediately
-        store.set_data(index_name, df, str(filepath))
-
-        synced_ids.append(snap_id)
-        saved_count += 1
+        claimed.add(filepath)
+
+        key = (snap["index_name"], snap["expiry_date"], tuple(rows[0]))
+        groups.setdefault(key, []).append((snap, filepath))
+
+    newest: dict = {}
+    with ThreadPoolExecutor(max_workers=SYNC_WORKERS) as pool:
+        futures = []
+        for group in groups.values():
+            for (snap, filepath), df in zip(group, _snapshot_frames(group)):
+                futures.append(pool.submit(_save_snapshot, snap, filepath, df, newest))
+        for done, fut in enumerate(as_completed(futures), start=1):
+            snap_id = fut.result()
+            logger.info("[SYNC] [%d/%d] saved %s", done, len(futures), snap_id)
+            synced_ids.append(snap_id)
+            saved_count += 1
 
     # 3. Persist the latest captured_at so the next sync starts from here.
     if snapshots:
@@ -257,17 +344,12 @@ def sync_from_supabase(body: SyncRequest = SyncRequest()):
 
     # 5. Delete processed rows from Supabase in chunks to avoid URL length limits.
     # Supabase's .in_() becomes a query-string list; >500 IDs blows the URL limit.
-    CHUNK = 400
+    # Chunks are independent, so a few run concurrently on the shared client.
     if synced_ids:
-        logger.info("[SYNC] Deleting %d row(s) from Supabase in chunks of %d…", len(synced_ids), CHUNK)
-        deleted = 0
-        for i in range(0, len(synced_ids), CHUNK):
-            chunk = synced_ids[i : i + CHUNK]
-            try:
-                client.table("option_snapshots").delete().in_("id", chunk).execute()
-                deleted += len(chunk)
-            except Exception as exc:
-                logger.warning("[SYNC] Chunk delete failed (ids %d-%d): %s", i, i + len(chunk), exc)
+        logger.info("[SYNC] Deleting %d row(s) from Supabase in chunks of %d…", len(synced_ids), DELETE_CHUNK)
+        starts = range(0, len(synced_ids), DELETE_CHUNK)
+        with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as pool:
+            deleted = sum(pool.map(lambda i: _delete_chunk(client, synced_ids, i), starts))
         logger.info("[SYNC] Deleted %d row(s) from Supabase.", deleted)
 
     logger.info("[SYNC] ■ Sync complete — saved=%d, skipped=%d, total=%d", saved_count, skip_count, total)
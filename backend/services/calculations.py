@@ -5,7 +5,7 @@ Ported from streamlit_app/modules/calculations.py
 
 import numpy as np
 import pandas as pd
-from scipy.stats import norm
+from scipy.special import ndtr
 from scipy.optimize import brentq
 from typing import List, Dict, Any, Optional
 
@@ -14,22 +14,81 @@ from typing import List, Dict, Any, Optional
 # GEX
 # ---------------------------------------------------------------------------
 
-def calculate_gex(df: pd.DataFrame, lot_size: int = 75) -> pd.DataFrame:
+def calculate_gex(df: pd.DataFrame, lot_size: int = 75, by: Optional[str] = None) -> pd.DataFrame:
     """
     Standard GEX calculation ($ per 1% move).
     Multiplier = lot_size * spot^2 * 0.01
+
+    by: column identifying stacked snapshots; each group then uses its own
+    first Spot, as if calculate_gex had been called on it separately.
     """
-    df = df.copy()
-    spot = df["Spot"].iloc[0] if "Spot" in df.columns else 1.0
+    if "Spot" not in df.columns:
+        spot = 1.0
+    elif by is not None:
+        spot = df.groupby(by, sort=False)["Spot"].transform("first").to_numpy()
+    else:
+        spot = df["Spot"].iloc[0]
     multiplier = lot_size * (spot ** 2) * 0.01
-    
-    df["Call_GEX"] = -df["call_gamma"] * df["Call_OI"] * multiplier
-    df["Put_GEX"] = df["put_gamma"] * df["Put_OI"] * multiplier
-    df["Total_GEX"] = df["Call_GEX"] + df["Put_GEX"]
-    df["Abs_GEX"] = df["Total_GEX"].abs()
+
+    call_gex = -df["call_gamma"].to_numpy() * df["Call_OI"].to_numpy() * multiplier
+    put_gex  = df["put_gamma"].to_numpy() * df["Put_OI"].to_numpy() * multiplier
+    total    = call_gex + put_gex
+    # Shallow copy: the input's columns are shared, not duplicated; only the
+    # new columns are allocated (the caller's frame is never modified)
+    df = df.copy(deep=False)
+    df["Call_GEX"] = call_gex
+    df["Put_GEX"] = put_gex
+    df["Total_GEX"] = total
+    df["Abs_GEX"] = np.abs(total)
     return df
 
 
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
+
+def _leg_d1_d2(spot, K: np.ndarray, iv_pct: np.ndarray, T: np.ndarray, r: float):
+    """Black-Scholes d1/d2 for one option leg across all strikes at once.
+
+    Rows with a missing or non-positive IV are masked out (valid=False) and
+    computed against a dummy sigma, so callers can np.where() them to 0
+    without fancy-indexing every intermediate.
+    """
+    sigma = iv_pct / 100.0
+    valid = sigma > 0   # NaN compares False
+    sigma = np.where(valid, sigma, 1.0)
+    sqrt_T = np.sqrt(T)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = (np.log(spot / K) + (r + 0.5 * sigma**2) * T) / (sigma * sqrt_T)
+    d2 = d1 - sigma * sqrt_T
+    return valid, sigma, sqrt_T, d1, d2
+
+
+def _pdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal pdf (scipy's norm.pdf carries ~10x the call overhead)."""
+    return _INV_SQRT_2PI * np.exp(-0.5 * x * x)
+
+
+def _snap(sorted_strikes: np.ndarray, x: float):
+    """Nearest strike to x in a sorted array (ties go to the lower strike)."""
+    i = int(np.searchsorted(sorted_strikes, x))
+    i = min(max(i, 1), len(sorted_strikes) - 1)
+    lo, hi = sorted_strikes[i - 1], sorted_strikes[i]
+    return hi if abs(hi - x) < abs(lo - x) else lo
+
+
+def _time_to_expiry(df: pd.DataFrame) -> np.ndarray:
+    """Years to expiry per row, floored at one day.
+
+    A chain carries one or a few distinct expiries, so only the unique
+    values are parsed and the day counts are mapped back by code.
+    """
+    today = pd.Timestamp("today").normalize()
+    codes, uniq = pd.factorize(df["expiry"])
+    days = (pd.to_datetime(uniq, format="%Y-%m-%d") - today).days.to_numpy(dtype=float)
+    T_days = np.append(days, np.nan)[codes]   # code -1 (missing expiry) -> NaN
+    return np.maximum(T_days / 365.0, 1.0 / 365.0)
+
+
 def calculate_vanna_exposure(df: pd.DataFrame, lot_size: int = 75) -> pd.DataFrame:
     """
     Dealer Vanna Exposure (VEX) calculation using vectorized operations.
@@ -38,37 +97,13 @@ def calculate_vanna_exposure(df: pd.DataFrame, lot_size: int = 75) -> pd.DataFra
     df = df.copy()
     spot = df["Spot"].iloc[0] if "Spot" in df.columns else 1.0
     r = 0.05
-    today = pd.Timestamp("today").normalize()
-
-    # Vectorized Time to Expiry (T)
-    T_days = (pd.to_datetime(df["expiry"], format="%Y-%m-%d") - today).dt.days
-    T = np.maximum(T_days / 365.0, 1.0 / 365.0)
-
-    K = df["Strike"]
-
-    # --- Call Vanna ---
-    sigma_call = df["call_iv"] / 100.0
-    valid_c = (sigma_call > 0) & ~sigma_call.isna()
-    d1_c = np.zeros(len(df))
-    d2_c = np.zeros(len(df))
-    vanna_c = np.zeros(len(df))
-    
-    d1_c[valid_c] = (np.log(spot / K[valid_c]) + (r + 0.5 * sigma_call[valid_c]**2) * T[valid_c]) / (sigma_call[valid_c] * np.sqrt(T[valid_c]))
-    d2_c[valid_c] = d1_c[valid_c] - sigma_call[valid_c] * np.sqrt(T[valid_c])
-    vanna_c[valid_c] = -norm.pdf(d1_c[valid_c]) * d2_c[valid_c] / sigma_call[valid_c]
-    df["call_vanna"] = vanna_c
+    T = _time_to_expiry(df)
+    K = df["Strike"].to_numpy(dtype=float)
 
-    # --- Put Vanna ---
-    sigma_put = df["put_iv"] / 100.0
-    valid_p = (sigma_put > 0) & ~sigma_put.isna()
-    d1_p = np.zeros(len(df))
-    d2_p = np.zeros(len(df))
-    vanna_p = np.zeros(len(df))
-    
-    d1_p[valid_p] = (np.log(spot / K[valid_p]) + (r + 0.5 * sigma_put[valid_p]**2) * T[valid_p]) / (sigma_put[valid_p] * np.sqrt(T[valid_p]))
-    d2_p[valid_p] = d1_p[valid_p] - sigma_put[valid_p] * np.sqrt(T[valid_p])
-    vanna_p[valid_p] = -norm.pdf(d1_p[valid_p]) * d2_p[valid_p] / sigma_put[valid_p]
-    df["put_vanna"] = vanna_p
+    # --- Call / Put Vanna ---
+    for leg in ("call", "put"):
+        valid, sigma, _, d1, d2 = _leg_d1_d2(spot, K, df[f"{leg}_iv"].to_numpy(dtype=float), T, r)
+        df[f"{leg}_vanna"] = np.where(valid, -_pdf(d1) * d2 / sigma, 0.0)
 
     multiplier = lot_size * spot * 0.01
     
@@ -85,43 +120,18 @@ def calculate_charm_exposure(df: pd.DataFrame, lot_size: int = 75) -> pd.DataFra
     Dealer Charm Exposure (CEX) calculation using vectorized operations.
     Dealer_CEX = - (Charm * OI * lot_size * spot * sign)
     """
-    import numpy as np
-    from scipy.stats import norm
-
     df = df.copy()
     spot = df["Spot"].iloc[0] if "Spot" in df.columns else 1.0
     r = 0.05
-    today = pd.Timestamp("today").normalize()
+    T = _time_to_expiry(df)
+    K = df["Strike"].to_numpy(dtype=float)
 
-    # Vectorized Time to Expiry (T)
-    T_days = (pd.to_datetime(df["expiry"], format="%Y-%m-%d") - today).dt.days
-    T = np.maximum(T_days / 365.0, 1.0 / 365.0)
-
-    K = df["Strike"]
-
-    # --- Call Charm ---
-    sigma_call = df["call_iv"] / 100.0
-    valid_c = (sigma_call > 0) & ~sigma_call.isna()
-    d1_c = np.zeros(len(df))
-    d2_c = np.zeros(len(df))
-    charm_c = np.zeros(len(df))
-    
-    d1_c[valid_c] = (np.log(spot / K[valid_c]) + (r + 0.5 * sigma_call[valid_c]**2) * T[valid_c]) / (sigma_call[valid_c] * np.sqrt(T[valid_c]))
-    d2_c[valid_c] = d1_c[valid_c] - sigma_call[valid_c] * np.sqrt(T[valid_c])
-    charm_c[valid_c] = -norm.pdf(d1_c[valid_c]) * ((r / (sigma_call[valid_c] * np.sqrt(T[valid_c]))) - (d2_c[valid_c] / (2.0 * T[valid_c])))
-    df["call_charm"] = charm_c
-
-    # --- Put Charm ---
-    sigma_put = df["put_iv"] / 100.0
-    valid_p = (sigma_put > 0) & ~sigma_put.isna()
-    d1_p = np.zeros(len(df))
-    d2_p = np.zeros(len(df))
-    charm_p = np.zeros(len(df))
-    
-    d1_p[valid_p] = (np.log(spot / K[valid_p]) + (r + 0.5 * sigma_put[valid_p]**2) * T[valid_p]) / (sigma_put[valid_p] * np.sqrt(T[valid_p]))
-    d2_p[valid_p] = d1_p[valid_p] - sigma_put[valid_p] * np.sqrt(T[valid_p])
-    charm_p[valid_p] = -norm.pdf(d1_p[valid_p]) * ((r / (sigma_put[valid_p] * np.sqrt(T[valid_p]))) - (d2_p[valid_p] / (2.0 * T[valid_p])))
-    df["put_charm"] = charm_p
+    # --- Call / Put Charm ---
+    for leg in ("call", "put"):
+        valid, sigma, sqrt_T, d1, d2 = _leg_d1_d2(spot, K, df[f"{leg}_iv"].to_numpy(dtype=float), T, r)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            charm = -_pdf(d1) * ((r / (sigma * sqrt_T)) - (d2 / (2.0 * T)))
+        df[f"{leg}_charm"] = np.where(valid, charm, 0.0)
 
     multiplier = lot_size * spot
     
@@ -138,14 +148,17 @@ def calculate_delta_exposure(df: pd.DataFrame, lot_size: int = 75) -> pd.DataFra
     Standard Delta Exposure calculation.
     DEX = delta * OI * lot_size * spot
     """
-    df = df.copy()
     spot = df["Spot"].iloc[0] if "Spot" in df.columns else 1.0
     multiplier = lot_size * spot
-    
-    df["Call_DEX"] = -df["call_delta"] * df["Call_OI"] * multiplier
-    df["Put_DEX"] = -df["put_delta"] * df["Put_OI"] * multiplier
-    df["Total_DEX"] = df["Call_DEX"] + df["Put_DEX"]
-    df["Abs_DEX"] = df["Total_DEX"].abs()
+
+    call_dex = -df["call_delta"].to_numpy() * df["Call_OI"].to_numpy() * multiplier
+    put_dex  = -df["put_delta"].to_numpy() * df["Put_OI"].to_numpy() * multiplier
+    total    = call_dex + put_dex
+    df = df.copy(deep=False)
+    df["Call_DEX"] = call_dex
+    df["Put_DEX"] = put_dex
+    df["Total_DEX"] = total
+    df["Abs_DEX"] = np.abs(total)
     return df
 
 
@@ -159,38 +172,48 @@ def calculate_flip_point(df: pd.DataFrame) -> float:
     Standard: Call GEX is Negative, Put GEX is Positive.
     Uses linear interpolation for sub-strike precision.
     """
-    df = df.copy()
     if "Total_GEX" not in df.columns:
         df = calculate_gex(df)
-        
-    # Group by Strike and Sort
-    by_strike = df.groupby("Strike")["Total_GEX"].sum().sort_index()
-    strikes = by_strike.index.values
-    gex_vals = by_strike.values
-    
+
+    # Sum GEX per strike in strike order: stable sort + reduceat over the
+    # run starts (same result as groupby("Strike").sum(), no hash table)
+    strikes = df["Strike"].to_numpy()
+    gex = df["Total_GEX"].to_numpy(dtype=float)
+    order = np.argsort(strikes, kind="stable")
+    order = order[~np.isnan(strikes[order].astype(float))]   # groupby drops NaN keys
+    strikes, starts = np.unique(strikes[order], return_index=True)
+    g_sorted = np.where(np.isnan(gex[order]), 0.0, gex[order])   # sum() skips NaN
+    gex_vals = np.add.reduceat(g_sorted, starts) if len(starts) else g_sorted
+
     # 1. Look for sign change (crossing zero)
     # We find where sign flips from negative (Calls dominate) to positive (Puts dominate)
     # or vice versa.
-    for i in range(len(gex_vals) - 1):
+    g1, g2 = gex_vals[:-1], gex_vals[1:]
+    crossings = np.flatnonzero(((g1 <= 0) & (g2 >= 0)) | ((g1 >= 0) & (g2 <= 0)))
+    if len(crossings):
+        i = crossings[0]
         g1, g2 = gex_vals[i], gex_vals[i+1]
         s1, s2 = strikes[i], strikes[i+1]
-        
-        # Check for zero crossing
-        if (g1 <= 0 and g2 >= 0) or (g1 >= 0 and g2 <= 0):
-            if abs(g2 - g1) < 1e-9: return float(s1)
-            # Linear interpolation: find s where g = 0
-            # formula: s = s1 + (0 - g1) * (s2 - s1) / (g2 - g1)
-            flip_p = s1 - g1 * (s2 - s1) / (g2 - g1)
-            return float(flip_p)
-            
+        if abs(g2 - g1) < 1e-9: return float(s1)
+        # Linear interpolation: find s where g = 0
+        # formula: s = s1 + (0 - g1) * (s2 - s1) / (g2 - g1)
+        flip_p = s1 - g1 * (s2 - s1) / (g2 - g1)
+        return float(flip_p)
+
     # 2. Fallback: If no crossing found, return the strike closest to zero
-    return float(by_strike.abs().idxmin())
+    return float(strikes[np.argmin(np.abs(gex_vals))])
+
+
+def _nearest_pos(values, target: float) -> int:
+    """Row position whose value is closest to target (NaNs are skipped)."""
+    dist = np.abs(np.asarray(values, dtype=float) - target)
+    return 0 if np.isnan(dist).all() else int(np.nanargmin(dist))
 
 
 def get_atm_strike(df: pd.DataFrame) -> float:
     """Return the strike closest to the spot price."""
-    spot = df["Spot"].iloc[0]
-    return df.iloc[(df["Strike"] - spot).abs().argsort().iloc[:1]]["Strike"].values[0]
+    strikes = df["Strike"].to_numpy()
+    return strikes[_nearest_pos(df["Strike"], df["Spot"].iat[0])]
 
 
 def get_dealer_regime(spot_price: float, flip_point: float) -> str:
@@ -206,14 +229,24 @@ def get_gamma_cage(
     """Split data into gamma cage (stability zone) and vacuum (expansion zone)."""
     lo = atm_strike - cage_width * 50
     hi = atm_strike + cage_width * 50
-    cage = df[(df["Strike"] >= lo) & (df["Strike"] <= hi)]
-    vacuum = df[(df["Strike"] < lo) | (df["Strike"] > hi)]
-    return cage, vacuum
-
-
-def get_power_zones(df: pd.DataFrame, top_n: int = 3) -> list[float]:
-    """Return the top_n strikes by absolute GEX."""
-    return df.nlargest(top_n, "Abs_GEX")["Strike"].tolist()
+    strikes = df["Strike"].to_numpy(dtype=float)
+    in_cage = (strikes >= lo) & (strikes <= hi)
+    # The vacuum is the complement; NaN strikes belong to neither side
+    return df[in_cage], df[~in_cage & ~np.isnan(strikes)]
+
+
+def get_power_zones(df: pd.DataFrame, top_n: int = 3, col: str = "Abs_GEX") -> list[float]:
+    """Return the top_n strikes by absolute GEX (or any other column)."""
+    vals = df[col].to_numpy(dtype=float)
+    rows = np.flatnonzero(~np.isnan(vals))   # nlargest drops NaNs
+    vals = vals[rows]
+    k = min(top_n, len(vals))
+    if k <= 0:
+        return []
+    top = np.argpartition(-vals, k - 1)[:k]
+    # Largest first; ties keep row order like nlargest(keep="first")
+    top = top[np.lexsort((top, -vals[top]))]
+    return df["Strike"].to_numpy()[rows[top]].tolist()
 
 
 # ---------------------------------------------------------------------------
@@ -226,17 +259,24 @@ def calculate_vol_surface(df: pd.DataFrame) -> dict:
 
     Returns a dict with RR25, BF10, sentiments, and strike details.
     """
-    atm_row   = df.iloc[(df["call_delta"] - 0.50).abs().argsort().iloc[0]]
-    call_25d  = df.iloc[(df["call_delta"] - 0.25).abs().argsort().iloc[0]]
-    put_25d   = df.iloc[(df["put_delta"]  + 0.25).abs().argsort().iloc[0]]
-    call_10d  = df.iloc[(df["call_delta"] - 0.10).abs().argsort().iloc[0]]
-    put_10d   = df.iloc[(df["put_delta"]  + 0.10).abs().argsort().iloc[0]]
-
-    ATM_IV    = atm_row["call_iv"]
-    IV_call25 = call_25d["call_iv"]
-    IV_put25  = put_25d["put_iv"]
-    IV_call10 = call_10d["call_iv"]
-    IV_put10  = put_10d["put_iv"]
+    # Pull the columns once; each lookup is then an argmin on a plain array
+    call_delta = df["call_delta"].to_numpy(dtype=float)
+    put_delta  = df["put_delta"].to_numpy(dtype=float)
+    call_iv    = df["call_iv"].to_numpy()
+    put_iv     = df["put_iv"].to_numpy()
+    strike     = df["Strike"].to_numpy()
+
+    i_atm = _nearest_pos(call_delta,  0.50)
+    i_c25 = _nearest_pos(call_delta,  0.25)
+    i_p25 = _nearest_pos(put_delta,  -0.25)
+    i_c10 = _nearest_pos(call_delta,  0.10)
+    i_p10 = _nearest_pos(put_delta,  -0.10)
+
+    ATM_IV    = call_iv[i_atm]
+    IV_call25 = call_iv[i_c25]
+    IV_put25  = put_iv[i_p25]
+    IV_call10 = call_iv[i_c10]
+    IV_put10  = put_iv[i_p10]
 
     RR25 = IV_call25 - IV_put25
     BF10 = 0.5 * (IV_call10 + IV_put10) - ATM_IV
@@ -251,11 +291,11 @@ def calculate_vol_surface(df: pd.DataFrame) -> dict:
         "ATM_IV":        ATM_IV,
         "RR25":          RR25,
         "BF10":          BF10,
-        "ATM_Strike":    float(atm_row["Strike"]),
-        "Call25_Strike": float(call_25d["Strike"]),
-        "Put25_Strike":  float(put_25d["Strike"]),
-        "Call10_Strike": float(call_10d["Strike"]),
-        "Put10_Strike":  float(put_10d["Strike"]),
+        "ATM_Strike":    float(strike[i_atm]),
+        "Call25_Strike": float(strike[i_c25]),
+        "Put25_Strike":  float(strike[i_p25]),
+        "Call10_Strike": float(strike[i_c10]),
+        "Put10_Strike":  float(strike[i_p10]),
         "IV_call25":     IV_call25,
         "IV_put25":      IV_put25,
         "IV_call10":     IV_call10,
@@ -275,7 +315,7 @@ def calculate_iv_cone(df: pd.DataFrame) -> pd.DataFrame:
     spot = df["Spot"].iloc[0] if "Spot" in df.columns else 1.0
     
     # Get ATM IV (using mean of call/put IV for stability)
-    atm_row = df.iloc[(df["Strike"] - spot).abs().argsort().iloc[0]]
+    atm_row = df.iloc[_nearest_pos(df["Strike"], spot)]
     iv = (atm_row["call_iv"] + atm_row["put_iv"]) / 2.0 / 100.0
     
     # Horizon: days to nearest expiry (max 30 days for better visualization)
@@ -307,115 +347,79 @@ def calculate_iv_cone(df: pd.DataFrame) -> pd.DataFrame:
 # Quant Power (Blended Vanna & GEX)
 # ---------------------------------------------------------------------------
 
+_QP_COLUMNS = [
+    "call_iv", "put_iv", "call_gamma", "put_gamma",
+    "call_delta", "put_delta", "Call_OI", "Put_OI",
+]
+
+
 def calculate_quant_power(
     df: pd.DataFrame, spot: float, r: float = 0.05, 
     vanna_weight: float = 0.3, contract_size: int = 75
 ) -> dict:
     """
     Returns: quant_power_strike, power_zone_upper, power_zone_lower
+    (plus strikes / blended / cum_delta as ndarrays for the chart)
     """
-    from scipy.stats import norm
-    import numpy as np
-
-    calc_df = df.copy()
-
-    # Expand the standard df to look like a chain (Call side and Put side)
-    # The original Streamlit app data is one row per strike with call/put columns.
-    # To match the intended formula structure which acts on an 'option_type' row,
-    # we unpivot the dataframe momentarily.
-
-    calls = pd.DataFrame({
-        "strike": calc_df["Strike"],
-        "expiry_days": (pd.to_datetime(calc_df["expiry"], format="%Y-%m-%d") - pd.Timestamp("today").normalize()).dt.days.clip(lower=1),
-        "option_type": "call",
-        "open_interest": calc_df["Call_OI"],
-        "iv": calc_df["call_iv"] / 100.0,  # Ensure IV is a decimal
-        "gamma": calc_df["call_gamma"],
-        "delta": calc_df["call_delta"]
-    })
-
-    puts = pd.DataFrame({
-        "strike": calc_df["Strike"],
-        "expiry_days": (pd.to_datetime(calc_df["expiry"], format="%Y-%m-%d") - pd.Timestamp("today").normalize()).dt.days.clip(lower=1),
-        "option_type": "put",
-        "open_interest": calc_df["Put_OI"],
-        "iv": calc_df["put_iv"] / 100.0,
-        "gamma": calc_df["put_gamma"],
-        "delta": calc_df["put_delta"]
-    })
-
-    chain_df = pd.concat([calls, puts], ignore_index=True)
-
-    # Vectorized BS Greeks
-    T = np.maximum(chain_df['expiry_days'].values / 365.0, 1.0 / 365.0)
-    K = chain_df['strike'].values
-    sigma = chain_df['iv'].values
-    opt_type = chain_df['option_type'].str.lower().values
-
-    valid = (sigma > 0) & ~np.isnan(sigma)
-    
-    d1 = np.zeros(len(chain_df))
-    d2 = np.zeros(len(chain_df))
-    pdf_d1 = np.zeros(len(chain_df))
-    
-    d1[valid] = (np.log(spot / K[valid]) + (r + 0.5 * sigma[valid]**2) * T[valid]) / (sigma[valid] * np.sqrt(T[valid]))
-    d2[valid] = d1[valid] - sigma[valid] * np.sqrt(T[valid])
-    pdf_d1[valid] = norm.pdf(d1[valid])
-    
-    calc_gamma = np.zeros(len(chain_df))
-    calc_vanna = np.zeros(len(chain_df))
-    calc_delta = np.zeros(len(chain_df))
-    
-    calc_gamma[valid] = pdf_d1[valid] / (spot * sigma[valid] * np.sqrt(T[valid]))
-    calc_vanna[valid] = -pdf_d1[valid] * d2[valid] / sigma[valid]
-    
-    # Delta logic: norm.cdf(d1) for calls, norm.cdf(d1) - 1 for puts
-    cdf_d1 = np.zeros(len(chain_df))
-    cdf_d1[valid] = norm.cdf(d1[valid])
-    calc_delta[valid] = np.where(opt_type[valid] == 'call', cdf_d1[valid], cdf_d1[valid] - 1)
-
+    # The data is one row per strike with call/put columns, so both legs are
+    # computed side by side on the same N rows -- no unpivot/concat/groupby.
+    T = _time_to_expiry(df)
+    K = df["Strike"].to_numpy()   # keep the source dtype for the returned strikes
+
+    # Every input the core needs, lifted out of pandas in one conversion:
+    # (4, 2, N) = (iv, gamma, delta, OI) x (call, put) x strike. Missing
+    # columns come through reindex as NaN.
+    iv_pct, gamma_api, delta_api, oi_raw = df.reindex(columns=_QP_COLUMNS).to_numpy(dtype=float).T.reshape(4, 2, -1)
+
+    # Both legs go through one Black-Scholes pass over the stacked (2, N)
+    # IVs; the strike/expiry terms broadcast across the leg axis.
+    valid, sigma, sqrt_T, d1, d2 = _leg_d1_d2(spot, K, iv_pct, T, r)
+    pdf_d1 = _pdf(d1)
+    is_put = np.array([[0.0], [1.0]])
+    sign   = np.array([[1.0], [-1.0]])   # calls +ve, puts -ve
+
+    calc_gamma = np.where(valid, pdf_d1 / (spot * sigma * sqrt_T), 0.0)
     # We always override Vanna
-    chain_df['vanna'] = calc_vanna
-    
-    # Set Gamma/Delta fallbacks if column is missing/zero/NaN
-    if "gamma" not in chain_df.columns or (chain_df["gamma"] == 0).all():
-        chain_df['gamma'] = calc_gamma
-    else:
-        chain_df['gamma'] = chain_df['gamma'].fillna(pd.Series(calc_gamma))
+    vanna = np.where(valid, -pdf_d1 * d2 / sigma, 0.0)
+    # Delta logic: N(d1) for calls, N(d1) - 1 for puts
+    calc_delta = np.where(valid, ndtr(d1) - is_put, 0.0)
 
-    if "delta" not in chain_df.columns or (chain_df["delta"] == 0).all():
-        chain_df['delta'] = calc_delta
-    else:
-        chain_df['delta'] = chain_df['delta'].fillna(pd.Series(calc_delta))
+    # Set Gamma/Delta fallbacks if the API column is zero across both legs,
+    # otherwise only fill its NaNs with the computed value
+    gamma = calc_gamma if (gamma_api == 0).all() else np.where(np.isnan(gamma_api), calc_gamma, gamma_api)
+    delta = calc_delta if (delta_api == 0).all() else np.where(np.isnan(delta_api), calc_delta, delta_api)
 
     # Add missing/null protection for greek columns used below
-    chain_df = chain_df.fillna(0)
-
-    # ── Sign: calls +ve, puts -ve ─────────────────────────────────────
-    sign = np.where(chain_df['option_type'].str.lower() == 'call', 1, -1)
+    oi, gamma, delta, vanna = (
+        np.where(np.isnan(a), 0.0, a) for a in (oi_raw, gamma, delta, vanna)
+    )
 
-    # ── Dealer delta contribution per contract ────────────────────────
+    # ── Dealer delta contribution per strike ──────────────────────────
     # Dealers are SHORT options → opposite sign to buyer's delta
-    chain_df['dealer_delta'] = -chain_df['delta'] * chain_df['open_interest'] * contract_size
+    net_dealer_delta = -(delta * oi).sum(axis=0) * contract_size
 
     # ── Dealer exposure = weighted combo of Dealer GEX + Dealer Vanna exposure ─────
     # Standard GEX/VEX are from buyer perspective (Call +, Put -)
     # Dealer perspective = flip signs
-    gex = -(chain_df['gamma'] * chain_df['open_interest'] * contract_size * spot**2 * 0.01 * sign)
-    vex = -(chain_df['vanna'] * chain_df['open_interest'] * contract_size * spot    * 0.01 * sign)
-    chain_df['blended'] = (1 - vanna_weight) * gex + vanna_weight * vex
-
-    # ── Aggregate by strike ───────────────────────────────────────────
-    by_strike = chain_df.groupby('strike').agg(
-        net_dealer_delta=('dealer_delta', 'sum'),
-        blended=('blended', 'sum')
-    ).sort_index()
-
-    strikes   = by_strike.index.values
-    cum_delta = np.cumsum(by_strike['net_dealer_delta'].values)
+    gex_mul = contract_size * spot * spot * 0.01
+    vex_mul = contract_size * spot * 0.01
+    gex = -(gamma * oi * sign).sum(axis=0) * gex_mul
+    vex = -(vanna * oi * sign).sum(axis=0) * vex_mul
+    blended = (1 - vanna_weight) * gex + vanna_weight * vex
+
+    # ── Order by strike (already one row per strike) ──────────────────
+    order     = np.argsort(K, kind="stable")
+    strikes   = K[order]
+    blended   = blended[order]
+    cum_delta = np.cumsum(net_dealer_delta[order])
 
     # ── Quant Power = strike where cumulative dealer delta crosses 0 ──
-    sign_changes = np.where(np.diff(np.sign(cum_delta)))[0]
+    # A strictly one-signed curve has no crossing: skip the sign scan
+    if cum_delta.min() > 0 or cum_delta.max() < 0:
+        sign_changes = ()
+    else:
+        sgn = np.sign(cum_delta)
+        sign_changes = np.flatnonzero(sgn[:-1] != sgn[1:])
     if len(sign_changes) > 0:
         i = sign_changes[0]
         s0, s1, d0, d1 = strikes[i], strikes[i+1], cum_delta[i], cum_delta[i+1]
@@ -425,26 +429,33 @@ def calculate_quant_power(
             quant_power = s0
         else:
             qp_price = s0 + (s1 - s0) * (-d0) / (d1 - d0)
-            quant_power = strikes[np.argmin(np.abs(strikes - qp_price))]
+            quant_power = _snap(strikes, qp_price)
     else:
         quant_power = strikes[np.argmin(np.abs(cum_delta))]
 
     # ── Power Zone = ±1 std dev of blended GEX mass distribution ─────
-    w = np.abs(by_strike['blended'].values)
-    gex_mean = np.average(strikes, weights=w) if w.sum() > 0 else spot
-    gex_std  = np.sqrt(np.average((strikes - gex_mean)**2, weights=w)) if w.sum() > 0 else spot*0.01
+    # One pass of weighted sums; var = E[s^2] - mean^2 (no deviation array)
+    w = np.abs(blended)
+    w_sum = w.sum()
+    if w_sum > 0:
+        gex_mean = (w @ strikes) / w_sum
+        gex_var  = np.einsum("i,i,i->", w, strikes, strikes) / w_sum - gex_mean * gex_mean
+        gex_std  = np.sqrt(max(gex_var, 0.0))
+    else:
+        gex_mean = spot
+        gex_std  = spot*0.01
 
-    power_zone_upper = strikes[np.argmin(np.abs(strikes - (gex_mean + gex_std)))]
-    power_zone_lower = strikes[np.argmin(np.abs(strikes - (gex_mean - gex_std)))]
+    power_zone_upper = _snap(strikes, gex_mean + gex_std)
+    power_zone_lower = _snap(strikes, gex_mean - gex_std)
 
     # Also return the raw blended bar data for charting
     return {
         'quant_power'       : float(quant_power),
         'power_zone_upper'  : float(power_zone_upper),
         'power_zone_lower'  : float(power_zone_lower),
-        'strikes'           : strikes.tolist(),
-        'blended'           : by_strike['blended'].values.tolist(),
-        'cum_delta'         : cum_delta.tolist()
+        'strikes'           : strikes,
+        'blended'           : blended,
+        'cum_delta'         : cum_delta
     }
 
 def calculate_premium_flow(df: pd.DataFrame) -> pd.DataFrame:
@@ -456,7 +467,7 @@ def calculate_premium_flow(df: pd.DataFrame) -> pd.DataFrame:
     """
     df = df.copy()
     spot = df["Spot"].iloc[0]
-    atm_row = df.iloc[(df["Strike"] - spot).abs().argsort().iloc[0]]
+    atm_row = df.iloc[_nearest_pos(df["Strike"], spot)]
     atm_iv = (atm_row["call_iv"] + atm_row["put_iv"]) / 2.0
     
     # Calculate net premium flow per strike
@@ -478,10 +489,8 @@ def calculate_vtl(df: pd.DataFrame, spot: float, r: float = 0.05) -> dict:
     """
     # 1. Normalize data
     df = df.dropna(subset=['call_iv', 'put_iv', 'Call_OI', 'Put_OI']).copy()
-    today = pd.Timestamp("today").normalize()
-    
     strikes = df['Strike'].values
-    T = np.maximum((pd.to_datetime(df['expiry']) - today).dt.days.values, 1.0) / 365.0
+    T = _time_to_expiry(df)
     
     iv_c = df['call_iv'].values / 100.0
     iv_p = df['put_iv'].values / 100.0
@@ -503,7 +512,7 @@ def calculate_vtl(df: pd.DataFrame, spot: float, r: float = 0.05) -> dict:
     sqrtT = np.sqrt(T_mat)
     d1_c = (np.log(S/K) + (r + 0.5*IV_c_mat**2)*T_mat) / (IV_c_mat*sqrtT)
     d2_c = d1_c - IV_c_mat*sqrtT
-    pdf_d1_c = norm.pdf(d1_c)
+    pdf_d1_c = _pdf(d1_c)
     
     gamma_c = pdf_d1_c / (S * IV_c_mat * sqrtT)
     vanna_c = -pdf_d1_c * d2_c / IV_c_mat
@@ -511,7 +520,7 @@ def calculate_vtl(df: pd.DataFrame, spot: float, r: float = 0.05) -> dict:
     # --- Put Greeks ---
     d1_p = (np.log(S/K) + (r + 0.5*IV_p_mat**2)*T_mat) / (IV_p_mat*sqrtT)
     d2_p = d1_p - IV_p_mat*sqrtT
-    pdf_d1_p = norm.pdf(d1_p)
+    pdf_d1_p = _pdf(d1_p)
     
     gamma_p = pdf_d1_p / (S * IV_p_mat * sqrtT)
     vanna_p = -pdf_d1_p * d2_p / IV_p_mat
@@ -608,12 +617,12 @@ def calculate_greek_sensitivity_grid(df: pd.DataFrame, spot: float, range_pct: f
         # Re-calc Gamma at s_test for each strike
         # Call GEX
         d1_c = (np.log(s_test / strikes) + (r + 0.5 * c_iv**2) * T_val) / (c_iv * sqrtT)
-        gamma_c = norm.pdf(d1_c) / (s_test * c_iv * sqrtT)
+        gamma_c = _pdf(d1_c) / (s_test * c_iv * sqrtT)
         gex_c = (strike_df['call_oi'].values * lot_size * 0.1 * s_test * 0.01 * gamma_c)
         
         # Put GEX
         d1_p = (np.log(s_test / strikes) + (r + 0.5 * p_iv**2) * T_val) / (p_iv * sqrtT)
-        gamma_p = norm.pdf(d1_p) / (s_test * p_iv * sqrtT)
+        gamma_p = _pdf(d1_p) / (s_test * p_iv * sqrtT)
         gex_p = -(strike_df['put_oi'].values * lot_size * 0.1 * s_test * 0.01 * gamma_p)
         
         z_gex.append((gex_c + gex_p).tolist())
@@ -652,11 +661,11 @@ def calculate_dealer_reflexivity(df: pd.DataFrame, spot: float, lot_size: int =
     for i, s_test in enumerate(price_steps):
         # Call Gamma
         d1_c = (np.log(s_test / strikes) + (r + 0.5 * c_iv**2) * T) / (c_iv * sqrtT)
-        gamma_c = norm.pdf(d1_c) / (s_test * c_iv * sqrtT)
+        gamma_c = _pdf(d1_c) / (s_test * c_iv * sqrtT)
         
         # Put Gamma
         d1_p = (np.log(s_test / strikes) + (r + 0.5 * p_iv**2) * T) / (p_iv * sqrtT)
-        gamma_p = norm.pdf(d1_p) / (s_test * p_iv * sqrtT)
+        gamma_p = _pdf(d1_p) / (s_test * p_iv * sqrtT)
         
         # Total Dealer Delta Shift (approximate hedging duty)
         # Higher price -> Call Delta Increases (Dealer sells), Put Delta Decreases (Dealer buys)
@@ -768,10 +777,10 @@ def calculate_delta_neutral_apex(df: pd.DataFrame, spot: float, lot_size: int =
     def get_net_delta(s_test):
         # Call Delta
         d1_c = (np.log(s_test / strikes) + (r + 0.5 * c_iv**2) * T) / (c_iv * sqrtT)
-        delta_c = norm.cdf(d1_c)
+        delta_c = ndtr(d1_c)
         # Put Delta
         d1_p = (np.log(s_test / strikes) + (r + 0.5 * p_iv**2) * T) / (p_iv * sqrtT)
-        delta_p = norm.cdf(d1_p) - 1
+        delta_p = ndtr(d1_p) - 1
         # Net Dealer Delta (Short options)
         return -((c_oi * delta_c).sum() + (p_oi * delta_p).sum()) * lot_size
 
@@ -805,12 +814,12 @@ def calculate_delta_neutral_apex(df: pd.DataFrame, spot: float, lot_size: int =
     for s_test in chart_prices:
         # Re-calc for chart
         d1_c = (np.log(s_test / strikes) + (r + 0.5 * c_iv**2) * T) / (c_iv * sqrtT)
-        delta_c = norm.cdf(d1_c)
-        gamma_c = norm.pdf(d1_c) / (s_test * c_iv * sqrtT)
+        delta_c = ndtr(d1_c)
+        gamma_c = _pdf(d1_c) / (s_test * c_iv * sqrtT)
         
         d1_p = (np.log(s_test / strikes) + (r + 0.5 * p_iv**2) * T) / (p_iv * sqrtT)
-        delta_p = norm.cdf(d1_p) - 1
-        gamma_p = norm.pdf(d1_p) / (s_test * p_iv * sqrtT)
+        delta_p = ndtr(d1_p) - 1
+        gamma_p = _pdf(d1_p) / (s_test * p_iv * sqrtT)
         
         net_delta = -((c_oi * delta_c).sum() + (p_oi * delta_p).sum()) * lot_size
         multiplier = lot_size * (s_test ** 2) * 0.01
@@ -913,11 +922,11 @@ def calculate_gamma_density_profile(df: pd.DataFrame, spot: float, lot_size: int
     for s_test in price_steps:
         # Call Gamma
         d1_c = (np.log(s_test / strikes) + (r + 0.5 * c_iv**2) * T) / (c_iv * sqrtT)
-        gamma_c = norm.pdf(d1_c) / (s_test * c_iv * sqrtT)
+        gamma_c = _pdf(d1_c) / (s_test * c_iv * sqrtT)
         
         # Put Gamma
         d1_p = (np.log(s_test / strikes) + (r + 0.5 * p_iv**2) * T) / (p_iv * sqrtT)
-        gamma_p = norm.pdf(d1_p) / (s_test * p_iv * sqrtT)
+        gamma_p = _pdf(d1_p) / (s_test * p_iv * sqrtT)
         
         # Total GEX (Standard convention: Calls -, Puts +)
         # Exposure = Sum(Gamma * S^2 * 0.01 * contracts)
@@ -1009,7 +1018,7 @@ def calculate_bs_pricing(df: pd.DataFrame, r: float = 0.05) -> pd.DataFrame:
     bs_c = np.full(len(df), np.nan)
     d1_c = (np.log(spot / K[v_c]) + (r + 0.5 * sigma_call[v_c]**2) * T[v_c]) / (sigma_call[v_c] * np.sqrt(T[v_c]))
     d2_c = d1_c - sigma_call[v_c] * np.sqrt(T[v_c])
-    bs_c[v_c] = spot * norm.cdf(d1_c) - K[v_c] * np.exp(-r * T[v_c]) * norm.cdf(d2_c)
+    bs_c[v_c] = spot * ndtr(d1_c) - K[v_c] * np.exp(-r * T[v_c]) * ndtr(d2_c)
     df["bs_call_price"] = bs_c
     
     # Puts
@@ -1018,7 +1027,7 @@ def calculate_bs_pricing(df: pd.DataFrame, r: float = 0.05) -> pd.DataFrame:
     bs_p = np.full(len(df), np.nan)
     d1_p = (np.log(spot / K[v_p]) + (r + 0.5 * sigma_put[v_p]**2) * T[v_p]) / (sigma_put[v_p] * np.sqrt(T[v_p]))
     d2_p = d1_p - sigma_put[v_p] * np.sqrt(T[v_p])
-    bs_p[v_p] = K[v_p] * np.exp(-r * T[v_p]) * norm.cdf(-d2_p) - spot * norm.cdf(-d1_p)
+    bs_p[v_p] = K[v_p] * np.exp(-r * T[v_p]) * ndtr(-d2_p) - spot * ndtr(-d1_p)
     df["bs_put_price"] = bs_p
     
     return df
@@ -1309,9 +1318,9 @@ def calculate_hedge_flow_simulation(df: pd.DataFrame, spot: float, lot_size: int
 
     def get_net_delta(s_test):
         d1_c = (np.log(s_test / strikes) + (r + 0.5 * c_iv**2) * T) / (c_iv * sqrtT)
-        delta_c = norm.cdf(d1_c)
+        delta_c = ndtr(d1_c)
         d1_p = (np.log(s_test / strikes) + (r + 0.5 * p_iv**2) * T) / (p_iv * sqrtT)
-        delta_p = norm.cdf(d1_p) - 1
+        delta_p = ndtr(d1_p) - 1
         return -((c_oi * delta_c).sum() + (p_oi * delta_p).sum()) * lot_size
 
     baseline_delta = get_net_delta(spot)
@@ -1,9 +1,10 @@
 """
 Chart service — builds interactive Plotly figures from DataFrames.
-Returns JSON strings that the frontend renders with Plotly.js.
+Returns fig.to_dict() payloads; the router encodes them once for Plotly.js.
 """
 
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
@@ -12,7 +13,6 @@ from services.calculations import (
     calculate_flip_point,
     calculate_quant_power,
     get_atm_strike,
-    get_gamma_cage,
     get_power_zones,
 )
 
@@ -35,52 +35,189 @@ FONT_CLR = "#CBD5E1"
 GRID_CLR = "rgba(255,255,255,0.04)"
 
 
+_BASE_LAYOUT = dict(
+    title=dict(
+        text="",
+        font=dict(size=12, color="#94A3B8", weight=700),
+        x=0.01,
+        y=0.98
+    ),
+    paper_bgcolor=PAPER_BG,
+    plot_bgcolor=PLOT_BG,
+    font=dict(color=FONT_CLR, family="'Inter', sans-serif", size=11),
+    legend=dict(
+        bgcolor="rgba(0,0,0,0)", borderwidth=0,
+        orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1,
+        font=dict(size=10)
+    ),
+    margin=dict(l=50, r=50, t=100, b=60), # More air around title
+    xaxis=dict(
+        gridcolor=GRID_CLR,
+        zeroline=False,
+        showline=True,
+        linecolor="rgba(255,255,255,0.1)",
+        tickfont=dict(size=10)
+    ),
+    yaxis=dict(
+        gridcolor=GRID_CLR,
+        zeroline=True,
+        zerolinecolor="rgba(255,255,255,0.1)",
+        tickfont=dict(size=10)
+    ),
+    height=650, # Taller charts per user request
+    autosize=True
+)
+
+
 def _base_layout(title: str) -> dict:
-    return dict(
-        title=dict(
-            text=title.upper(), 
-            font=dict(size=12, color="#94A3B8", weight=700), 
-            x=0.01,
-            y=0.98
-        ),
-        paper_bgcolor=PAPER_BG,
-        plot_bgcolor=PLOT_BG,
-        font=dict(color=FONT_CLR, family="'Inter', sans-serif", size=11),
-        legend=dict(
-            bgcolor="rgba(0,0,0,0)", borderwidth=0,
-            orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1,
-            font=dict(size=10)
-        ),
-        margin=dict(l=50, r=50, t=100, b=60), # More air around title
-        xaxis=dict(
-            gridcolor=GRID_CLR, 
-            zeroline=False, 
-            showline=True, 
-            linecolor="rgba(255,255,255,0.1)",
-            tickfont=dict(size=10)
-        ),
-        yaxis=dict(
-            gridcolor=GRID_CLR, 
-            zeroline=True, 
-            zerolinecolor="rgba(255,255,255,0.1)",
-            tickfont=dict(size=10)
-        ),
-        height=650, # Taller charts per user request
-        autosize=True
-    )
+    """Fresh copy of the shared layout template with the given title.
+
+    Builders only set keys on the top-level dict and directly on xaxis /
+    yaxis, so those (and title) are copied; the other nested dicts are
+    shared read-only with the template.
+    """
+    base = _BASE_LAYOUT
+    return {
+        **base,
+        "title": {**base["title"], "text": title.upper()},
+        "xaxis": dict(base["xaxis"]),
+        "yaxis": dict(base["yaxis"]),
+    }
 
 
-def _bar_width(df: pd.DataFrame) -> float:
-    strikes = sorted(df["Strike"].unique())
+def _strike_grid(df: pd.DataFrame) -> np.ndarray:
+    """Sorted unique strikes; builders compute it once for bar width and dtick."""
+    return np.unique(df["Strike"].to_numpy())
+
+
+def _bar_width(df: pd.DataFrame, strikes: np.ndarray = None) -> float:
+    if strikes is None:
+        # Only the two lowest distinct strikes matter — two O(n) passes
+        # instead of sorting the whole grid.
+        a = df["Strike"].to_numpy()
+        if a.dtype.kind == "f":
+            a = a[~np.isnan(a)]
+        if a.size < 2:
+            return 50.0
+        lo = a.min()
+        above = a[a > lo]
+        if above.size == 0:
+            return 50.0
+        return (above.min() - lo) * 0.8
     if len(strikes) < 2:
         return 50.0
     return (strikes[1] - strikes[0]) * 0.8
 
 
+def _apply_strike_axis(layout: dict, grid) -> None:
+    """Granular strike x-axis: one tick per step of the sorted strike grid."""
+    if len(grid) > 1:
+        xaxis = layout["xaxis"]
+        xaxis["tickmode"]  = "linear"
+        xaxis["dtick"]     = grid[1] - grid[0]
+        xaxis["tickangle"] = -45
+
+
+def _strike_markers(
+    layout: dict, lines, zones=(), line_width: float = 1.5,
+    font_size: int = 10, label_side: str = "left",
+) -> None:
+    """Put vertical marker lines and shaded bands on a layout dict.
+
+    ``lines`` are (x, label, colour, dash) tuples and ``zones`` are
+    (x0, x1, fillcolor) tuples. They go in as plain shapes/annotations with
+    the builder's single update_layout call; every fig.add_vline/add_vrect
+    rewrites the layout on its own. Labels sit at the top of each line, on
+    ``label_side`` of it like annotation_position="top left"/"top right";
+    a None label draws the line only.
+    """
+    font = dict(size=font_size) if font_size else {}
+    # Lines before bands: the order the builders' add_vline/add_vrect calls ran in
+    layout["shapes"] = [
+        dict(type="line", xref="x", yref="y domain", x0=x, x1=x, y0=0, y1=1,
+             line=dict(color=color, dash=dash, width=line_width))
+        for x, _, color, dash in lines
+    ] + [
+        dict(type="rect", xref="x", yref="y domain", x0=x0, x1=x1, y0=0, y1=1,
+             fillcolor=fill, layer="below", line=dict(width=0))
+        for x0, x1, fill in zones
+    ]
+    layout["annotations"] = [
+        dict(xref="x", yref="y domain", x=x, y=1, text=label, showarrow=False,
+             xanchor="right" if label_side == "left" else "left", yanchor="top",
+             font=dict(font, color=color))
+        for x, label, color, _ in lines if label is not None
+    ]
+
+
 # ---------------------------------------------------------------------------
 # Core Exposure Engines (DRY)
 # ---------------------------------------------------------------------------
 
+# make_subplots(specs=[[{"secondary_y": True}]]) axis wiring, for the
+# engines below that assemble the figure dict themselves.
+_SECONDARY_Y_AXES = dict(
+    xaxis=dict(anchor="y", domain=[0.0, 0.94]),
+    yaxis=dict(anchor="x", domain=[0.0, 1.0]),
+    yaxis2=dict(anchor="x", overlaying="y", side="right"),
+)
+_TEMPLATE = pio.templates[pio.templates.default].to_plotly_json()
+# Exposure values are computed in float64 but only ~7 significant digits
+# matter on a chart; orjson writes float32 arrays with their shorter repr.
+# Strikes keep their own dtype — they are axis positions.
+_WIRE_FLOAT = np.float32
+
+
+def _secondary_y_figure(data: list, layout: dict) -> dict:
+    """fig.to_dict()-shaped figure from plain trace and layout dicts.
+
+    Same output as make_subplots(secondary_y) + add_trace + update_layout,
+    without building and validating the graph_objects tree per call.
+    """
+    axes = _SECONDARY_Y_AXES
+    return {"data": data, "layout": {
+        **layout,
+        "xaxis":  {**axes["xaxis"], **layout["xaxis"]},
+        "yaxis":  {**axes["yaxis"], **layout["yaxis"]},
+        "yaxis2": {**axes["yaxis2"], **layout.get("yaxis2", {})},
+        "template": _TEMPLATE,
+    }}
+
+
+def _figure(data: list, layout: dict) -> dict:
+    """Single-axis counterpart of _secondary_y_figure (go.Figure() + update_layout)."""
+    return {"data": data, "layout": {**layout, "template": _TEMPLATE}}
+
+
+def _exposure_bars(
+    df: pd.DataFrame, mode: str, total_col: str, call_col: str, put_col: str,
+    bw: float, metric_label: str,
+) -> tuple[np.ndarray, list]:
+    """Net (+/-) or call/put bar traces; also returns the strike array for reuse.
+
+    Each column is read out of the frame once and the split is done on the
+    ndarray, so both bars share one strike array. Bar heights go out as
+    float32 (_WIRE_FLOAT).
+    """
+    strikes = df["Strike"].to_numpy()
+    if mode == "net":
+        total = df[total_col].to_numpy(dtype=_WIRE_FLOAT)
+        bars = [
+            (np.maximum(total, 0), bw, C_POS, f"+Dealer {metric_label}"),
+            (np.minimum(total, 0), bw, C_NEG, f"-Dealer {metric_label}"),
+        ]
+    else:
+        bars = [
+            ( np.abs(df[call_col].to_numpy(dtype=_WIRE_FLOAT)), bw * 0.9, C_POS, f"Dealer Call {metric_label} ↑"),
+            (-np.abs(df[put_col].to_numpy(dtype=_WIRE_FLOAT)),  bw * 0.9, C_NEG, f"Dealer Put {metric_label} ↓"),
+        ]
+    return strikes, [
+        dict(type="bar", x=strikes, y=y, width=width, marker=dict(color=color),
+             name=name, opacity=0.9, xaxis="x", yaxis="y")
+        for y, width, color, name in bars
+    ]
+
+
 def _build_exposure_chart(
     df: pd.DataFrame, 
     index_name: str, 
@@ -90,78 +227,44 @@ def _build_exposure_chart(
     put_col: str, 
     abs_col: str, 
     metric_label: str,
-    y_title: str
-) -> str:
+    y_title: str,
+    flip: float = None,
+    top_zones: list = None,
+) -> dict:
     spot      = df["Spot"].iloc[0]
-    flip      = calculate_flip_point(df)
-    bw        = _bar_width(df)
-    top_zones = df.nlargest(3, abs_col)
-
-    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    flip      = calculate_flip_point(df) if flip is None else flip
+    grid      = _strike_grid(df)
+    bw        = _bar_width(df, grid)
+    top_zones = get_power_zones(df, 3, abs_col) if top_zones is None else top_zones
 
+    strikes, data = _exposure_bars(df, mode, total_col, call_col, put_col, bw, metric_label)
     if mode == "net":
-        fig.add_trace(go.Bar(
-            x=df["Strike"].tolist(), y=df[total_col].clip(lower=0).tolist(),
-            width=bw, marker_color=C_POS, name=f"+Dealer {metric_label}", opacity=0.9,
-        ), secondary_y=False)
-
-        fig.add_trace(go.Bar(
-            x=df["Strike"].tolist(), y=df[total_col].clip(upper=0).tolist(),
-            width=bw, marker_color=C_NEG, name=f"-Dealer {metric_label}", opacity=0.9,
-        ), secondary_y=False)
         chart_title = f"{index_name} — Dealer {metric_label} Exposure"
-        final_y_title = y_title
     else:
-        call_vals = df[call_col].abs().tolist()
-        put_vals  = (-df[put_col].abs()).tolist()
-        
-        fig.add_trace(go.Bar(
-            x=df["Strike"].tolist(), y=call_vals,
-            width=bw * 0.9, marker_color=C_POS, name=f"Dealer Call {metric_label} ↑", opacity=0.9,
-        ), secondary_y=False)
-
-        fig.add_trace(go.Bar(
-            x=df["Strike"].tolist(), y=put_vals,
-            width=bw * 0.9, marker_color=C_NEG, name=f"Dealer Put {metric_label} ↓", opacity=0.9,
-        ), secondary_y=False)
         chart_title = f"{index_name} — Dealer Call vs Put {metric_label}"
-        final_y_title = y_title
+    final_y_title = y_title
 
     # Heat & Annotations
-    fig.add_trace(go.Scatter(
-        x=df["Strike"].tolist(), y=df[abs_col].tolist(),
+    data.append(dict(
+        type="scatter", x=strikes, y=df[abs_col].to_numpy(dtype=_WIRE_FLOAT),
         fill="tozeroy", fillcolor=C_ABS,
         line=dict(color="rgba(168,85,247,0.4)", width=2),
         name=f"Absolute Dealer {metric_label} Heat", mode="lines",
-    ), secondary_y=True)
+        xaxis="x", yaxis="y2",
+    ))
 
-    for x, label, color, dash in [
+    layout = _base_layout(chart_title)
+    _strike_markers(layout, [
         (spot, f"SPOT: {spot:.0f}", C_SPOT, "solid"),
         (flip, f"ZERO: {flip:.0f}", C_FLIP, "dot"),
-    ]:
-        fig.add_vline(x=x, line_color=color, line_dash=dash, line_width=1.5,
-                      annotation_text=label, annotation_font_color=color,
-                      annotation_position="top left", annotation_font_size=10)
-
-    for _, row in top_zones.iterrows():
-        fig.add_vrect(
-            x0=row["Strike"] - bw / 2, x1=row["Strike"] + bw / 2,
-            fillcolor=C_ZONE, layer="below", line_width=0,
-        )
-
-    layout = _base_layout(chart_title)
-    strikes = sorted(df["Strike"].unique())
-    if len(strikes) > 1:
-        layout["xaxis"]["tickmode"] = "linear"
-        layout["xaxis"]["dtick"]    = strikes[1] - strikes[0]
-        layout["xaxis"]["tickangle"] = -45
+    ], zones=[(z - bw / 2, z + bw / 2, C_ZONE) for z in top_zones])
+    _apply_strike_axis(layout, grid)
 
     layout["barmode"] = "overlay"
-    layout["yaxis2"] = dict(gridcolor=GRID_CLR, zeroline=False, title=f"Absolute Dealer {metric_label}")
-    layout["yaxis"]["title"] = final_y_title
-    fig.update_layout(**layout)
+    layout["yaxis2"] = dict(gridcolor=GRID_CLR, zeroline=False, title=dict(text=f"Absolute Dealer {metric_label}"))
+    layout["yaxis"]["title"] = dict(text=final_y_title)
 
-    return fig.to_dict()
+    return _secondary_y_figure(data, layout)
 
 
 def _build_cumulative_exposure_chart(
@@ -172,75 +275,56 @@ def _build_cumulative_exposure_chart(
     call_col: str, 
     put_col: str, 
     cum_col: str,
-    metric_label: str
-) -> str:
+    metric_label: str,
+    flip: float = None,
+) -> dict:
     spot = df["Spot"].iloc[0]
-    flip = calculate_flip_point(df)
-    bw   = _bar_width(df)
-    
-    df_sorted = df.sort_values("Strike").copy()
-    df_sorted[cum_col] = df_sorted[total_col].cumsum()
-    
-    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    flip = calculate_flip_point(df) if flip is None else flip
+    grid = _strike_grid(df)
+    bw   = _bar_width(df, grid)
+    
+    # Only the plotted columns, in strike order; no full-frame sort + copy.
+    # Chains usually arrive strike-sorted already: then read df as is.
+    strike_arr = df["Strike"].to_numpy()
+    if strike_arr.size < 2 or bool(np.all(strike_arr[1:] >= strike_arr[:-1])):
+        df_sorted = df
+    else:
+        order     = np.argsort(strike_arr, kind="stable")
+        df_sorted = df[["Strike", total_col, call_col, put_col]].take(order)
+    total     = df_sorted[total_col].to_numpy(dtype=float)
+    cum       = np.nancumsum(total)
+    cum[np.isnan(total)] = np.nan   # Series.cumsum leaves NaN rows as NaN
     
+    strikes, data = _exposure_bars(df_sorted, mode, total_col, call_col, put_col, bw, metric_label)
     if mode == "net":
-        fig.add_trace(go.Bar(
-            x=df_sorted["Strike"].tolist(), y=df_sorted[total_col].clip(lower=0).tolist(),
-            width=bw, marker_color=C_POS, name=f"+Dealer {metric_label}", opacity=0.9,
-        ), secondary_y=False)
-
-        fig.add_trace(go.Bar(
-            x=df_sorted["Strike"].tolist(), y=df_sorted[total_col].clip(upper=0).tolist(),
-            width=bw, marker_color=C_NEG, name=f"-Dealer {metric_label}", opacity=0.9,
-        ), secondary_y=False)
         chart_title = f"{index_name} — Cumulative Dealer {metric_label} Profile"
     else:
-        call_vals = df_sorted[call_col].abs().tolist()
-        put_vals  = (-df_sorted[put_col].abs()).tolist()
-
-        fig.add_trace(go.Bar(
-            x=df_sorted["Strike"].tolist(), y=call_vals,
-            width=bw * 0.9, marker_color=C_POS, name=f"Dealer Call {metric_label} ↑", opacity=0.9,
-        ), secondary_y=False)
-
-        fig.add_trace(go.Bar(
-            x=df_sorted["Strike"].tolist(), y=put_vals,
-            width=bw * 0.9, marker_color=C_NEG, name=f"Dealer Put {metric_label} ↓", opacity=0.9,
-        ), secondary_y=False)
         chart_title = f"{index_name} — Raw Dealer Cum-{metric_label} View"
 
-    fig.add_trace(go.Scatter(
-        x=df_sorted["Strike"].tolist(), 
-        y=df_sorted[cum_col].tolist(),
+    data.append(dict(
+        type="scatter",
+        x=strikes, 
+        y=cum.astype(_WIRE_FLOAT),
         fill="tozeroy",
         fillcolor="rgba(99, 102, 241, 0.1)",
         line=dict(color=C_POS, width=3),
         name=f"Cumulative Dealer {metric_label}",
         mode="lines",
-    ), secondary_y=True)
+        xaxis="x", yaxis="y2",
+    ))
     
-    for x, label, color, dash in [
+    layout = _base_layout(chart_title)
+    _strike_markers(layout, [
         (spot, f"SPOT: {spot:.0f}", C_SPOT, "solid"),
         (flip, f"ZERO: {flip:.0f}", C_FLIP, "dot"),
-    ]:
-        fig.add_vline(x=x, line_color=color, line_dash=dash, line_width=1.5,
-                      annotation_text=label, annotation_font_color=color,
-                      annotation_position="top left", annotation_font_size=10)
-
-    layout = _base_layout(chart_title)
-    strikes = df_sorted["Strike"].unique().tolist()
-    if len(strikes) > 1:
-        layout["xaxis"]["tickmode"] = "linear"
-        layout["xaxis"]["dtick"]    = strikes[1] - strikes[0]
-        layout["xaxis"]["tickangle"] = -45
+    ])
+    _apply_strike_axis(layout, grid)
 
     layout["barmode"] = "overlay"
-    layout["yaxis"]["title"] = f"Strike-wise Dealer {metric_label}"
-    layout["yaxis2"] = dict(gridcolor=GRID_CLR, zeroline=True, title=f"Cumulative Dealer {metric_label}", overlaying="y", side="right")
-    
-    fig.update_layout(**layout)
+    layout["yaxis"]["title"] = dict(text=f"Strike-wise Dealer {metric_label}")
+    layout["yaxis2"] = dict(gridcolor=GRID_CLR, zeroline=True, title=dict(text=f"Cumulative Dealer {metric_label}"), overlaying="y", side="right")
 
-    return fig.to_dict()
+    return _secondary_y_figure(data, layout)
 
 
 
@@ -253,82 +337,67 @@ def _build_cumulative_exposure_chart(
 # 1 — Unified Exposure Charts (Gamma, Delta, Vanna, Charm)
 # ---------------------------------------------------------------------------
 
-def build_gamma_chart(df: pd.DataFrame, index_name: str = "Index", mode: str = "net") -> str:
-    return _build_exposure_chart(df, index_name, mode, "Total_GEX", "Call_GEX", "Put_GEX", "Abs_GEX", "Gamma", "Dealer GEX")
+def build_gamma_chart(df: pd.DataFrame, index_name: str = "Index", mode: str = "net", flip: float = None, top_zones: list = None) -> dict:
+    return _build_exposure_chart(df, index_name, mode, "Total_GEX", "Call_GEX", "Put_GEX", "Abs_GEX", "Gamma", "Dealer GEX", flip=flip, top_zones=top_zones)
 
-def build_delta_chart(df: pd.DataFrame, index_name: str = "Index", mode: str = "net") -> str:
-    return _build_exposure_chart(df, index_name, mode, "Total_DEX", "Call_DEX", "Put_DEX", "Abs_DEX", "Delta", "Net Dealer Delta")
+def build_delta_chart(df: pd.DataFrame, index_name: str = "Index", mode: str = "net", flip: float = None, top_zones: list = None) -> dict:
+    return _build_exposure_chart(df, index_name, mode, "Total_DEX", "Call_DEX", "Put_DEX", "Abs_DEX", "Delta", "Net Dealer Delta", flip=flip, top_zones=top_zones)
 
-def build_cumulative_delta_chart(df: pd.DataFrame, index_name: str = "Index", mode: str = "net") -> str:
-    return _build_cumulative_exposure_chart(df, index_name, mode, "Total_DEX", "Call_DEX", "Put_DEX", "Cum_DEX", "Delta")
+def build_cumulative_delta_chart(df: pd.DataFrame, index_name: str = "Index", mode: str = "net", flip: float = None) -> dict:
+    return _build_cumulative_exposure_chart(df, index_name, mode, "Total_DEX", "Call_DEX", "Put_DEX", "Cum_DEX", "Delta", flip=flip)
 
 # ---------------------------------------------------------------------------
 # 2 — Dealer Regime Map
 # ---------------------------------------------------------------------------
 
-def build_dealer_regime_map(df: pd.DataFrame, index_name: str = "Index") -> str:
+def build_dealer_regime_map(
+    df: pd.DataFrame, index_name: str = "Index", atm: float = None, flip: float = None,
+    top_zones: list = None,
+) -> dict:
     spot        = df["Spot"].iloc[0]
-    atm         = get_atm_strike(df)
-    flip        = calculate_flip_point(df)
-    bw          = _bar_width(df)
+    atm         = get_atm_strike(df) if atm is None else atm
+    flip        = calculate_flip_point(df) if flip is None else flip
+    grid        = _strike_grid(df)
+    bw          = _bar_width(df, grid)
     cage_width  = 4
-    _, _        = get_gamma_cage(df, atm, cage_width)
-    power_nodes = get_power_zones(df, top_n=3)
-
-    fig = make_subplots(specs=[[{"secondary_y": True}]])
-
-    fig.add_trace(go.Bar(
-        x=df["Strike"].tolist(), y=df["Total_GEX"].clip(lower=0).tolist(),
-        width=bw, marker_color=C_POS, name="+Gamma (Stability)", opacity=0.9,
-    ), secondary_y=False)
-
-    fig.add_trace(go.Bar(
-        x=df["Strike"].tolist(), y=df["Total_GEX"].clip(upper=0).tolist(),
-        width=bw, marker_color=C_NEG, name="-Gamma (Fuel)", opacity=0.9,
-    ), secondary_y=False)
-
-    fig.add_trace(go.Scatter(
-        x=df["Strike"].tolist(), y=df["Abs_GEX"].tolist(),
-        fill="tozeroy", fillcolor=C_ABS,
-        line=dict(color="rgba(147,51,234,0.6)", width=1.5),
-        name="Absolute Dealer Gamma Heat", mode="lines",
-    ), secondary_y=True)
+    power_nodes = get_power_zones(df, top_n=3) if top_zones is None else top_zones
+
+    strikes = df["Strike"].to_numpy()
+    net_gex = df["Total_GEX"].to_numpy()
+    data = [
+        dict(type="bar", x=strikes, y=np.maximum(net_gex, 0),
+             width=bw, marker=dict(color=C_POS), name="+Gamma (Stability)", opacity=0.9,
+             xaxis="x", yaxis="y"),
+        dict(type="bar", x=strikes, y=np.minimum(net_gex, 0),
+             width=bw, marker=dict(color=C_NEG), name="-Gamma (Fuel)", opacity=0.9,
+             xaxis="x", yaxis="y"),
+        dict(type="scatter", x=strikes, y=df["Abs_GEX"].to_numpy(),
+             fill="tozeroy", fillcolor=C_ABS,
+             line=dict(color="rgba(147,51,234,0.6)", width=1.5),
+             name="Absolute Dealer Gamma Heat", mode="lines",
+             xaxis="x", yaxis="y2"),
+    ]
 
-    for x, label, color, dash in [
+    layout = _base_layout(f"{index_name} — Dealer Gamma Regime Map")
+    cage = (atm - cage_width * 50, atm + cage_width * 50, C_CAGE)
+    _strike_markers(layout, [
         (spot, f"Spot: {spot:.0f}", C_SPOT, "dash"),
         (atm,  f"ATM: {atm:.0f}",  C_ATM,  "dot"),
         (flip, f"Flip: {flip:.0f}", C_FLIP, "dashdot"),
-    ]:
-        fig.add_vline(x=x, line_color=color, line_dash=dash, line_width=2,
-                      annotation_text=label, annotation_font_color=color)
-
-    # Dealer Gamma cage band
-    fig.add_vrect(
-        x0=atm - cage_width * 50, x1=atm + cage_width * 50,
-        fillcolor=C_CAGE, layer="below", line_width=0,
-        annotation_text="Dealer Gamma Cage", annotation_position="top left",
-        annotation_font_color="#93C5FD",
-    )
-
-    # Power zones
-    for node in power_nodes:
-        fig.add_vrect(x0=node - bw/2, x1=node + bw/2,
-                      fillcolor=C_ZONE, layer="below", line_width=0)
-
-    layout = _base_layout(f"{index_name} — Dealer Gamma Regime Map")
-    # Granular Strike X-Axis
-    strikes = sorted(df["Strike"].unique())
-    if len(strikes) > 1:
-        layout["xaxis"]["tickmode"] = "linear"
-        layout["xaxis"]["dtick"]    = strikes[1] - strikes[0]
-        layout["xaxis"]["tickangle"] = -45
+    ], zones=[cage] + [(z - bw / 2, z + bw / 2, C_ZONE) for z in power_nodes],
+       line_width=2, font_size=None, label_side="right")
+    # Dealer Gamma cage label, inside the band's top-left corner
+    layout["annotations"].append(dict(
+        xref="x", yref="y domain", x=cage[0], y=1, text="Dealer Gamma Cage",
+        showarrow=False, xanchor="left", yanchor="top", font=dict(color="#93C5FD"),
+    ))
+    _apply_strike_axis(layout, grid)
 
     layout["barmode"] = "overlay"
-    layout["yaxis2"] = dict(gridcolor=GRID_CLR, zeroline=False, title="Absolute Dealer Gamma")
-    layout["yaxis"]["title"] = "Dealer GEX"
-    fig.update_layout(**layout)
+    layout["yaxis2"] = dict(gridcolor=GRID_CLR, zeroline=False, title=dict(text="Absolute Dealer Gamma"))
+    layout["yaxis"]["title"] = dict(text="Dealer GEX")
 
-    return fig.to_dict()
+    return _secondary_y_figure(data, layout)
 
 
 # ---------------------------------------------------------------------------
@@ -336,44 +405,38 @@ def build_dealer_regime_map(df: pd.DataFrame, index_name: str = "Index") -> str:
 # ---------------------------------------------------------------------------
 
 
-def build_cumulative_gamma_chart(df: pd.DataFrame, index_name: str = "Index", mode: str = "net") -> str:
-    return _build_cumulative_exposure_chart(df, index_name, mode, "Total_GEX", "Call_GEX", "Put_GEX", "Cum_GEX", "Gamma")
+def build_cumulative_gamma_chart(df: pd.DataFrame, index_name: str = "Index", mode: str = "net", flip: float = None) -> dict:
+    return _build_cumulative_exposure_chart(df, index_name, mode, "Total_GEX", "Call_GEX", "Put_GEX", "Cum_GEX", "Gamma", flip=flip)
 
 # ---------------------------------------------------------------------------
 # 4 — IV Smile
 # ---------------------------------------------------------------------------
 
-def build_iv_smile(df: pd.DataFrame) -> str:
+def build_iv_smile(df: pd.DataFrame, atm: float = None) -> dict:
     spot = df["Spot"].iloc[0]
-    atm  = get_atm_strike(df)
-
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatter(
-        x=df["Strike"].tolist(), y=df["call_iv"].tolist(),
-        mode="lines+markers", name="Call IV",
-        line=dict(color="#3B82F6", width=2),
-        marker=dict(size=5),
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=df["Strike"].tolist(), y=df["put_iv"].tolist(),
-        mode="lines+markers", name="Put IV",
-        line=dict(color=C_NEG, width=2),
-        marker=dict(size=5),
-    ))
-
-    fig.add_vline(x=spot, line_color=C_SPOT, line_dash="dash", line_width=2,
-                  annotation_text=f"Spot: {spot:.0f}", annotation_font_color=C_SPOT)
-    fig.add_vline(x=atm, line_color=C_ATM, line_dash="dot", line_width=2,
-                  annotation_text=f"ATM: {atm:.0f}", annotation_font_color=C_ATM)
+    atm  = get_atm_strike(df) if atm is None else atm
+
+    strikes = df["Strike"].to_numpy()
+    data = [
+        dict(type="scatter", x=strikes, y=df["call_iv"].to_numpy(),
+             mode="lines+markers", name="Call IV",
+             line=dict(color="#3B82F6", width=2),
+             marker=dict(size=5)),
+        dict(type="scatter", x=strikes, y=df["put_iv"].to_numpy(),
+             mode="lines+markers", name="Put IV",
+             line=dict(color=C_NEG, width=2),
+             marker=dict(size=5)),
+    ]
 
     layout = _base_layout("IV Smile / Skew — Call vs Put Implied Volatility")
-    layout["yaxis"]["title"] = "Implied Volatility (%)"
-    layout["xaxis"]["title"] = "Strike Price"
-    fig.update_layout(**layout)
+    _strike_markers(layout, [
+        (spot, f"Spot: {spot:.0f}", C_SPOT, "dash"),
+        (atm,  f"ATM: {atm:.0f}",  C_ATM,  "dot"),
+    ], line_width=2, font_size=None, label_side="right")
+    layout["yaxis"]["title"] = dict(text="Implied Volatility (%)")
+    layout["xaxis"]["title"] = dict(text="Strike Price")
 
-    return fig.to_dict()
+    return _figure(data, layout)
 
 
 def build_intraday_iv_chart(data: dict, index_name: str = "Index") -> dict:
@@ -436,37 +499,41 @@ def build_intraday_iv_chart(data: dict, index_name: str = "Index") -> dict:
 # 5 — Risk Reversal & Butterfly
 # ---------------------------------------------------------------------------
 
-def build_rr_bf(vol_surface: dict) -> str:
+def build_rr_bf(vol_surface: dict) -> dict:
     rr25 = vol_surface["RR25"]
     bf10 = vol_surface["BF10"]
 
     colors = [C_POS if rr25 > 0 else C_NEG, "#8B5CF6"]
 
-    fig = go.Figure(go.Bar(
+    data = [dict(
+        type="bar",
         x=["25d Risk Reversal (RR25)", "10d Butterfly (BF10)"],
         y=[rr25, bf10],
-        marker_color=colors,
+        marker=dict(color=colors),
         text=[f"{rr25:.3f}%", f"{bf10:.3f}%"],
         textposition="outside",
         textfont=dict(color=FONT_CLR, size=13),
-    ))
-
-    fig.add_hline(y=0, line_color="rgba(255,255,255,0.3)", line_width=1)
+    )]
 
     layout = _base_layout("25d Risk Reversal & 10d Butterfly")
-    layout["yaxis"]["title"] = "Vol %"
+    # Zero line (what fig.add_hline(y=0) produced)
+    layout["shapes"] = [dict(
+        type="line", xref="x domain", x0=0, x1=1, yref="y", y0=0, y1=0,
+        line=dict(color="rgba(255,255,255,0.3)", width=1),
+    )]
+    layout["yaxis"]["title"] = dict(text="Vol %")
     layout["showlegend"] = False
-    fig.update_layout(**layout)
-    return fig.to_dict()
+    return _figure(data, layout)
 
 
 # ---------------------------------------------------------------------------
 # 6 — Quant Power Profile
 # ---------------------------------------------------------------------------
 
-def build_quant_power_chart(df: pd.DataFrame, index_name: str = "Index") -> str:
+def build_quant_power_chart(df: pd.DataFrame, index_name: str = "Index", qp_data: dict = None) -> dict:
     spot = df["Spot"].iloc[0]
-    qp_data = calculate_quant_power(df, spot)
+    if qp_data is None:
+        qp_data = calculate_quant_power(df, spot)
     
     strikes = qp_data["strikes"]
     blended = qp_data["blended"]
@@ -478,54 +545,45 @@ def build_quant_power_chart(df: pd.DataFrame, index_name: str = "Index") -> str:
     
     bw = _bar_width(df)
     
-    fig = make_subplots(specs=[[{"secondary_y": True}]])
-    
     # Blended GEX/Vanna Mass (Bars)
     # We color positive mass cyan and negative mass red, 
     # but the formula treats positive as calls and negative as puts.
     # We will color purely by the sign of the blended value.
     colors = [C_POS if val >= 0 else C_NEG for val in blended]
     
-    fig.add_trace(go.Bar(
-        x=strikes, y=blended,
-        width=bw, marker_color=colors, name="Blended GEX+Vex Mass", opacity=0.8,
-    ), secondary_y=False)
-    
-    # Cumulative Dealer Delta (Line)
-    fig.add_trace(go.Scatter(
-        x=strikes, y=cum_delta,
-        mode="lines", name="Cumulative Dealer Delta",
-        line=dict(color="#FCD34D", width=3),
-    ), secondary_y=True)
-    
-    # Key Levels
-    fig.add_vline(x=spot, line_color=C_SPOT, line_dash="dash", line_width=2,
-                  annotation_text=f"Spot: {spot:.0f}", annotation_font_color=C_SPOT)
-                  
-    fig.add_vline(x=qp_strike, line_color="#E879F9", line_dash="dot", line_width=2,
-                  annotation_text=f"Quant Power: {qp_strike:.0f}", annotation_font_color="#E879F9")
-                  
-    # Power Zone band
-    fig.add_vrect(
-        x0=pz_lower, x1=pz_upper,
-        fillcolor="rgba(232, 121, 249, 0.1)", layer="below", line_width=1,
-        line_color="rgba(232, 121, 249, 0.5)", line_dash="dash",
-        annotation_text="Power Zone (1σ)", annotation_position="top left",
-        annotation_font_color="#E879F9",
-    )
+    data = [
+        dict(type="bar", x=strikes, y=blended,
+             width=bw, marker=dict(color=colors), name="Blended GEX+Vex Mass", opacity=0.8,
+             xaxis="x", yaxis="y"),
+        # Cumulative Dealer Delta (Line)
+        dict(type="scatter", x=strikes, y=cum_delta,
+             mode="lines", name="Cumulative Dealer Delta",
+             line=dict(color="#FCD34D", width=3),
+             xaxis="x", yaxis="y2"),
+    ]
     
     layout = _base_layout(f"{index_name} — Quant Power Profile (GEX + Vanna)")
-    # Granular Strike X-Axis
-    if len(strikes) > 1:
-        layout["xaxis"]["tickmode"] = "linear"
-        layout["xaxis"]["dtick"]    = strikes[1] - strikes[0]
-        layout["xaxis"]["tickangle"] = -45
-
-    layout["yaxis2"] = dict(gridcolor=GRID_CLR, zeroline=True, zerolinecolor="rgba(255,255,255,0.2)", title="Cumulative Dealer Delta")
-    layout["yaxis"]["title"] = "Blended GEX+Vex Exposure"
-    fig.update_layout(**layout)
-    
-    return fig.to_dict()
+    # Key Levels
+    _strike_markers(layout, [
+        (spot,      f"Spot: {spot:.0f}",             C_SPOT,    "dash"),
+        (qp_strike, f"Quant Power: {qp_strike:.0f}", "#E879F9", "dot"),
+    ], line_width=2, font_size=None, label_side="right")
+    # Power Zone band, outlined, label inside its top-left corner
+    layout["shapes"].insert(0, dict(
+        type="rect", xref="x", yref="y domain", x0=pz_lower, x1=pz_upper, y0=0, y1=1,
+        fillcolor="rgba(232, 121, 249, 0.1)", layer="below",
+        line=dict(width=1, color="rgba(232, 121, 249, 0.5)", dash="dash"),
+    ))
+    layout["annotations"].append(dict(
+        xref="x", yref="y domain", x=min(pz_lower, pz_upper), y=1, text="Power Zone (1σ)",
+        showarrow=False, xanchor="left", yanchor="top", font=dict(color="#E879F9"),
+    ))
+    _apply_strike_axis(layout, strikes)
+
+    layout["yaxis2"] = dict(gridcolor=GRID_CLR, zeroline=True, zerolinecolor="rgba(255,255,255,0.2)", title=dict(text="Cumulative Dealer Delta"))
+    layout["yaxis"]["title"] = dict(text="Blended GEX+Vex Exposure")
+
+    return _secondary_y_figure(data, layout)
 
 
 # ---------------------------------------------------------------------------
@@ -533,32 +591,34 @@ def build_quant_power_chart(df: pd.DataFrame, index_name: str = "Index") -> str:
 # ---------------------------------------------------------------------------
 
 
-def build_vanna_chart(df: pd.DataFrame, index_name: str = "Index", mode: str = "net") -> str:
-    return _build_exposure_chart(df, index_name, mode, "Total_VEX", "Call_VEX", "Put_VEX", "Abs_VEX", "Vanna", "Dealer VEX")
+def build_vanna_chart(df: pd.DataFrame, index_name: str = "Index", mode: str = "net", flip: float = None, top_zones: list = None) -> dict:
+    return _build_exposure_chart(df, index_name, mode, "Total_VEX", "Call_VEX", "Put_VEX", "Abs_VEX", "Vanna", "Dealer VEX", flip=flip, top_zones=top_zones)
 
-def build_cumulative_vanna_chart(df: pd.DataFrame, index_name: str = "Index", mode: str = "net") -> str:
-    return _build_cumulative_exposure_chart(df, index_name, mode, "Total_VEX", "Call_VEX", "Put_VEX", "Cum_VEX", "Vanna")
+def build_cumulative_vanna_chart(df: pd.DataFrame, index_name: str = "Index", mode: str = "net", flip: float = None) -> dict:
+    return _build_cumulative_exposure_chart(df, index_name, mode, "Total_VEX", "Call_VEX", "Put_VEX", "Cum_VEX", "Vanna", flip=flip)
 
 # ---------------------------------------------------------------------------
 # 8 — Charm Exposure
 # ---------------------------------------------------------------------------
 
 
-def build_charm_chart(df: pd.DataFrame, index_name: str = "Index", mode: str = "net") -> str:
-    return _build_exposure_chart(df, index_name, mode, "Total_CEX", "Call_CEX", "Put_CEX", "Abs_CEX", "Charm", "Dealer CEX")
+def build_charm_chart(df: pd.DataFrame, index_name: str = "Index", mode: str = "net", flip: float = None, top_zones: list = None) -> dict:
+    return _build_exposure_chart(df, index_name, mode, "Total_CEX", "Call_CEX", "Put_CEX", "Abs_CEX", "Charm", "Dealer CEX", flip=flip, top_zones=top_zones)
 
-def build_cumulative_charm_chart(df: pd.DataFrame, index_name: str = "Index", mode: str = "net") -> str:
-    return _build_cumulative_exposure_chart(df, index_name, mode, "Total_CEX", "Call_CEX", "Put_CEX", "Cum_CEX", "Charm")
+def build_cumulative_charm_chart(df: pd.DataFrame, index_name: str = "Index", mode: str = "net", flip: float = None) -> dict:
+    return _build_cumulative_exposure_chart(df, index_name, mode, "Total_CEX", "Call_CEX", "Put_CEX", "Cum_CEX", "Charm", flip=flip)
 
-def build_iv_cone_chart(df_cone: pd.DataFrame, index_name: str = "Index") -> str:
+def build_iv_cone_chart(df_cone: pd.DataFrame, index_name: str = "Index") -> dict:
     """
     Build the IV Cone chart showing expected price ranges.
     """
     fig = go.Figure()
 
+    days = df_cone["day"].tolist()
+
     # 2SD Range (Shaded)
     fig.add_trace(go.Scatter(
-        x=df_cone["day"].tolist() + df_cone["day"].tolist()[::-1],
+        x=days + days[::-1],
         y=df_cone["sd2_up"].tolist() + df_cone["sd2_down"].tolist()[::-1],
         fill='toself',
         fillcolor='rgba(244, 63, 94, 0.1)', # Rose tint for wider range
@@ -567,10 +627,13 @@ def build_iv_cone_chart(df_cone: pd.DataFrame, index_name: str = "Index") -> str
         hoverinfo='skip'
     ))
 
+    sd1_up = df_cone["sd1_up"].tolist()
+    sd1_down = df_cone["sd1_down"].tolist()
+
     # 1SD Range (Shaded)
     fig.add_trace(go.Scatter(
-        x=df_cone["day"].tolist() + df_cone["day"].tolist()[::-1],
-        y=df_cone["sd1_up"].tolist() + df_cone["sd1_down"].tolist()[::-1],
+        x=days + days[::-1],
+        y=sd1_up + sd1_down[::-1],
         fill='toself',
         fillcolor='rgba(99, 102, 241, 0.15)', # Indigo tint for core range
         line=dict(color='rgba(99, 102, 241, 0.3)', width=1),
@@ -580,7 +643,7 @@ def build_iv_cone_chart(df_cone: pd.DataFrame, index_name: str = "Index") -> str
 
     # Spot Baseline
     fig.add_trace(go.Scatter(
-        x=df_cone["day"].tolist(),
+        x=days,
         y=df_cone["spot"].tolist(),
         line=dict(color=C_SPOT, width=2, dash='dash'),
         name=f"Current Spot: {df_cone['spot'].iloc[0]:.0f}"
@@ -588,11 +651,11 @@ def build_iv_cone_chart(df_cone: pd.DataFrame, index_name: str = "Index") -> str
 
     # Boundary Lines
     fig.add_trace(go.Scatter(
-        x=df_cone["day"].tolist(), y=df_cone["sd1_up"].tolist(),
+        x=days, y=sd1_up,
         line=dict(color=C_POS, width=1.5), name="1SD Upper", showlegend=False
     ))
     fig.add_trace(go.Scatter(
-        x=df_cone["day"].tolist(), y=df_cone["sd1_down"].tolist(),
+        x=days, y=sd1_down,
         line=dict(color=C_POS, width=1.5), name="1SD Lower", showlegend=False
     ))
 
@@ -608,13 +671,13 @@ def build_iv_cone_chart(df_cone: pd.DataFrame, index_name: str = "Index") -> str
 # 9 — OI Analysis
 # ---------------------------------------------------------------------------
 
-def build_standard_oi_chart(df: pd.DataFrame, index_name: str = "Index") -> str:
+def build_standard_oi_chart(df: pd.DataFrame, index_name: str = "Index", atm: float = None) -> dict:
     """
     Standard High-Fidelity OI Strike Map.
     Red: Calls, Green: Puts. Both positive upward bars.
     """
     spot = df["Spot"].iloc[0]
-    atm  = get_atm_strike(df)
+    atm  = get_atm_strike(df) if atm is None else atm
     
     fig = go.Figure()
 
@@ -630,16 +693,11 @@ def build_standard_oi_chart(df: pd.DataFrame, index_name: str = "Index") -> str:
         marker_color="#10B981", name="Put OI (Support)", opacity=0.9,
     ))
 
-    # Spot & ATM
-    for x, label, color, dash in [
+    layout = _base_layout(f"{index_name} — Standard OI Strike Map")
+    _strike_markers(layout, [
         (spot, f"SPOT: {spot:.0f}", C_SPOT, "solid"),
         (atm,  f"ATM: {atm:.0f}",  C_ATM,  "dot"),
-    ]:
-        fig.add_vline(x=x, line_color=color, line_dash=dash, line_width=1.5,
-                      annotation_text=label, annotation_font_color=color,
-                      annotation_position="top left", annotation_font_size=10)
-
-    layout = _base_layout(f"{index_name} — Standard OI Strike Map")
+    ])
     layout["yaxis"]["title"] = "OI Contracts"
     layout["barmode"] = "group"
     layout["bargap"] = 0.35
@@ -647,51 +705,48 @@ def build_standard_oi_chart(df: pd.DataFrame, index_name: str = "Index") -> str:
     fig.update_layout(**layout)
     return fig.to_dict()
 
-def build_oi_flow_chart(df: pd.DataFrame, index_name: str = "Index") -> str:
+def build_oi_flow_chart(df: pd.DataFrame, index_name: str = "Index", atm: float = None) -> dict:
     """
     OI vs Volume Strike Map.
     Red: Call OI, Rose: Call Vol.
     Green: Put OI, Emerald: Put Vol.
     """
     spot = df["Spot"].iloc[0]
-    atm  = get_atm_strike(df)
+    atm  = get_atm_strike(df) if atm is None else atm
     
     fig = go.Figure()
 
+    strikes = df["Strike"].tolist()
+
     # Call OI (Red #F43F5E)
     fig.add_trace(go.Bar(
-        x=df["Strike"].tolist(), y=df["Call_OI"].tolist(),
+        x=strikes, y=df["Call_OI"].tolist(),
         marker_color="#F43F5E", name="Call OI", opacity=0.9,
     ))
 
     # Call Volume (Rose #FDA4AF)
     fig.add_trace(go.Bar(
-        x=df["Strike"].tolist(), y=df["call_vol"].tolist(),
+        x=strikes, y=df["call_vol"].tolist(),
         marker_color="#FDA4AF", name="Call Volume", opacity=0.7,
     ))
 
     # Put OI (Green #10B981)
     fig.add_trace(go.Bar(
-        x=df["Strike"].tolist(), y=df["Put_OI"].tolist(),
+        x=strikes, y=df["Put_OI"].tolist(),
         marker_color="#10B981", name="Put OI", opacity=0.9,
     ))
 
     # Put Volume (Emerald #A7F3D0)
     fig.add_trace(go.Bar(
-        x=df["Strike"].tolist(), y=df["put_vol"].tolist(),
+        x=strikes, y=df["put_vol"].tolist(),
         marker_color="#A7F3D0", name="Put Volume", opacity=0.7,
     ))
 
-    # Spot & ATM
-    for x, label, color, dash in [
+    layout = _base_layout(f"{index_name} — OI Flow (OI vs Volume)")
+    _strike_markers(layout, [
         (spot, f"SPOT: {spot:.0f}", C_SPOT, "solid"),
         (atm,  f"ATM: {atm:.0f}",  C_ATM,  "dot"),
-    ]:
-        fig.add_vline(x=x, line_color=color, line_dash=dash, line_width=1.5,
-                      annotation_text=label, annotation_font_color=color,
-                      annotation_position="top left", annotation_font_size=10)
-
-    layout = _base_layout(f"{index_name} — OI Flow (OI vs Volume)")
+    ])
     layout["yaxis"]["title"] = "Qty / Contracts"
     layout["barmode"] = "group"
     layout["bargap"] = 0.25
@@ -699,7 +754,7 @@ def build_oi_flow_chart(df: pd.DataFrame, index_name: str = "Index") -> str:
     fig.update_layout(**layout)
     return fig.to_dict()
 
-def build_oi_change_chart(df: pd.DataFrame, index_name: str = "Index") -> str:
+def build_oi_change_chart(df: pd.DataFrame, index_name: str = "Index", atm: float = None) -> dict:
     """
     Daily OI Change Strike Map.
     Red: Call OI Change, Green: Put OI Change.
@@ -717,7 +772,7 @@ def build_oi_change_chart(df: pd.DataFrame, index_name: str = "Index") -> str:
             df["put_oi_chg"] = df["put_oi"].fillna(0) - df["put_prev_oi"].fillna(0)
 
     spot = df["Spot"].iloc[0]
-    atm  = get_atm_strike(df)
+    atm  = get_atm_strike(df) if atm is None else atm
     
     fig = go.Figure()
 
@@ -733,16 +788,11 @@ def build_oi_change_chart(df: pd.DataFrame, index_name: str = "Index") -> str:
         marker_color="#10B981", name="Put OI Change", opacity=0.9,
     ))
 
-    # Spot & ATM
-    for x, label, color, dash in [
+    layout = _base_layout(f"{index_name} — OI Change (Daily Shift)")
+    _strike_markers(layout, [
         (spot, f"SPOT: {spot:.0f}", C_SPOT, "solid"),
         (atm,  f"ATM: {atm:.0f}",  C_ATM,  "dot"),
-    ]:
-        fig.add_vline(x=x, line_color=color, line_dash=dash, line_width=1.5,
-                      annotation_text=label, annotation_font_color=color,
-                      annotation_position="top left", annotation_font_size=10)
-
-    layout = _base_layout(f"{index_name} — OI Change (Daily Shift)")
+    ])
     layout["yaxis"]["title"] = "OI Change Contracts"
     layout["barmode"] = "group"
     layout["bargap"] = 0.35
@@ -750,7 +800,7 @@ def build_oi_change_chart(df: pd.DataFrame, index_name: str = "Index") -> str:
     fig.update_layout(**layout)
     return fig.to_dict()
 
-def build_premium_flow_chart(df: pd.DataFrame, index_name: str = "Index") -> str:
+def build_premium_flow_chart(df: pd.DataFrame, index_name: str = "Index", atm: float = None) -> dict:
     """
     Premium Bought vs Sold (Net Flow Direction).
     Red: Call Premium Flow, Green: Put Premium Flow.
@@ -759,7 +809,7 @@ def build_premium_flow_chart(df: pd.DataFrame, index_name: str = "Index") -> str
     df = calculate_premium_flow(df)
     
     spot = df["Spot"].iloc[0]
-    atm  = get_atm_strike(df)
+    atm  = get_atm_strike(df) if atm is None else atm
     
     fig = go.Figure()
 
@@ -775,16 +825,11 @@ def build_premium_flow_chart(df: pd.DataFrame, index_name: str = "Index") -> str
         marker_color="#10B981", name="Put Prem Flow", opacity=0.9,
     ))
 
-    # Spot & ATM
-    for x, label, color, dash in [
+    layout = _base_layout(f"{index_name} — Premium Flow (Bought vs Sold)")
+    _strike_markers(layout, [
         (spot, f"SPOT: {spot:.0f}", C_SPOT, "solid"),
         (atm,  f"ATM: {atm:.0f}",  C_ATM,  "dot"),
-    ]:
-        fig.add_vline(x=x, line_color=color, line_dash=dash, line_width=1.5,
-                      annotation_text=label, annotation_font_color=color,
-                      annotation_position="top left", annotation_font_size=10)
-
-    layout = _base_layout(f"{index_name} — Premium Flow (Bought vs Sold)")
+    ])
     layout["yaxis"]["title"] = "Net Premium Flow"
     layout["barmode"] = "group"
     layout["bargap"] = 0.35
@@ -792,7 +837,7 @@ def build_premium_flow_chart(df: pd.DataFrame, index_name: str = "Index") -> str
     fig.update_layout(**layout)
     return fig.to_dict()
 
-def build_compare_oi_change_chart(df1: pd.DataFrame, df2: pd.DataFrame, index_name: str = "Index") -> str:
+def build_compare_oi_change_chart(df1: pd.DataFrame, df2: pd.DataFrame, index_name: str = "Index") -> dict:
     """
     Compare OI Change between two snapshots.
     Delta = df2['OI'] - df1['OI']
@@ -824,17 +869,12 @@ def build_compare_oi_change_chart(df1: pd.DataFrame, df2: pd.DataFrame, index_na
         marker_color="#10B981", name="Put OI Delta", opacity=0.9,
     ))
 
+    layout = _base_layout(f"{index_name} — Comparative OI Shift")
     # Spot & ATM
-    for x, label, color, dash in [
+    _strike_markers(layout, [m for m in [
         (spot, f"SPOT: {spot:.0f}", C_SPOT, "solid"),
         (atm,  f"ATM: {atm:.0f}",  C_ATM,  "dot"),
-    ]:
-        if x > 0:
-            fig.add_vline(x=x, line_color=color, line_dash=dash, line_width=1.5,
-                          annotation_text=label, annotation_font_color=color,
-                          annotation_position="top left", annotation_font_size=10)
-
-    layout = _base_layout(f"{index_name} — Comparative OI Shift")
+    ] if m[0] > 0])
     layout["yaxis"]["title"] = "OI Delta (Contracts)"
     layout["barmode"] = "group"
     layout["bargap"] = 0.35
@@ -842,7 +882,7 @@ def build_compare_oi_change_chart(df1: pd.DataFrame, df2: pd.DataFrame, index_na
     fig.update_layout(**layout)
     return fig.to_dict()
 
-def build_flow_intensity_chart(flow_data: dict, index_name: str = "Index") -> str:
+def build_flow_intensity_chart(flow_data: dict, index_name: str = "Index") -> dict:
     """
     Visualizes flow intensity (Bought to Open, Sold to Open, etc.)
     for Calls and Puts side-by-side.
@@ -879,13 +919,13 @@ def build_flow_intensity_chart(flow_data: dict, index_name: str = "Index") -> st
     fig.update_layout(**layout)
     return fig.to_dict()
 
-def build_strike_pressure_chart(merged_detail: list, index_name: str = "Index") -> str:
+def build_strike_pressure_chart(merged_detail: dict, index_name: str = "Index") -> dict:
     """
     Strike-wise Net Pressure Score.
     Score = (Buy Flow - Sell Flow) / Total per strike.
     """
     df = pd.DataFrame(merged_detail)
-    if df.empty: return "{}"
+    if df.empty: return {}
     
     # Calculate net pressure per strike
     # Simplified: (long_delta / total_delta) per strike
@@ -926,7 +966,7 @@ def build_strike_pressure_chart(merged_detail: list, index_name: str = "Index")
     fig.update_layout(**layout)
     return fig.to_dict()
 
-def build_vtl_chart(vtl_data: dict, spot: float, index_name: str = "Index") -> str:
+def build_vtl_chart(vtl_data: dict, spot: float, index_name: str = "Index") -> dict:
     """
     Visualizes the Volatility Trigger simulation:
     Net GEX, Net Vanna, and Combined curves.
@@ -975,16 +1015,16 @@ def build_vtl_chart(vtl_data: dict, spot: float, index_name: str = "Index") -> s
     fig.update_layout(**layout)
     return fig.to_dict()
 
-def build_migration_chart(migration_data: dict, index_name: str = "Index") -> str:
+def build_migration_chart(migration_data: dict, index_name: str = "Index") -> dict:
     """
     Visualizes the 'Gamma Waltz' — movement of Spot vs Flip vs QP.
     """
     if "error" in migration_data:
-        return json.dumps({"error": migration_data["error"]})
+        return {"error": migration_data["error"]}
 
     history = migration_data.get("history", [])
     if not history:
-        return json.dumps({"error": "No historical snapshots found for this expiry."})
+        return {"error": "No historical snapshots found for this expiry."}
 
     df = pd.DataFrame(history)
     fig = go.Figure()
@@ -1015,7 +1055,7 @@ def build_migration_chart(migration_data: dict, index_name: str = "Index") -> st
     
     return fig.to_dict()
 
-def build_vol_spread_chart(vol_data: dict, index_name: str = "Index") -> str:
+def build_vol_spread_chart(vol_data: dict, index_name: str = "Index") -> dict:
     """
     Comparison of Realized vs Implied Volatility.
     """
@@ -1053,13 +1093,13 @@ def build_vol_spread_chart(vol_data: dict, index_name: str = "Index") -> str:
     
     return fig.to_dict()
 
-def build_ignition_heatmap(grid_data: dict, index_name: str = "Index") -> str:
+def build_ignition_heatmap(grid_data: dict, index_name: str = "Index") -> dict:
     """
     Visualizes the Greek Sensitivity Matrix as a Heatmap.
     """
     z = grid_data.get("z", [])
     if not z:
-        return "{}"
+        return {}
 
     fig = go.Figure(data=go.Heatmap(
         z=z,
@@ -1079,19 +1119,21 @@ def build_ignition_heatmap(grid_data: dict, index_name: str = "Index") -> str:
     
     return fig.to_dict()
 
-def build_momentum_chart(mom_data: dict, index_name: str = "Index") -> str:
+def build_momentum_chart(mom_data: dict, index_name: str = "Index") -> dict:
     """
     Visualizes the velocity of Greek shifts.
     """
     history = mom_data.get("momentum", [])
-    if not history: return "{}"
+    if not history: return {}
     
     df = pd.DataFrame(history)
     fig = go.Figure()
     
+    times = df["time"].tolist()
+
     # GEX Velocity (Bar)
     fig.add_trace(go.Bar(
-        x=df["time"].tolist(), y=df["gex_velocity"].tolist(),
+        x=times, y=df["gex_velocity"].tolist(),
         name="GEX Velocity",
         marker_color=df["gex_velocity"].apply(lambda v: C_POS if v > 0 else C_NEG).tolist(),
         opacity=0.6,
@@ -1100,7 +1142,7 @@ def build_momentum_chart(mom_data: dict, index_name: str = "Index") -> str:
     
     # GEX Total (Line)
     fig.add_trace(go.Scatter(
-        x=df["time"].tolist(), y=df["gex_total"].tolist(),
+        x=times, y=df["gex_total"].tolist(),
         name="Net GEX",
         line=dict(color=C_POS, width=3),
         yaxis="y2"
@@ -1115,12 +1157,12 @@ def build_momentum_chart(mom_data: dict, index_name: str = "Index") -> str:
     return fig.to_dict()
 
 
-def build_dealer_reflexivity_chart(reflexivity_data: Dict[str, Any], index_name: str = "Index") -> str:
+def build_dealer_reflexivity_chart(reflexivity_data: Dict[str, Any], index_name: str = "Index") -> dict:
     """
     Visualizes the Dealer Reflexivity Curve (Hedging Pressure vs Price Move).
     """
     profile = reflexivity_data.get("profile", [])
-    if not profile: return "{}"
+    if not profile: return {}
     
     fig = go.Figure()
     
@@ -1151,11 +1193,11 @@ def build_dealer_reflexivity_chart(reflexivity_data: Dict[str, Any], index_name:
     return fig.to_dict()
 
 
-def build_liquidity_depth_chart(liquidity_data: List[Dict[str, Any]], index_name: str = "Index") -> str:
+def build_liquidity_depth_chart(liquidity_data: List[Dict[str, Any]], index_name: str = "Index") -> dict:
     """
     Visualizes Market Depth and Spreads across strikes (Liquidity Voids).
     """
-    if not liquidity_data: return "{}"
+    if not liquidity_data: return {}
     
     df = pd.DataFrame(liquidity_data)
     fig = make_subplots(specs=[[{"secondary_y": True}]])
@@ -1186,12 +1228,12 @@ def build_liquidity_depth_chart(liquidity_data: List[Dict[str, Any]], index_name
     return fig.to_dict()
 
 
-def build_stickiness_chart(df: pd.DataFrame, index_name: str = "Index") -> str:
+def build_stickiness_chart(df: pd.DataFrame, index_name: str = "Index") -> dict:
     """
     Visualizes GEX Stickiness (Mass/Volume Ratio) at each strike.
     """
     if "stickiness" not in df.columns:
-        return "{}"
+        return {}
         
     spot = df["Spot"].iloc[0]
     fig = go.Figure()
@@ -1205,9 +1247,8 @@ def build_stickiness_chart(df: pd.DataFrame, index_name: str = "Index") -> str:
         hovertemplate="Strike: %{x}<br>Stickiness: %{y:.2f}<extra></extra>"
     ))
     
-    fig.add_vline(x=spot, line_color=C_SPOT, line_dash="dash", line_width=2)
-    
     layout = _base_layout(f"{index_name} — GEX Stickiness (Dealer Conviction)")
+    _strike_markers(layout, [(spot, None, C_SPOT, "dash")], line_width=2)
     layout["xaxis"]["title"] = "Strike"
     layout["yaxis"]["title"] = "Stickiness Ratio (GEX / Volume)"
     fig.update_layout(**layout)
@@ -1215,7 +1256,7 @@ def build_stickiness_chart(df: pd.DataFrame, index_name: str = "Index") -> str:
     return fig.to_dict()
 
 
-def build_delta_apex_chart(apex_data: Dict[str, Any], index_name: str = "Index") -> str:
+def build_delta_apex_chart(apex_data: Dict[str, Any], index_name: str = "Index") -> dict:
     """
     Visualizes the Delta Neutral Equilibrium (Apex).
     Plots Net Dealer Delta and Net Dealer GEX across a price range.
@@ -1227,7 +1268,7 @@ def build_delta_apex_chart(apex_data: Dict[str, Any], index_name: str = "Index")
     apex_price = apex_data.get("apex_price", 0)
     current_spot = apex_data.get("current_spot", 0)
     
-    if not prices: return "{}"
+    if not prices: return {}
     
     fig = make_subplots(specs=[[{"secondary_y": True}]])
     
@@ -1275,13 +1316,13 @@ def build_delta_apex_chart(apex_data: Dict[str, Any], index_name: str = "Index")
     return fig.to_dict()
 
 
-def build_gamma_profile_chart(conc_data: Dict[str, Any], index_name: str = "Index") -> str:
+def build_gamma_profile_chart(conc_data: Dict[str, Any], index_name: str = "Index") -> dict:
     """
     Visualizes the Gamma Distribution Profile (Sharpness/Concentration).
     Shows how GEX is distributed across strikes.
     """
     profile = conc_data.get("profile", [])
-    if not profile: return "{}"
+    if not profile: return {}
     
     df = pd.DataFrame(profile)
     fig = go.Figure()
@@ -1330,7 +1371,7 @@ def build_gamma_profile_chart(conc_data: Dict[str, Any], index_name: str = "Inde
     return fig.to_dict()
 
 
-def build_gamma_density_chart(density_data: Dict[str, Any], index_name: str = "Index") -> str:
+def build_gamma_density_chart(density_data: Dict[str, Any], index_name: str = "Index") -> dict:
     """
     Visualizes the aggregate 'Gamma Bell Curve' (Density Map).
     Plots simulated total net GEX across a price range.
@@ -1339,7 +1380,7 @@ def build_gamma_density_chart(density_data: Dict[str, Any], index_name: str = "I
     total_gex = density_data.get("total_gex", [])
     current_spot = density_data.get("current_spot", 0)
     
-    if not prices: return "{}"
+    if not prices: return {}
     
     fig = go.Figure()
     
@@ -1384,20 +1425,20 @@ def build_gamma_density_chart(density_data: Dict[str, Any], index_name: str = "I
     return fig.to_dict()
 
 
-def build_cumulative_shield_chart(df: pd.DataFrame, shield_metrics: Dict[str, Any], index_name: str = "Index") -> str:
+def build_cumulative_shield_chart(df: pd.DataFrame, shield_metrics: Dict[str, Any], index_name: str = "Index") -> dict:
     """
     Visualizes the 'Gamma Shield' — highly analytical view of the cumulative GEX curve.
     Highlights Breadth, Depth, and Intensity.
     """
-    if df.empty: return "{}"
+    if df.empty: return {}
     
-    # Sort and calc cumulative
-    df_sorted = df.copy().sort_values("Strike")
-    if 'Total_GEX' not in df_sorted.columns:
+    # Calc cumulative; the groupby orders strikes, so no pre-sort/copy
+    df_gex = df
+    if 'Total_GEX' not in df_gex.columns:
         from services.calculations import calculate_gex
-        df_sorted = calculate_gex(df_sorted)
+        df_gex = calculate_gex(df_gex)
         
-    by_strike = df_sorted.groupby("Strike")["Total_GEX"].sum().sort_index()
+    by_strike = df_gex.groupby("Strike")["Total_GEX"].sum().sort_index()
     strikes = by_strike.index.values
     cum_gex = np.cumsum(by_strike.values)
     spot = df["Spot"].iloc[0]
@@ -1466,7 +1507,7 @@ def build_cumulative_shield_chart(df: pd.DataFrame, shield_metrics: Dict[str, An
     return fig.to_dict()
 
 
-def build_cum_steepness_chart(steepness: Dict[str, Any], index_name: str = "Index") -> str:
+def build_cum_steepness_chart(steepness: Dict[str, Any], index_name: str = "Index") -> dict:
     """
     Dual-panel chart:
     - Top: Cumulative GEX curve with tangent annotation at spot.
@@ -1481,7 +1522,7 @@ def build_cum_steepness_chart(steepness: Dict[str, Any], index_name: str = "Inde
     norm_pct   = steepness.get("norm_slope_pct", 0)
     
     if not strikes:
-        return "{}"
+        return {}
     
     fig = make_subplots(
         rows=2, cols=1,
@@ -1534,17 +1575,17 @@ def build_cum_steepness_chart(steepness: Dict[str, Any], index_name: str = "Inde
     
     return fig.to_dict()
 
-def build_systemic_pulse_chart(pulse_data: dict, index_name: str = "Index") -> str:
+def build_systemic_pulse_chart(pulse_data: dict, index_name: str = "Index") -> dict:
     """
     Visualizes the 'Systemic Pulse' — relationships between Price, IV, and total dealer exposure.
     Contains 4 lines: Spot, ATM IV, Net GEX, and Net DEX.
     """
     if "error" in pulse_data:
-        return json.dumps({"error": pulse_data["error"]})
+        return {"error": pulse_data["error"]}
 
     history = pulse_data.get("pulse", [])
     if not history:
-        return json.dumps({"error": "No pulse data found for this expiry."})
+        return {"error": "No pulse data found for this expiry."}
 
     df = pd.DataFrame(history)
     
@@ -1555,9 +1596,11 @@ def build_systemic_pulse_chart(pulse_data: dict, index_name: str = "Index") -> s
     
     fig = make_subplots(specs=[[{"secondary_y": True}]])
 
+    times = df["time"].tolist()
+
     # 1. Spot Price (Y1 - Left)
     fig.add_trace(go.Scatter(
-        x=df["time"].tolist(), y=df["spot"].tolist(),
+        x=times, y=df["spot"].tolist(),
         name="Spot Price",
         line=dict(color=C_SPOT, width=3),
         mode='lines+markers',
@@ -1567,7 +1610,7 @@ def build_systemic_pulse_chart(pulse_data: dict, index_name: str = "Index") -> s
     # 2. Net GEX (Y2 - Right)
     gex_cr = [v / 1e7 for v in df["cum_gamma"].tolist()]
     fig.add_trace(go.Scatter(
-        x=df["time"].tolist(), y=gex_cr,
+        x=times, y=gex_cr,
         name="Net GEX (Gamma) Cr",
         line=dict(color=C_POS, width=2, dash='solid'),
         mode='lines+markers',
@@ -1577,7 +1620,7 @@ def build_systemic_pulse_chart(pulse_data: dict, index_name: str = "Index") -> s
     # 3. Net DEX (Y2 - Right)
     dex_cr = [v / 1e7 for v in df["cum_delta"].tolist()]
     fig.add_trace(go.Scatter(
-        x=df["time"].tolist(), y=dex_cr,
+        x=times, y=dex_cr,
         name="Net DEX (Delta) Cr",
         line=dict(color="#E879F9", width=2, dash='dot'),
         mode='lines+markers',
@@ -1595,7 +1638,7 @@ def build_systemic_pulse_chart(pulse_data: dict, index_name: str = "Index") -> s
     # Right: IV & Exposures (They will have different scales, so let's use a 3rd axis)
     
     fig.add_trace(go.Scatter(
-        x=df["time"].tolist(), y=df["iv"].tolist(),
+        x=times, y=df["iv"].tolist(),
         name="ATM IV (%)",
         line=dict(color="#FCD34D", width=2, dash='dashdot'),
         mode='lines+markers',
@@ -1633,8 +1676,9 @@ def build_aggregate_exposure_chart(pulse_data: Dict[str, Any], index_name: str =
         return {"error": pulse_data.get("error", "No data for aggregate chart")}
 
     df = pd.DataFrame(pulse_data["pulse"])
-    # Ensure all required columns are numeric and converted to lists for Plotly JSON
     times = df["time"].tolist()
+
+    # Ensure all required columns are numeric and converted to lists for Plotly JSON
     spots = pd.to_numeric(df["spot"], errors='coerce').tolist()
     
     fig = make_subplots(specs=[[{"secondary_y": True}]])
@@ -1896,57 +1940,46 @@ def build_vwgex_chart(df: pd.DataFrame, index_name: str = "Index", mode: str = "
     """Volume-weighted GEX — distinguishes live walls from ghost walls."""
     spot = df["Spot"].iloc[0]
     flip = calculate_flip_point(df)
-    bw = _bar_width(df)
-    top_zones = df.nlargest(3, "Abs_VWGEX") if "Abs_VWGEX" in df.columns else df.nlargest(3, "Abs_GEX")
+    grid = _strike_grid(df)
+    bw = _bar_width(df, grid)
+    top_zones = get_power_zones(df, 3, "Abs_VWGEX" if "Abs_VWGEX" in df.columns else "Abs_GEX")
 
     fig = make_subplots(specs=[[{"secondary_y": True}]])
 
+    strikes = df["Strike"].tolist()
     if mode == "net":
+        vwgex = df["VWGEX"].to_numpy()
         fig.add_trace(go.Bar(
-            x=df["Strike"].tolist(), y=df["VWGEX"].clip(lower=0).tolist(),
+            x=strikes, y=np.maximum(vwgex, 0).tolist(),
             width=bw, marker_color=C_POS, name="+Dealer VWGEX", opacity=0.9,
         ), secondary_y=False)
         fig.add_trace(go.Bar(
-            x=df["Strike"].tolist(), y=df["VWGEX"].clip(upper=0).tolist(),
+            x=strikes, y=np.minimum(vwgex, 0).tolist(),
             width=bw, marker_color=C_NEG, name="-Dealer VWGEX", opacity=0.9,
         ), secondary_y=False)
     else:
         fig.add_trace(go.Bar(
-            x=df["Strike"].tolist(), y=df["Total_GEX"].tolist(),
+            x=strikes, y=df["Total_GEX"].tolist(),
             width=bw * 0.9, marker_color="rgba(99,102,241,0.25)", name="Raw GEX (Ghost)", opacity=0.5,
         ), secondary_y=False)
         fig.add_trace(go.Bar(
-            x=df["Strike"].tolist(), y=df["VWGEX"].tolist(),
+            x=strikes, y=df["VWGEX"].tolist(),
             width=bw * 0.5, marker_color=C_POS, name="VWGEX (Live)", opacity=0.9,
         ), secondary_y=False)
 
     fig.add_trace(go.Scatter(
-        x=df["Strike"].tolist(), y=df["Abs_VWGEX"].tolist() if "Abs_VWGEX" in df.columns else df["Abs_GEX"].tolist(),
+        x=strikes, y=df["Abs_VWGEX"].tolist() if "Abs_VWGEX" in df.columns else df["Abs_GEX"].tolist(),
         fill="tozeroy", fillcolor=C_ABS,
         line=dict(color="rgba(168,85,247,0.4)", width=2),
         name="Absolute VWGEX Heat", mode="lines",
     ), secondary_y=True)
 
-    for x, label, color, dash in [
+    layout = _base_layout(f"{index_name} — Volume-Weighted Dealer GEX")
+    _strike_markers(layout, [
         (spot, f"SPOT: {spot:.0f}", C_SPOT, "solid"),
         (flip, f"ZERO: {flip:.0f}", C_FLIP, "dot"),
-    ]:
-        fig.add_vline(x=x, line_color=color, line_dash=dash, line_width=1.5,
-                      annotation_text=label, annotation_font_color=color,
-                      annotation_position="top left", annotation_font_size=10)
-
-    for _, row in top_zones.iterrows():
-        fig.add_vrect(
-            x0=row["Strike"] - bw / 2, x1=row["Strike"] + bw / 2,
-            fillcolor=C_ZONE, layer="below", line_width=0,
-        )
-
-    layout = _base_layout(f"{index_name} — Volume-Weighted Dealer GEX")
-    strikes = sorted(df["Strike"].unique())
-    if len(strikes) > 1:
-        layout["xaxis"]["tickmode"] = "linear"
-        layout["xaxis"]["dtick"] = strikes[1] - strikes[0]
-        layout["xaxis"]["tickangle"] = -45
+    ], zones=[(z - bw / 2, z + bw / 2, C_ZONE) for z in top_zones])
+    _apply_strike_axis(layout, grid)
     layout["barmode"] = "overlay"
     layout["yaxis"]["title"] = "Volume-Weighted Dealer GEX"
     layout["yaxis2"] = dict(gridcolor=GRID_CLR, zeroline=False, title="Absolute VWGEX")
@@ -1968,24 +2001,22 @@ def build_spread_heatmap_chart(spread_data: list, index_name: str = "Index") ->
 
     colors = [C_POS if c == "Strong" else C_NEG for c in df["conviction"].tolist()]
 
+    strike_x = df["strike"].tolist()
     fig.add_trace(go.Bar(
-        x=df["strike"].tolist(), y=df["abs_gex"].tolist(),
+        x=strike_x, y=df["abs_gex"].tolist(),
         marker_color=colors, name="Abs GEX (Conviction)", opacity=0.9,
     ), secondary_y=False)
 
     fig.add_trace(go.Scatter(
-        x=df["strike"].tolist(), y=df["avg_spread_pct"].tolist(),
+        x=strike_x, y=df["avg_spread_pct"].tolist(),
         fill="tozeroy", fillcolor=C_ABS,
         line=dict(color="rgba(168,85,247,0.4)", width=2),
         name="Avg Spread %", mode="lines",
     ), secondary_y=True)
 
-    strikes = sorted(df["strike"].unique())
+    strikes = np.unique(df["strike"].to_numpy())
     layout = _base_layout(f"{index_name} — Bid-Ask Spread vs Dealer GEX (Conviction)")
-    if len(strikes) > 1:
-        layout["xaxis"]["tickmode"] = "linear"
-        layout["xaxis"]["dtick"] = strikes[1] - strikes[0]
-        layout["xaxis"]["tickangle"] = -45
+    _apply_strike_axis(layout, strikes)
     layout["yaxis"]["title"] = "Absolute Dealer GEX"
     layout["yaxis2"] = dict(gridcolor=GRID_CLR, zeroline=False, title="Avg Spread %")
     layout["barmode"] = "overlay"
@@ -2001,7 +2032,8 @@ def build_oi_buildup_chart(df: pd.DataFrame, index_name: str = "Index") -> dict:
     """Strike-wise OI buildup/unwinding classification."""
     spot = df["Spot"].iloc[0]
     flip = calculate_flip_point(df)
-    bw = _bar_width(df)
+    grid = _strike_grid(df)
+    bw = _bar_width(df, grid)
 
     color_map = {
         "Long Buildup": C_POS,
@@ -2017,21 +2049,24 @@ def build_oi_buildup_chart(df: pd.DataFrame, index_name: str = "Index") -> dict:
     call_oi_chg = df.get("call_oi_chg", pd.Series(0, index=df.index)).fillna(0)
     put_oi_chg = df.get("put_oi_chg", pd.Series(0, index=df.index)).fillna(0)
 
-    call_colors = [color_map.get(b, "#94A3B8") for b in df["call_buildup"].tolist()]
-    put_colors = [color_map.get(b, "#94A3B8") for b in df["put_buildup"].tolist()]
+    call_types = df["call_buildup"].tolist()
+    call_colors = [color_map.get(b, "#94A3B8") for b in call_types]
+    put_types = df["put_buildup"].tolist()
+    put_colors = [color_map.get(b, "#94A3B8") for b in put_types]
 
+    strikes = df["Strike"].tolist()
     fig.add_trace(go.Bar(
-        x=df["Strike"].tolist(), y=call_oi_chg.abs().tolist(),
+        x=strikes, y=call_oi_chg.abs().tolist(),
         width=bw, marker_color=call_colors, name="Call OI Change",
         hovertemplate="Strike: %{x}<br>|OI Chg|: %{y:,.0f}<br>Type: %{customdata}<extra></extra>",
-        customdata=df["call_buildup"].tolist(), opacity=0.9,
+        customdata=call_types, opacity=0.9,
     ), row=1, col=1)
 
     fig.add_trace(go.Bar(
-        x=df["Strike"].tolist(), y=put_oi_chg.abs().tolist(),
+        x=strikes, y=put_oi_chg.abs().tolist(),
         width=bw, marker_color=put_colors, name="Put OI Change",
         hovertemplate="Strike: %{x}<br>|OI Chg|: %{y:,.0f}<br>Type: %{customdata}<extra></extra>",
-        customdata=df["put_buildup"].tolist(), opacity=0.9,
+        customdata=put_types, opacity=0.9,
     ), row=2, col=1)
 
     for x, label, color, dash in [
@@ -2049,11 +2084,7 @@ def build_oi_buildup_chart(df: pd.DataFrame, index_name: str = "Index") -> dict:
         ))
 
     layout = _base_layout(f"{index_name} — OI Buildup / Unwinding Classification")
-    strikes = sorted(df["Strike"].unique())
-    if len(strikes) > 1:
-        layout["xaxis"]["tickmode"] = "linear"
-        layout["xaxis"]["dtick"] = strikes[1] - strikes[0]
-        layout["xaxis"]["tickangle"] = -45
+    _apply_strike_axis(layout, grid)
     layout["showlegend"] = True
     fig.update_layout(**layout)
     fig.update_annotations(font=dict(color="#94A3B8", size=11))
@@ -2070,56 +2101,45 @@ def build_gex_decay_chart(df: pd.DataFrame, index_name: str = "Index") -> dict:
     flip = calculate_flip_point(df)
     dte = int(df["DTE"].iloc[0]) if "DTE" in df.columns else "?"
     decay_factor = float(df["decay_factor"].iloc[0]) if "decay_factor" in df.columns else 1.0
-    bw = _bar_width(df)
-    top_zones = df.nlargest(3, "Abs_GEX")
+    grid = _strike_grid(df)
+    bw = _bar_width(df, grid)
+    top_zones = get_power_zones(df, 3)
 
     fig = make_subplots(specs=[[{"secondary_y": True}]])
 
+    strikes = df["Strike"].tolist()
     fig.add_trace(go.Bar(
-        x=df["Strike"].tolist(), y=df["Total_GEX"].tolist(),
+        x=strikes, y=df["Total_GEX"].tolist(),
         width=bw * 0.9, marker_color="rgba(99,102,241,0.25)",
         name=f"Raw GEX ({dte} DTE)", opacity=0.5,
     ), secondary_y=False)
 
+    decay_gex = df["Decay_GEX"].to_numpy()
     fig.add_trace(go.Bar(
-        x=df["Strike"].tolist(), y=df["Decay_GEX"].clip(lower=0).tolist(),
+        x=strikes, y=np.maximum(decay_gex, 0).tolist(),
         width=bw * 0.5, marker_color=C_POS,
         name=f"+Decay GEX (×{decay_factor:.2f})", opacity=0.9,
     ), secondary_y=False)
 
     fig.add_trace(go.Bar(
-        x=df["Strike"].tolist(), y=df["Decay_GEX"].clip(upper=0).tolist(),
+        x=strikes, y=np.minimum(decay_gex, 0).tolist(),
         width=bw * 0.5, marker_color=C_NEG,
         name=f"-Decay GEX (×{decay_factor:.2f})", opacity=0.9,
     ), secondary_y=False)
 
     fig.add_trace(go.Scatter(
-        x=df["Strike"].tolist(), y=df["Abs_Decay_GEX"].tolist() if "Abs_Decay_GEX" in df.columns else df["Abs_GEX"].tolist(),
+        x=strikes, y=df["Abs_Decay_GEX"].tolist() if "Abs_Decay_GEX" in df.columns else df["Abs_GEX"].tolist(),
         fill="tozeroy", fillcolor=C_ABS,
         line=dict(color="rgba(168,85,247,0.4)", width=2),
         name="Absolute Decay Heat", mode="lines",
     ), secondary_y=True)
 
-    for x, label, color, dash in [
+    layout = _base_layout(f"{index_name} — Dealer GEX Decay Analysis ({dte} DTE)")
+    _strike_markers(layout, [
         (spot, f"SPOT: {spot:.0f}", C_SPOT, "solid"),
         (flip, f"ZERO: {flip:.0f}", C_FLIP, "dot"),
-    ]:
-        fig.add_vline(x=x, line_color=color, line_dash=dash, line_width=1.5,
-                      annotation_text=label, annotation_font_color=color,
-                      annotation_position="top left", annotation_font_size=10)
-
-    for _, row in top_zones.iterrows():
-        fig.add_vrect(
-            x0=row["Strike"] - bw / 2, x1=row["Strike"] + bw / 2,
-            fillcolor=C_ZONE, layer="below", line_width=0,
-        )
-
-    layout = _base_layout(f"{index_name} — Dealer GEX Decay Analysis ({dte} DTE)")
-    strikes = sorted(df["Strike"].unique())
-    if len(strikes) > 1:
-        layout["xaxis"]["tickmode"] = "linear"
-        layout["xaxis"]["dtick"] = strikes[1] - strikes[0]
-        layout["xaxis"]["tickangle"] = -45
+    ], zones=[(z - bw / 2, z + bw / 2, C_ZONE) for z in top_zones])
+    _apply_strike_axis(layout, grid)
     layout["barmode"] = "overlay"
     layout["yaxis"]["title"] = "Dealer Gamma Exposure"
     layout["yaxis2"] = dict(gridcolor=GRID_CLR, zeroline=False, title="Absolute Decay GEX")
@@ -2205,18 +2225,19 @@ def build_max_pain_chart(pain_data: dict, index_name: str = "Index") -> dict:
 
     fig = make_subplots(specs=[[{"secondary_y": True}]])
 
+    strike_x = pdf["strike"].tolist()
     fig.add_trace(go.Bar(
-        x=pdf["strike"].tolist(), y=pdf["call_pain"].tolist(),
+        x=strike_x, y=pdf["call_pain"].tolist(),
         marker_color=C_NEG, name="Call Pain", opacity=0.9,
     ), secondary_y=False)
 
     fig.add_trace(go.Bar(
-        x=pdf["strike"].tolist(), y=[-v for v in pdf["put_pain"].tolist()],
+        x=strike_x, y=(-pdf["put_pain"].to_numpy()).tolist(),
         marker_color=C_POS, name="Put Pain", opacity=0.9,
     ), secondary_y=False)
 
     fig.add_trace(go.Scatter(
-        x=pdf["strike"].tolist(), y=pdf["total_pain"].tolist(),
+        x=strike_x, y=pdf["total_pain"].tolist(),
         fill="tozeroy", fillcolor=C_ABS,
         line=dict(color="rgba(168,85,247,0.4)", width=2),
         name="Total Pain Curve", mode="lines",
@@ -2240,11 +2261,8 @@ def build_max_pain_chart(pain_data: dict, index_name: str = "Index") -> dict:
     )
 
     layout = _base_layout(f"{index_name} — Max Pain & Pin Risk Analysis")
-    strikes = sorted(pdf["strike"].unique())
-    if len(strikes) > 1:
-        layout["xaxis"]["tickmode"] = "linear"
-        layout["xaxis"]["dtick"] = strikes[1] - strikes[0]
-        layout["xaxis"]["tickangle"] = -45
+    strikes = np.unique(pdf["strike"].to_numpy())
+    _apply_strike_axis(layout, strikes)
     layout["barmode"] = "overlay"
     layout["yaxis"]["title"] = "Call / Put Pain"
     layout["yaxis2"] = dict(gridcolor=GRID_CLR, zeroline=False, title="Total Pain")
@@ -2316,8 +2334,9 @@ def build_participant_chart(participant_data: dict, index_name: str = "Index") -
     df = pd.DataFrame(history)
     fig = make_subplots(specs=[[{"secondary_y": True}]])
 
+    dates = df["date"].tolist()
     fig.add_trace(go.Scatter(
-        x=df["date"].tolist(), y=df["nifty_close"].tolist(),
+        x=dates, y=df["nifty_close"].tolist(),
         name="Nifty Close", line=dict(color=C_SPOT, width=2.5),
         mode="lines+markers", marker=dict(size=3),
     ), secondary_y=False)
@@ -2329,7 +2348,7 @@ def build_participant_chart(participant_data: dict, index_name: str = "Index") -
     ]:
         vals = df[f"{prefix}_net_futures"].tolist()
         fig.add_trace(go.Bar(
-            x=df["date"].tolist(), y=vals,
+            x=dates, y=vals,
             name=label, marker_color=color, opacity=0.7,
         ), secondary_y=True)
 
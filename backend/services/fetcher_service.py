@@ -3,13 +3,17 @@ Fetcher service — manages background periodic data retrieval.
 """
 
 import asyncio
-import socket
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
 from core.config import AUTO_FETCH, FETCH_INTERVAL_MINS, INDICES, DATA_DIR, FILTER_STRIKES_RADIUS, STOCKS
-from services.upstox_service import fetch_option_chain_data, save_data, filter_near_strikes
+import store
+from services.upstox_service import fetch_option_chain_data, save_data
+from services.calculations import calculate_gex
 
 import os
 from pathlib import Path
@@ -28,27 +32,38 @@ if not logger.handlers:
     c_handler = logging.StreamHandler()
     c_format  = logging.Formatter('%(asctime)s - FETCH - %(levelname)s - %(message)s')
     c_handler.setFormatter(c_format)
-    logger.addHandler(c_handler)
 
-    # File Handler
-    f_handler = logging.FileHandler(LOG_FILE)
+    # File Handler: bounded at 4 x 5 MB; opened on the first record
+    f_handler = RotatingFileHandler(LOG_FILE, maxBytes=5_000_000, backupCount=3, delay=True)
     f_format  = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
     f_handler.setFormatter(f_format)
-    logger.addHandler(f_handler)
+
+    # The fetch loop only enqueues; console and disk writes happen on the
+    # listener's thread, off the event loop
+    log_queue = queue.Queue(-1)
+    listener  = QueueListener(log_queue, c_handler, f_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    logger.addHandler(QueueHandler(log_queue))
 
 # Ensure it doesn't propagate to root to avoid double logging if uvicorn is active
 logger.propagate = False
 
-def is_internet_available(host="api.upstox.com", port=443, timeout=5):
+async def is_internet_available(host="api.upstox.com", port=443, timeout=5):
     """
     Check if internet is available by attempting to connect to the API host.
+    Resolution and connect both run on the event loop, bounded by `timeout`.
     """
     try:
-        socket.setdefaulttimeout(timeout)
-        socket.socket(socket.AF_INET, socket.SOCK_STREAM).connect((host, port))
-        return True
-    except socket.error:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=timeout)
+    except (OSError, asyncio.TimeoutError):
         return False
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True
 
 def is_market_hours() -> bool:
     """
@@ -66,9 +81,30 @@ def is_market_hours() -> bool:
     if now.weekday() >= 5:
         return False
     
-    market_open  = now.replace(hour=9,  minute=15, second=0, microsecond=0)
-    market_close = now.replace(hour=15, minute=38, second=0, microsecond=0)
-    return market_open <= now <= market_close
+    t = (now.hour, now.minute, now.second, now.microsecond)
+    return (9, 15, 0, 0) <= t <= (15, 38, 0, 0)
+
+def _fetch_and_save(instrument_name: str, all_instruments: dict, cycle_timestamp: str) -> None:
+    """Fetch one instrument, save it under the cycle timestamp and load it into the store."""
+    # Strike window applied on the payload, before the frame is built
+    df, err = fetch_option_chain_data(instrument_name, indices=all_instruments,
+                                      filter_radius=FILTER_STRIKES_RADIUS)
+    if err:
+        logger.error("Failed to fetch %s: %s", instrument_name, err)
+        return
+    if df is None or df.empty:
+        logger.warning("No data received for %s", instrument_name)
+        return
+
+    path = save_data(df, instrument_name,
+                     data_dir=DATA_DIR, timestamp_str=cycle_timestamp)
+    logger.info("Saved %s (batch: %s) → %s", instrument_name, cycle_timestamp, path)
+
+    lot_size    = all_instruments[instrument_name]["lot_size"]
+    df_with_gex = calculate_gex(df, lot_size)
+    store.set_data(instrument_name, df_with_gex, path)
+    logger.info("Store updated for %s", instrument_name)
+
 
 async def run_auto_fetcher():
     """
@@ -78,7 +114,7 @@ async def run_auto_fetcher():
         logger.info("Auto-fetch is disabled in config.")
         return
 
-    logger.info(f"Starting auto-fetcher. Interval: {FETCH_INTERVAL_MINS} minutes.")
+    logger.info("Starting auto-fetcher. Interval: %d minutes.", FETCH_INTERVAL_MINS)
     
     # Wait a bit on startup to let the server initialize
     await asyncio.sleep(5)
@@ -95,57 +131,44 @@ async def run_auto_fetcher():
             if sleep_sec < 1:
                 sleep_sec = interval_sec
 
-            logger.info(f"Next auto-fetch in {int(sleep_sec/60)}m {int(sleep_sec%60)}s (aligned to {FETCH_INTERVAL_MINS}m clock).")
+            logger.info("Next auto-fetch in %dm %ds (aligned to %dm clock).",
+                        int(sleep_sec / 60), int(sleep_sec % 60), FETCH_INTERVAL_MINS)
             await asyncio.sleep(sleep_sec)
 
             ist = ZoneInfo("Asia/Kolkata")
             now = datetime.now(ist)
-            logger.info(f"Auto-fetch cycle triggered at {now.strftime('%Y-%m-%d %H:%M:%S')}")
+            logger.info("Auto-fetch cycle triggered at %s", now.strftime("%Y-%m-%d %H:%M:%S"))
 
             if not is_market_hours():
                 logger.info("Outside market hours (Mon–Fri 09:30–15:30). Skipping this fetch cycle.")
-            elif not is_internet_available():
+            elif not await is_internet_available():
                 logger.warning("Connection to api.upstox.com failed. Skipping this fetch cycle.")
             else:
                 # Generate a single shared timestamp for this whole cycle
                 cycle_timestamp = datetime.now(ist).strftime("%d_%H%M%S")
-                logger.info(f"Starting concurrent fetch cycle with timestamp: {cycle_timestamp}")
+                logger.info("Starting concurrent fetch cycle with timestamp: %s", cycle_timestamp)
 
                 all_instruments = {**INDICES, **STOCKS}
-                loop = asyncio.get_event_loop()
                 sem  = asyncio.Semaphore(5)   # max 5 parallel HTTP calls
 
                 async def fetch_and_save(instrument_name: str):
                     async with sem:
-                        # Run the blocking HTTP call in a thread
-                        df, err = await loop.run_in_executor(
-                            None, lambda: fetch_option_chain_data(instrument_name, indices=all_instruments)
-                        )
-                        if err:
-                            logger.error(f"Failed to fetch {instrument_name}: {err}")
-                            return
-                        if df is None or df.empty:
-                            logger.warning(f"No data received for {instrument_name}")
-                            return
-
-                        df_filtered = filter_near_strikes(df, FILTER_STRIKES_RADIUS)
-                        path = save_data(df_filtered, instrument_name,
-                                         data_dir=DATA_DIR, timestamp_str=cycle_timestamp)
-                        logger.info(f"Saved {instrument_name} (batch: {cycle_timestamp}) → {path}")
-
-                        import store
-                        from services.calculations import calculate_gex
-                        lot_size    = all_instruments[instrument_name]["lot_size"]
-                        df_with_gex = calculate_gex(df_filtered, lot_size)
-                        store.set_data(instrument_name, df_with_gex, path)
-                        logger.info(f"Store updated for {instrument_name}")
-
-                await asyncio.gather(*(fetch_and_save(name) for name in all_instruments))
+                        # Fetch, parquet write and GEX all block, so the whole
+                        # instrument runs in a worker thread, off the event loop
+                        await asyncio.to_thread(_fetch_and_save, instrument_name, all_instruments, cycle_timestamp)
+
+                # One instrument failing must not abort the others or send
+                # the whole loop into its error back-off
+                results = await asyncio.gather(*(fetch_and_save(name) for name in all_instruments),
+                                               return_exceptions=True)
+                for name, result in zip(all_instruments, results):
+                    if isinstance(result, BaseException):
+                        logger.error("Fetch pipeline failed for %s: %r", name, result)
                 logger.info("All instruments fetched concurrently.")
 
-            logger.info(f"Fetch cycle complete. Waiting for next aligned slot.")
+            logger.info("Fetch cycle complete. Waiting for next aligned slot.")
 
         except Exception as e:
-            logger.exception(f"Unexpected error in auto-fetcher loop: {e}")
+            logger.exception("Unexpected error in auto-fetcher loop: %s", e)
             # Protect against tight loop in case of continuous error
             await asyncio.sleep(60)
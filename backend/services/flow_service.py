@@ -1,101 +1,193 @@
+import threading
+import weakref
+from collections import OrderedDict
+
 import numpy as np
 import pandas as pd
 from typing import Dict, Any
 
+from core.config import INDICES
+
+# Contract multiplier per index, resolved once at import
+LOT_SIZES = {name: cfg.get('lot_size', 1) for name, cfg in INDICES.items()}
+
+# flow_class categories; classify_option_flow stores codes into this list
+_FLOW_CLASSES = ['bought_to_open', 'sold_to_open', 'bought_to_close', 'short_covered', 'neutral']
+
+# Long-form column -> (call source, put source), lower-cased: snapshot
+# columns are matched case-insensitively and a missing one reads as 0.
+_LONG_SOURCES = {
+    'strike':        ('strike',   'strike'),
+    'expiry':        ('expiry',   'expiry'),
+    'iv':            ('call_iv',  'put_iv'),
+    'open_interest': ('call_oi',  'put_oi'),
+    'volume':        ('call_vol', 'put_vol'),
+    'last_price':    ('call_ltp', 'put_ltp'),
+    'spot':          ('spot',     'spot'),
+}
+
+
+def _to_long(df: pd.DataFrame) -> pd.DataFrame:
+    """One row per (strike, expiry, side): call rows, then put rows.
+
+    Built as one frame from concatenated column arrays rather than two
+    column-by-column frames and a concat.
+    """
+    by_lower = {c.lower(): c for c in df.columns}
+    n = len(df)
+
+    def side(src):
+        return df[by_lower[src]].to_numpy() if src in by_lower else np.zeros(n, dtype=np.int64)
+
+    data = {
+        target: np.concatenate([side(call_src), side(put_src)])
+        for target, (call_src, put_src) in _LONG_SOURCES.items()
+    }
+    data['option_type'] = np.repeat(np.array(['call', 'put'], dtype=object), n)
+    return pd.DataFrame(data)
+
+
+# Long form per snapshot frame. Loaded snapshots are shared read-only objects
+# (load_data_file_cached), so comparing t1→t2 then t2→t3 reuses t2's; the
+# weakref guards against id() reuse after a frame is freed.
+_LONG_CACHE_SIZE = 4
+_LONG_CACHE: "OrderedDict[int, tuple]" = OrderedDict()
+_long_cache_lock = threading.Lock()
+
+
+def _to_long_cached(df: pd.DataFrame) -> pd.DataFrame:
+    key = id(df)
+    with _long_cache_lock:
+        hit = _LONG_CACHE.get(key)
+        if hit is not None and hit[0]() is df and hit[1] == df.shape:
+            _LONG_CACHE.move_to_end(key)
+            return hit[2]
+    long_df = _to_long(df)
+    with _long_cache_lock:
+        _LONG_CACHE[key] = (weakref.ref(df), df.shape, long_df)
+        _LONG_CACHE.move_to_end(key)
+        while len(_LONG_CACHE) > _LONG_CACHE_SIZE:
+            _LONG_CACHE.popitem(last=False)
+    return long_df
+
+
+# Snapshot columns compared between the two snapshots (the merge's _prev side)
+_PREV_COLS = ['iv', 'open_interest', 'last_price', 'volume']
+
+
+def _align_snapshots(long_now: pd.DataFrame, long_prev: pd.DataFrame):
+    """Row positions pairing long_now with long_prev on (strike, expiry, side).
+
+    Same rows, in the same (left) order, as an inner merge on those keys,
+    found by intersecting one integer key per row instead of a hash join.
+    Returns None when a key repeats within a snapshot, where merge's
+    pairwise expansion is needed.
+    """
+    n_now = len(long_now)
+    strike_codes, _ = pd.factorize(
+        np.concatenate([long_now['strike'].to_numpy(), long_prev['strike'].to_numpy()]),
+        use_na_sentinel=False,
+    )
+    expiry_codes, expiries = pd.factorize(
+        np.concatenate([long_now['expiry'].to_numpy(), long_prev['expiry'].to_numpy()]),
+        use_na_sentinel=False,
+    )
+    is_put = np.concatenate([long_now['option_type'].to_numpy(), long_prev['option_type'].to_numpy()]) == 'put'
+    key = (strike_codes.astype(np.int64) * len(expiries) + expiry_codes) * 2 + is_put
+
+    key_now, key_prev = key[:n_now], key[n_now:]
+    if np.unique(key_now).size != key_now.size or np.unique(key_prev).size != key_prev.size:
+        return None
+    _, idx_now, idx_prev = np.intersect1d(key_now, key_prev, assume_unique=True, return_indices=True)
+    order = np.argsort(idx_now)
+    return idx_now[order], idx_prev[order]
+
+
 def classify_option_flow(df_now: pd.DataFrame, df_prev: pd.DataFrame, index_name: str = "Index") -> Dict[str, Any]:
     """
     Approximates whether calls/puts are being bought or sold
     using IV change + OI change + volume as proxy signals.
     """
-    import numpy as np
-    import pandas as pd
-    
     # ── Normalize Data Structure ──────────────────────────────────────
-    def to_long(df: pd.DataFrame) -> pd.DataFrame:
-        cols = {
-            'strike': 'Strike',
-            'expiry': 'expiry',
-            'iv': 'call_iv',
-            'open_interest': 'call_oi',
-            'volume': 'call_vol',
-            'last_price': 'call_ltp',
-            'spot': 'Spot'
-        }
-        
-        def extract_side(prefix):
-            df_cols_lower = {c.lower(): c for c in df.columns}
-            out = pd.DataFrame(index=df.index)
-            
-            for target, source_base in cols.items():
-                source = source_base
-                if source_base.startswith('call_') and prefix == 'put':
-                    source = f"put_{source_base[5:]}"
-                if source_base in ['Strike', 'Spot', 'expiry']:
-                    source = source_base
-
-                s_lower = source.lower()
-                if s_lower in df_cols_lower:
-                    out[target] = df[df_cols_lower[s_lower]]
-                else:
-                    out[target] = 0
-            
-            out['option_type'] = prefix
-            return out
-
-        return pd.concat([extract_side('call'), extract_side('put')], ignore_index=True)
-
-    long_now = to_long(df_now)
-    long_prev = to_long(df_prev)
+    long_now = _to_long_cached(df_now)
+    long_prev = _to_long_cached(df_prev)
 
     # User's Merge Logic
-    merged = long_now.merge(
-        long_prev[['strike', 'expiry', 'option_type', 'iv', 'open_interest', 'last_price', 'volume']],
-        on=['strike', 'expiry', 'option_type'],
-        suffixes=('_now', '_prev')
-    ).fillna(0)
+    aligned = _align_snapshots(long_now, long_prev)
+    if aligned is None:
+        # Repeated (strike, expiry, side) rows: let merge pair them up
+        merged = long_now.merge(
+            long_prev[['strike', 'expiry', 'option_type', *_PREV_COLS]],
+            on=['strike', 'expiry', 'option_type'],
+            suffixes=('_now', '_prev')
+        ).fillna(0)
+    else:
+        idx_now, idx_prev = aligned
+        data = {
+            (f'{col}_now' if col in _PREV_COLS else col): long_now[col].to_numpy()[idx_now]
+            for col in long_now.columns
+        }
+        for col in _PREV_COLS:
+            data[f'{col}_prev'] = long_prev[col].to_numpy()[idx_prev]
+        merged = pd.DataFrame(data).fillna(0)
+
+    # Signal columns run on the raw arrays (no per-op Series/index
+    # alignment) and go back onto the frame in a single assign below.
+    vol_now  = merged['volume_now'].to_numpy()
+    oi_prev  = merged['open_interest_prev'].to_numpy()
 
     # ── Calculate Incremental Volume ─────────────────────────────────
     # Since snapshots have cumulative volume, we must get the delta
-    merged['incremental_volume'] = (merged['volume_now'] - merged['volume_prev']).clip(lower=0)
+    inc_vol = np.maximum(vol_now - merged['volume_prev'].to_numpy(), 0)
 
     # ── User's Signals ───────────────────────────────────────────────
-    merged['iv_change'] = merged['iv_now'] - merged['iv_prev']
-    merged['oi_change'] = merged['open_interest_now'] - merged['open_interest_prev']
-    merged['vol_intensity'] = merged['incremental_volume'] / merged['open_interest_prev'].replace(0, np.nan)
+    iv_chg = merged['iv_now'].to_numpy() - merged['iv_prev'].to_numpy()
+    oi_chg = merged['open_interest_now'].to_numpy() - oi_prev
+    vol_intensity = np.divide(inc_vol, oi_prev, out=np.full(len(merged), np.nan),
+                              where=oi_prev != 0)
 
     # ── User's Classification Logic ──────────────────────────────────
-    def classify(row):
-        if row['incremental_volume'] <= 0:
-            return 'neutral'
-            
-        iv_up = row['iv_change'] >  0.002
-        iv_dn = row['iv_change'] < -0.002
-        oi_up = row['oi_change'] >  0
-        oi_dn = row['oi_change'] <= 0
-
-        if iv_up and oi_up:
-            return 'bought_to_open'
-        elif iv_up and oi_dn:
-            return 'short_covered'
-        elif iv_dn and oi_up:
-            return 'sold_to_open'
-        elif iv_dn and oi_dn:
-            return 'bought_to_close'
-        else:
-            return 'neutral'
-
-    merged['flow_class'] = merged.apply(classify, axis=1)
+    # Vectorized: one mask per rule instead of a Python call per row.
+    # np.select takes the first matching rule, same order as the old
+    # if/elif chain; no volume (or no rule matched) stays 'neutral'.
+    active = ~(inc_vol <= 0)
+    iv_up = active & (iv_chg >  0.002)
+    iv_dn = active & (iv_chg < -0.002)
+    oi_up = oi_chg >  0
+    oi_dn = oi_chg <= 0
+
+    # Codes into _FLOW_CLASSES: an int8 categorical instead of a string per row
+    flow_class = pd.Categorical.from_codes(np.select(
+        [iv_up & oi_up, iv_up & oi_dn, iv_dn & oi_up, iv_dn & oi_dn],
+        [0, 3, 1, 2],   # bought_to_open, short_covered, sold_to_open, bought_to_close
+        default=4,      # neutral
+    ).astype(np.int8), categories=_FLOW_CLASSES)
 
     # ── Dollar Value ──────────────────────────────────────────────────
-    from core.config import INDICES
-    lot_size = INDICES.get(index_name, {}).get('lot_size', 1)
-    
+    lot_size = LOT_SIZES.get(index_name, 1)
     # We use incremental volume for flow value
-    merged['dollar_flow'] = merged['incremental_volume'] * merged['last_price_now'] * lot_size
+    dollar_flow = inc_vol * merged['last_price_now'].to_numpy() * lot_size
+
+    merged = merged.assign(
+        incremental_volume=inc_vol,
+        iv_change=iv_chg,
+        oi_change=oi_chg,
+        vol_intensity=vol_intensity,
+        flow_class=flow_class,
+        dollar_flow=dollar_flow,
+    )
 
     # ── Aggregate ─────────────────────────────────────────────────────
-    def summarize(df_side):
-        g = df_side.groupby('flow_class')['dollar_flow'].sum()
+    # One pass over (side, class) codes for both sides instead of a groupby
+    # per side; NaN flows are skipped, as groupby().sum() did
+    dollar = np.asarray(dollar_flow, dtype=float)
+    cell   = (merged['option_type'].to_numpy() == 'put') * len(_FLOW_CLASSES) + flow_class.codes
+    valid  = ~np.isnan(dollar)
+    sums   = np.bincount(cell[valid], weights=dollar[valid],
+                         minlength=2 * len(_FLOW_CLASSES)).reshape(2, len(_FLOW_CLASSES))
+
+    def summarize(row):
+        g = dict(zip(_FLOW_CLASSES, row))
         sum_dict = {
             'bought_to_open'  : float(g.get('bought_to_open',   0)),
             'sold_to_open'    : float(g.get('sold_to_open',     0)),
@@ -114,13 +206,12 @@ def classify_option_flow(df_now: pd.DataFrame, df_prev: pd.DataFrame, index_name
             'label': get_flow_label(pressure)
         }
 
-    calls = merged[merged['option_type'] == 'call']
-    puts  = merged[merged['option_type'] == 'put']
-
     return {
-        'calls': summarize(calls),
-        'puts': summarize(puts),
-        'merged': merged.to_dict(orient='records')
+        'calls': summarize(sums[0]),
+        'puts': summarize(sums[1]),
+        # Columnar (column -> ndarray): no per-row dicts; pd.DataFrame()
+        # reads it straight back
+        'merged': {col: merged[col].to_numpy() for col in merged.columns}
     }
 
 def get_flow_label(pressure: float) -> str:
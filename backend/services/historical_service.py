@@ -133,7 +133,7 @@ def get_historical_prices(index_name: str, expiry_date: str, n_files: int = 150)
 
     prices = []
     for f in files:
-        df, error = load_data_file(str(f))
+        df, error = load_data_file(str(f), columns=["Spot"])
         if not error and df is not None and not df.empty:
             prices.append(float(df["Spot"].iloc[0]))
     
@@ -370,7 +370,7 @@ def get_vol_surface_history(index_name: str, expiry_date: str, n_files: int = 10
     iv_grid = [] # List of lists (Outer: Time, Inner: Strike)
 
     for f in files:
-        df, _ = load_data_file(str(f))
+        df, _ = load_data_file(str(f), columns=["Strike", "call_iv", "put_iv"])
         if df is None or df.empty: continue
         
         parts = f.stem.split("_")
@@ -6,6 +6,7 @@ correlates it with gamma levels.
 
 from __future__ import annotations
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 
@@ -18,12 +19,24 @@ PARTICIPANT_CSV = Path("D:/Investments/Participant_Wise_OI/OI_Data/Cumulative_Pa
 
 
 def load_participant_data() -> Optional[pd.DataFrame]:
-    """Load and parse the participant-wise OI CSV."""
-    if not PARTICIPANT_CSV.exists():
+    """Load and parse the participant-wise OI CSV.
+
+    Parsed once per file revision (keyed on mtime); the returned DataFrame
+    is shared between callers, so treat it as read-only.
+    """
+    try:
+        mtime_ns = PARTICIPANT_CSV.stat().st_mtime_ns
+    except OSError:
         logger.warning("[PARTICIPANT] CSV not found at %s", PARTICIPANT_CSV)
         return None
+    return _parse_participant_csv(mtime_ns)
+
+
+@lru_cache(maxsize=1)
+def _parse_participant_csv(mtime_ns: int) -> Optional[pd.DataFrame]:
     try:
-        df = pd.read_csv(PARTICIPANT_CSV)
+        # Arrow's multithreaded reader; the wide numeric table is its best case
+        df = pd.read_csv(PARTICIPANT_CSV, engine="pyarrow")
         df["Date"] = pd.to_datetime(df["Date"], format="%d-%m-%Y", dayfirst=True)
         df = df.sort_values("Date").reset_index(drop=True)
         return df
@@ -77,15 +77,17 @@ def _load_snapshots(files: List[Path], lot_size: int = 75) -> List[Dict[str, Any
             atm_iv = (call_iv + put_iv) / 2.0 if call_iv > 0 and put_iv > 0 else max(call_iv, put_iv)
 
             df_vw = calculate_volume_weighted_gex(df_gex, lot_size=lot_size)
-            top3 = df_vw.nlargest(3, "Abs_GEX")
-            wall_health = []
-            for _, row in top3.iterrows():
-                wall_health.append({
-                    "strike": float(row["Strike"]),
-                    "abs_gex": float(row["Abs_GEX"]),
-                    "vwgex": float(row.get("VWGEX", 0)),
-                    "vol_oi_ratio": float(row.get("vol_oi_ratio", 0)),
-                })
+            top3 = df_vw.nlargest(3, "Abs_GEX").reindex(
+                columns=["Strike", "Abs_GEX", "VWGEX", "vol_oi_ratio"], fill_value=0)
+            wall_health = [
+                {
+                    "strike": float(strike),
+                    "abs_gex": float(abs_gex),
+                    "vwgex": float(vwgex),
+                    "vol_oi_ratio": float(vol_oi),
+                }
+                for strike, abs_gex, vwgex, vol_oi in top3.itertuples(index=False, name=None)
+            ]
 
             df_bu = classify_oi_buildup(df)
             call_buildups = df_bu["call_buildup"].value_counts().to_dict()
@@ -5,25 +5,85 @@ Ported from streamlit_app/modules/api_client.py
 
 from __future__ import annotations
 import calendar
+import hashlib
 import os
+import threading
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 from pathlib import Path
 from typing import Optional, Tuple, List, Union
 
+import numpy as np
+import orjson
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 
 logger = logging.getLogger(__name__)
 
-from core.config import ACCESS_TOKEN, API_URL, CUTOFF_HOUR, DATA_DIR, INDICES
+from core.config import ACCESS_TOKEN, API_URL, CUTOFF_HOUR, DATA_DIR, INDICES, INSTRUMENTS
+
+
+@lru_cache(maxsize=None)
+def _get_session() -> requests.Session:
+    """Shared keep-alive Session: the auto-fetcher hits Upstox for every
+    instrument each cycle, so pooling skips a TCP/TLS handshake per call."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+    ))
+    return session
+
+
+@lru_cache(maxsize=4)
+def _auth_headers(access_token: str) -> dict:
+    """Upstox request headers, built once per token."""
+    return {
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+        "Authorization": f"Bearer {access_token}",
+    }
 
 
 # ---------------------------------------------------------------------------
 # Expiry date helpers
 # ---------------------------------------------------------------------------
 
+def _last_weekday(y: int, m: int, weekday: int):
+    """Date of the last `weekday` (Mon=0) in month m of year y."""
+    _, last = calendar.monthrange(y, m)
+    d = datetime(y, m, last)
+    return (d - timedelta(days=(d.weekday() - weekday) % 7)).date()
+
+
+# { (instrument_key, IST date): [expiry, ...] } — the contract list only
+# changes between sessions, so each instrument asks Upstox once per day.
+# Failed lookups are not kept, so the next call retries the API.
+_expiry_cache: dict = {}
+_expiry_lock = threading.Lock()
+
+
+def _active_expiries_for_day(instrument_key: str, today) -> List[str]:
+    key = (instrument_key, today)
+    with _expiry_lock:
+        hit = _expiry_cache.get(key)
+    if hit is not None:
+        return hit
+    expiries = get_active_expiries(instrument_key)
+    if expiries:
+        with _expiry_lock:
+            for stale in [k for k in _expiry_cache if k[1] != today]:
+                del _expiry_cache[stale]
+            _expiry_cache[key] = expiries
+    return expiries
+
+
 def get_next_expiry(index_name: str, indices: dict = None) -> str:
     """Return next expiry date (YYYY-MM-DD) fetching from Upstox API.
     
@@ -31,14 +91,12 @@ def get_next_expiry(index_name: str, indices: dict = None) -> str:
     For stocks, it fetches expiries for a representative liquid stock (RELIANCE)
     if the index_name is not in the primary index set.
     """
-    import zoneinfo
-    ist = zoneinfo.ZoneInfo("Asia/Kolkata")
+    ist = ZoneInfo("Asia/Kolkata")
     now = datetime.now(ist)
     today = now.date()
     
     if indices is None:
-        from core.config import INDICES, STOCKS
-        indices = {**INDICES, **STOCKS}
+        indices = INSTRUMENTS
 
     index_config = indices.get(index_name)
     if not index_config:
@@ -48,7 +106,7 @@ def get_next_expiry(index_name: str, indices: dict = None) -> str:
     lookup_key = index_config["instrument_key"]
 
     # 2. Try fetching from API
-    api_expiries = get_active_expiries(lookup_key)
+    api_expiries = _active_expiries_for_day(lookup_key, today)
     if api_expiries:
         # Find first expiry >= today (after cutoff, strictly > today if today is expiry)
         for exp_str in api_expiries:
@@ -80,48 +138,34 @@ def get_next_expiry(index_name: str, indices: dict = None) -> str:
     elif expiry_type == "monthly":
         year, month = now.year, now.month
 
-        def last_weekday(y: int, m: int, weekday: int):
-            _, last = calendar.monthrange(y, m)
-            d = datetime(y, m, last)
-            while d.weekday() != weekday:
-                d -= timedelta(days=1)
-            return d.date()
-
-        expiry_date = last_weekday(year, month, expiry_day)
+        expiry_date = _last_weekday(year, month, expiry_day)
 
         if expiry_date == today and now.hour >= CUTOFF_HOUR:
             month += 1
             if month == 13:
                 month, year = 1, year + 1
-            expiry_date = last_weekday(year, month, expiry_day)
+            expiry_date = _last_weekday(year, month, expiry_day)
         elif expiry_date < today:
             month += 1
             if month == 13:
                 month, year = 1, year + 1
-            expiry_date = last_weekday(year, month, expiry_day)
+            expiry_date = _last_weekday(year, month, expiry_day)
 
     elif expiry_type == "monthly_last_tuesday":
         year, month = now.year, now.month
 
-        def last_tuesday(y: int, m: int):
-            _, last = calendar.monthrange(y, m)
-            d = datetime(y, m, last)
-            while d.weekday() != 1:  # Tuesday = 1
-                d -= timedelta(days=1)
-            return d.date()
-
-        expiry_date = last_tuesday(year, month)
+        expiry_date = _last_weekday(year, month, 1)  # Tuesday = 1
 
         if expiry_date == today and now.hour >= CUTOFF_HOUR:
             month += 1
             if month == 13:
                 month, year = 1, year + 1
-            expiry_date = last_tuesday(year, month)
+            expiry_date = _last_weekday(year, month, 1)
         elif expiry_date < today:
             month += 1
             if month == 13:
                 month, year = 1, year + 1
-            expiry_date = last_tuesday(year, month)
+            expiry_date = _last_weekday(year, month, 1)
     else:
         expiry_date = today
 
@@ -132,14 +176,11 @@ def get_active_expiries(instrument_key: str) -> List[str]:
     """Fetch active expiry dates from Upstox for a given instrument."""
     url = "https://api.upstox.com/v2/option/contract"
     params = {"instrument_key": instrument_key}
-    headers = {
-        "Accept": "application/json",
-        "Authorization": f"Bearer {ACCESS_TOKEN}",
-    }
+    headers = _auth_headers(ACCESS_TOKEN)
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = _get_session().get(url, params=params, headers=headers, timeout=10)
         response.raise_for_status()
-        data = response.json().get("data", [])
+        data = orjson.loads(response.content).get("data", [])
         # Extract unique nested expiry dates and sort them
         expiries = sorted(list(set(item.get("expiry") for item in data if item.get("expiry"))))
         return expiries
@@ -152,17 +193,88 @@ def get_active_expiries(instrument_key: str) -> List[str]:
 # API fetch
 # ---------------------------------------------------------------------------
 
+# Per-leg (column suffix, payload section, payload key), in saved column order.
+_LEG_FIELDS = (
+    ("ltp",       "market_data",   "ltp"),
+    ("oi",        "market_data",   "oi"),
+    ("iv",        "option_greeks", "iv"),
+    ("delta",     "option_greeks", "delta"),
+    ("gamma",     "option_greeks", "gamma"),
+    ("theta",     "option_greeks", "theta"),
+    ("vega",      "option_greeks", "vega"),
+    ("vanna",     "option_greeks", "vanna"),
+    ("charm",     "option_greeks", "charm"),
+    ("pop",       "option_greeks", "pop"),
+    ("vol",       "market_data",   "volume"),
+    ("close",     "market_data",   "close"),
+    ("bid_price", "market_data",   "bid_price"),
+    ("bid_qty",   "market_data",   "bid_qty"),
+    ("ask_price", "market_data",   "ask_price"),
+    ("ask_qty",   "market_data",   "ask_qty"),
+    ("prev_oi",   "market_data",   "prev_oi"),
+)
+
+
+def _option_chain_frame(option_data: list) -> pd.DataFrame:
+    """Option-chain entries → one row per strike, sorted by strike.
+
+    Built column by column (one list per output column) rather than a dict
+    per strike, so pandas skips the records → columns transpose.
+    """
+    sections = {}
+    for leg in ("call", "put"):
+        opts = [item[f"{leg}_options"] for item in option_data]
+        sections[leg] = {
+            "market_data":   [o["market_data"] for o in opts],
+            "option_greeks": [o["option_greeks"] for o in opts],
+        }
+    call_md, put_md = sections["call"]["market_data"], sections["put"]["market_data"]
+
+    columns = {
+        "Strike":  [item.get("strike_price") for item in option_data],
+        "Gamma":   [g.get("gamma") for g in sections["call"]["option_greeks"]],
+        "Call_OI": [m.get("oi") for m in call_md],
+        "Put_OI":  [m.get("oi") for m in put_md],
+        "Spot":    [item.get("underlying_spot_price") for item in option_data],
+        "expiry":  [item.get("expiry") for item in option_data],
+        "PCR":     [item.get("pcr") for item in option_data],
+    }
+    for leg, by_section in sections.items():
+        for col, section, key in _LEG_FIELDS:
+            columns[f"{leg}_{col}"] = [d.get(key) for d in by_section[section]]
+    df = pd.DataFrame(columns)
+
+    # OI change column-wise, placed right after each leg's prev_oi; a
+    # missing oi/prev_oi counts as 0 (an all-int leg stays int64)
+    for leg in sections:
+        chg = df[f"{leg}_oi"].fillna(0).to_numpy() - df[f"{leg}_prev_oi"].fillna(0).to_numpy()
+        df.insert(df.columns.get_loc(f"{leg}_prev_oi") + 1, f"{leg}_oi_chg", chg)
+    return df.sort_values("Strike", ignore_index=True)
+
+
+# { (index_name, expiry_date, filter_radius): (etag, body digest, DataFrame) }
+# for the last good primary response. The frame is shared by every caller
+# that gets it back and must not be modified in place (calculate_gex and
+# filter_near_strikes both return new frames).
+_last_chain: dict = {}
+_chain_lock = threading.Lock()
+
+
 def fetch_option_chain_data(
-    index_name: str = "Nifty", expiry_date: Optional[str] = None, indices: Optional[dict] = None
+    index_name: str = "Nifty", expiry_date: Optional[str] = None, indices: Optional[dict] = None,
+    filter_radius: Optional[int] = None,
 ) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
     """Fetch live option chain from Upstox.
 
+    filter_radius keeps only ±filter_radius strikes around the spot (as
+    filter_near_strikes would), applied to the payload before the frame
+    is built; None returns the full chain.
+
     All time-based logic inside this module is now IST-aware to match the
     remote collector and avoid data skew when the backend is running on a
     machine configured with UTC or another timezone.
     """
     if indices is None:
-        from core.config import INDICES
         indices = INDICES
 
     index_config = indices.get(index_name)
@@ -176,18 +288,27 @@ def fetch_option_chain_data(
         "instrument_key": index_config["instrument_key"],
         "expiry_date": expiry_date,
     }
-    headers = {
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-        "Authorization": f"Bearer {ACCESS_TOKEN}",
-    }
+    headers = _auth_headers(ACCESS_TOKEN)
+    chain_key = (index_name, expiry_date, filter_radius)
+    with _chain_lock:
+        last = _last_chain.get(chain_key)
 
     try:
-        # 1. Try explicit expiry first
-        response = requests.get(API_URL, params=params, headers=headers, timeout=15)
+        # 1. Try explicit expiry first (conditional on the last good response)
+        req_headers = headers
+        if last is not None and last[0]:
+            req_headers = {**headers, "If-None-Match": last[0]}
+        response = _get_session().get(API_URL, params=params, headers=req_headers, timeout=15)
+        if response.status_code == 304 and last is not None:
+            return last[2], None
         response.raise_for_status()
-        data = response.json()
+        # No ETag from the server: an identical body still skips parse + build
+        digest = hashlib.blake2b(response.content, digest_size=16).digest()
+        if last is not None and last[1] == digest:
+            return last[2], None
+        data = orjson.loads(response.content)
         option_data = data.get("data", [])
+        from_primary = bool(option_data)
 
         if not option_data:
             # 2. Fallback A: Auto-discovery (Nearest Expiry)
@@ -196,9 +317,9 @@ def fetch_option_chain_data(
             logger.info("[EXPIRY FALLBACK] No data for %s, trying auto-discovery (no expiry_date param)...", expiry_date)
             params_auto = {"instrument_key": index_config["instrument_key"]}
             try:
-                resp_auto = requests.get(API_URL, params=params_auto, headers=headers, timeout=15)
+                resp_auto = _get_session().get(API_URL, params=params_auto, headers=headers, timeout=15)
                 resp_auto.raise_for_status()
-                auto_data = resp_auto.json().get("data", [])
+                auto_data = orjson.loads(resp_auto.content).get("data", [])
                 if auto_data:
                     option_data = auto_data
                     expiry_date = auto_data[0].get("expiry", expiry_date) # Update with what we found
@@ -207,8 +328,7 @@ def fetch_option_chain_data(
 
         if not option_data:
             # 3. Fallback B: Holiday Resilience (+/- 1 day)
-            from datetime import datetime as _dt
-            _orig = _dt.strptime(expiry_date, "%Y-%m-%d").date()
+            _orig = datetime.strptime(expiry_date, "%Y-%m-%d").date()
             holiday_candidates = [
                 (_orig - timedelta(days=1)).strftime("%Y-%m-%d"),
                 (_orig + timedelta(days=1)).strftime("%Y-%m-%d")
@@ -217,9 +337,9 @@ def fetch_option_chain_data(
                 logger.debug("[EXPIRY FALLBACK] Trying holiday candidate: %s", hc)
                 params["expiry_date"] = hc
                 try:
-                    resp_h = requests.get(API_URL, params=params, headers=headers, timeout=15)
+                    resp_h = _get_session().get(API_URL, params=params, headers=headers, timeout=15)
                     resp_h.raise_for_status()
-                    h_data = resp_h.json().get("data", [])
+                    h_data = orjson.loads(resp_h.content).get("data", [])
                     if h_data:
                         option_data = h_data
                         expiry_date = hc
@@ -229,14 +349,12 @@ def fetch_option_chain_data(
 
         if not option_data:
             # 4. Fallback C: Existing week/month shifts (Deep fallbacks)
-            index_config = indices.get(index_name, {})
             expiry_type = index_config.get("expiry_type", "")
             fallback_dates = []
             
             # Generate candidate expiries to try (go backwards first, then forwards)
             if expiry_type == "weekly":
-                from datetime import datetime as _dt
-                _orig = _dt.strptime(expiry_date, "%Y-%m-%d").date()
+                _orig = datetime.strptime(expiry_date, "%Y-%m-%d").date()
                 # Try previous week first, then next week
                 fallback_dates = [
                     (_orig - timedelta(days=7)).strftime("%Y-%m-%d"),
@@ -244,7 +362,6 @@ def fetch_option_chain_data(
                 ]
             elif expiry_type == "monthly" or expiry_type == "monthly_last_tuesday":
                 # For monthly stocks, try previous month and next month
-                import calendar as cal
                 _orig = datetime.strptime(expiry_date, "%Y-%m-%d").date()
                 
                 # Previous month
@@ -259,27 +376,10 @@ def fetch_option_chain_data(
                 else:
                     next_m, next_y = _orig.month + 1, _orig.year
                 
-                if expiry_type == "monthly_last_tuesday":
-                    def last_tuesday(y: int, m: int):
-                        _, last = cal.monthrange(y, m)
-                        d = datetime(y, m, last)
-                        while d.weekday() != 1:
-                            d -= timedelta(days=1)
-                        return d.date()
-                    
-                    prev_expiry = last_tuesday(prev_y, prev_m).strftime("%Y-%m-%d")
-                    next_expiry = last_tuesday(next_y, next_m).strftime("%Y-%m-%d")
-                else:
-                    def last_weekday(y: int, m: int, wd: int):
-                        _, last = cal.monthrange(y, m)
-                        d = datetime(y, m, last)
-                        while d.weekday() != wd:
-                            d -= timedelta(days=1)
-                        return d.date()
-                    
-                    day = index_config.get("expiry_day", 4)  # Default to Friday(4)
-                    prev_expiry = last_weekday(prev_y, prev_m, day).strftime("%Y-%m-%d")
-                    next_expiry = last_weekday(next_y, next_m, day).strftime("%Y-%m-%d")
+                # last Tuesday, or the configured weekday (default Friday)
+                day = 1 if expiry_type == "monthly_last_tuesday" else index_config.get("expiry_day", 4)
+                prev_expiry = _last_weekday(prev_y, prev_m, day).strftime("%Y-%m-%d")
+                next_expiry = _last_weekday(next_y, next_m, day).strftime("%Y-%m-%d")
                 
                 fallback_dates = [prev_expiry, next_expiry]
             
@@ -290,9 +390,9 @@ def fetch_option_chain_data(
                 logger.debug("[EXPIRY FALLBACK] Trying deep candidate: %s", fallback_date)
                 params["expiry_date"] = fallback_date
                 try:
-                    response2 = requests.get(API_URL, params=params, headers=headers, timeout=15)
+                    response2 = _get_session().get(API_URL, params=params, headers=headers, timeout=15)
                     response2.raise_for_status()
-                    option_data = response2.json().get("data", [])
+                    option_data = orjson.loads(response2.content).get("data", [])
                     if option_data:
                         expiry_date = fallback_date
                         logger.info("[EXPIRY FALLBACK] Success with %s", fallback_date)
@@ -303,57 +403,12 @@ def fetch_option_chain_data(
             if not option_data:
                 return None, f"No option chain data available for {index_name} on {expiry_date} or nearby expiries"
 
-        records = []
-        for item in option_data:
-            record = {
-                "Strike": item.get("strike_price"),
-                "Gamma": item["call_options"]["option_greeks"].get("gamma"),
-                "Call_OI": item["call_options"]["market_data"].get("oi"),
-                "Put_OI": item["put_options"]["market_data"].get("oi"),
-                "Spot": item.get("underlying_spot_price"),
-                "expiry": item.get("expiry"),
-                "PCR": item.get("pcr"),
-                "call_ltp": item["call_options"]["market_data"].get("ltp"),
-                "call_oi": item["call_options"]["market_data"].get("oi"),
-                "call_iv": item["call_options"]["option_greeks"].get("iv"),
-                "call_delta": item["call_options"]["option_greeks"].get("delta"),
-                "call_gamma": item["call_options"]["option_greeks"].get("gamma"),
-                "call_theta": item["call_options"]["option_greeks"].get("theta"),
-                "call_vega": item["call_options"]["option_greeks"].get("vega"),
-                "call_vanna": item["call_options"]["option_greeks"].get("vanna"),
-                "call_charm": item["call_options"]["option_greeks"].get("charm"),
-                "call_pop": item["call_options"]["option_greeks"].get("pop"),
-                "call_vol": item["call_options"]["market_data"].get("volume"),
-                "call_close": item["call_options"]["market_data"].get("close"),
-                "call_bid_price": item["call_options"]["market_data"].get("bid_price"),
-                "call_bid_qty": item["call_options"]["market_data"].get("bid_qty"),
-                "call_ask_price": item["call_options"]["market_data"].get("ask_price"),
-                "call_ask_qty": item["call_options"]["market_data"].get("ask_qty"),
-                "call_prev_oi": item["call_options"]["market_data"].get("prev_oi"),
-                "call_oi_chg": (item["call_options"]["market_data"].get("oi") or 0) - (item["call_options"]["market_data"].get("prev_oi") or 0),
-
-                "put_ltp": item["put_options"]["market_data"].get("ltp"),
-                "put_oi": item["put_options"]["market_data"].get("oi"),
-                "put_iv": item["put_options"]["option_greeks"].get("iv"),
-                "put_delta": item["put_options"]["option_greeks"].get("delta"),
-                "put_gamma": item["put_options"]["option_greeks"].get("gamma"),
-                "put_theta": item["put_options"]["option_greeks"].get("theta"),
-                "put_vega": item["put_options"]["option_greeks"].get("vega"),
-                "put_vanna": item["put_options"]["option_greeks"].get("vanna"),
-                "put_charm": item["put_options"]["option_greeks"].get("charm"),
-                "put_pop": item["put_options"]["option_greeks"].get("pop"),
-                "put_vol": item["put_options"]["market_data"].get("volume"),
-                "put_close": item["put_options"]["market_data"].get("close"),
-                "put_bid_price": item["put_options"]["market_data"].get("bid_price"),
-                "put_bid_qty": item["put_options"]["market_data"].get("bid_qty"),
-                "put_ask_price": item["put_options"]["market_data"].get("ask_price"),
-                "put_ask_qty": item["put_options"]["market_data"].get("ask_qty"),
-                "put_prev_oi": item["put_options"]["market_data"].get("prev_oi"),
-                "put_oi_chg": (item["put_options"]["market_data"].get("oi") or 0) - (item["put_options"]["market_data"].get("prev_oi") or 0),
-            }
-            records.append(record)
-
-        df = pd.DataFrame(records).sort_values("Strike").reset_index(drop=True)
+        if filter_radius is not None:
+            option_data = filter_near_items(option_data, filter_radius)
+        df = _option_chain_frame(option_data)
+        if from_primary:
+            with _chain_lock:
+                _last_chain[chain_key] = (response.headers.get("ETag"), digest, df)
         return df, None
 
     except requests.exceptions.RequestException as exc:
@@ -376,16 +431,44 @@ def filter_near_strikes(df: pd.DataFrame, filter_radius: int = 20) -> pd.DataFra
     """
     # use median to be robust to small per-row variations
     ltp = float(df["Spot"].median())
-    all_strikes = sorted(df["Strike"].unique())
-    closest = min(all_strikes, key=lambda x: abs(x - ltp))
-    idx = all_strikes.index(closest)
+    strikes = df["Strike"].to_numpy()
+    window = _strike_window(strikes, ltp, filter_radius)
+    if window is None:
+        return df.iloc[0:0].reset_index(drop=True)
+
+    # The selection is a contiguous run of the sorted grid: a range test
+    # replaces the isin() hash lookup
+    mask = (strikes >= window[0]) & (strikes <= window[1])
+    return df[mask].reset_index(drop=True)
+
+
+def _strike_window(strikes: np.ndarray, ltp: float, filter_radius: int):
+    """(lowest, highest) kept strike for ±filter_radius around ltp, or None."""
+    all_strikes = np.unique(strikes)   # sorted
+    # nearest strike via searchsorted (ties go to the lower strike, as min() did)
+    idx = int(np.searchsorted(all_strikes, ltp))
+    if idx > 0 and (idx == len(all_strikes) or all_strikes[idx] - ltp >= ltp - all_strikes[idx - 1]):
+        idx -= 1
 
     low = max(idx - filter_radius, 0)
     high = min(idx + filter_radius, len(all_strikes))
-    selected = all_strikes[low:high]
+    if low >= high:
+        return None
+    return all_strikes[low], all_strikes[high - 1]
+
+
+def filter_near_items(option_data: list, filter_radius: int = 20) -> list:
+    """Payload twin of filter_near_strikes(): same strikes, picked from the raw
+    option-chain entries so the frame is only built for the kept window."""
+    strikes = np.array([item.get("strike_price") for item in option_data], dtype=float)
+    spots = pd.Series([item.get("underlying_spot_price") for item in option_data], dtype=float)
+    window = _strike_window(strikes, float(spots.median()), filter_radius)
+    if window is None:
+        return []
+    keep = (strikes >= window[0]) & (strikes <= window[1])
+    return [item for item, k in zip(option_data, keep) if k]
 
-    return df[df["Strike"].isin(selected)].reset_index(drop=True)
-# ---------------------------------------------------------------------------
+# ---------------------------------------------------------------------------
 # File I/O
 # ---------------------------------------------------------------------------
 
@@ -413,7 +496,15 @@ def save_data(df: pd.DataFrame, index_name: str, data_dir: Optional[str] = None,
             timestamp = datetime.now(ist).strftime("%d_%H%M%S")
             
         filepath = folder / f"{timestamp}.parquet"
-        df.to_parquet(filepath, engine="pyarrow", index=False)
+        # Write beside the target, then rename: listings and loads running
+        # concurrently never see a half-written snapshot (.tmp isn't listed)
+        tmp_path = folder / f"{timestamp}.parquet.tmp"
+        try:
+            df.to_parquet(tmp_path, engine="pyarrow", compression="zstd", index=False)
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
         
         return str(filepath)
     
@@ -423,15 +514,68 @@ def save_data(df: pd.DataFrame, index_name: str, data_dir: Optional[str] = None,
         raise Exception(error_msg) from exc
 
 
-def load_data_file(filepath: str) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
-    """Load a Parquet file into a DataFrame."""
+def load_data_file(filepath: str, columns: Optional[List[str]] = None) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    """Load a Parquet file into a DataFrame.
+
+    columns restricts the read to those column chunks — history scans over
+    hundreds of snapshots that only need Spot/IV skip decoding the rest.
+    """
     try:
-        df = pd.read_parquet(filepath, engine="pyarrow")
+        df = pd.read_parquet(filepath, engine="pyarrow", columns=columns, memory_map=True)
         return df, None
     except Exception as exc:  # noqa: BLE001
         return None, f"Error loading file: {exc}"
 
 
+@lru_cache(maxsize=64)
+def _load_data_file_at(filepath: str, mtime_ns: int) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    return load_data_file(filepath)
+
+
+def load_data_file_cached(filepath: str, mtime_ns: Optional[int] = None) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    """load_data_file() memoised on (path, mtime) — a rewritten file is re-read.
+
+    Pass mtime_ns if the caller has just stat'ed the file, to skip a second stat.
+    The returned DataFrame is shared between callers; treat it as read-only.
+    """
+    if mtime_ns is None:
+        try:
+            mtime_ns = os.stat(filepath).st_mtime_ns
+        except OSError as exc:
+            return None, f"Error loading file: {exc}"
+    return _load_data_file_at(filepath, mtime_ns)
+
+
+# { folder path: (st_mtime_ns, names) } — a folder's mtime moves whenever a
+# snapshot is added, renamed into place or removed, so an unchanged folder
+# is answered from here with one stat instead of a full listing.
+_names_cache: dict = {}
+# A file added in the same timestamp tick as the listing leaves the mtime
+# unchanged, so a listing is only cached once the folder's mtime is older
+# than this (2 s covers FAT/SMB granularity as well as ext4/NTFS).
+_MTIME_SETTLE_NS = 2_000_000_000
+
+
+def _snapshot_names(folder: os.DirEntry) -> List[str]:
+    """Snapshot (*.parquet) file names in folder, newest first.
+
+    Names start with a %d_%H%M%S timestamp, so a plain string sort orders
+    them; scandir's dirent types avoid a stat() per entry.
+    """
+    mtime_ns = folder.stat().st_mtime_ns
+    hit = _names_cache.get(folder.path)
+    if hit is None or hit[0] != mtime_ns:
+        with os.scandir(folder.path) as it:
+            names = [e.name for e in it if e.name.endswith(".parquet") and e.is_file()]
+        names.sort(reverse=True)
+        hit = (mtime_ns, names)
+        if time.time_ns() - mtime_ns > _MTIME_SETTLE_NS:
+            _names_cache[folder.path] = hit
+        else:
+            _names_cache.pop(folder.path, None)
+    return list(hit[1])   # callers get their own list
+
+
 def get_available_files(index_name: str, data_dir: Optional[str] = None) -> dict:
     """
     Return dict of { expiry_date: [filename, ...] } for the given index.
@@ -445,22 +589,24 @@ def get_available_files(index_name: str, data_dir: Optional[str] = None) -> dict
     # New structure: data/INDEX/EXPIRY/
     index_path = data_path / index_name
     if index_path.exists():
-        for expiry_folder in index_path.iterdir():
-            if expiry_folder.is_dir():
-                csv_files = sorted(expiry_folder.glob("*.parquet"), reverse=True)
-                if csv_files:
-                    files_dict[expiry_folder.name] = [f.name for f in csv_files]
+        with os.scandir(index_path) as it:
+            for entry in it:
+                if entry.is_dir():
+                    names = _snapshot_names(entry)
+                    if names:
+                        files_dict[entry.name] = names
 
     # Legacy structure: data/EXPIRY/ (Nifty only, backward compat)
     if index_name == "Nifty" and data_path.exists():
-        for expiry_folder in data_path.iterdir():
-            if expiry_folder.is_dir() and expiry_folder.name not in files_dict:
-                try:
-                    datetime.strptime(expiry_folder.name, "%Y-%m-%d")
-                    csv_files = sorted(expiry_folder.glob("*.parquet"), reverse=True)
-                    if csv_files:
-                        files_dict[expiry_folder.name] = [f.name for f in csv_files]
-                except ValueError:
-                    pass
+        with os.scandir(data_path) as it:
+            for entry in it:
+                if entry.is_dir() and entry.name not in files_dict:
+                    try:
+                        datetime.strptime(entry.name, "%Y-%m-%d")
+                    except ValueError:
+                        continue
+                    names = _snapshot_names(entry)
+                    if names:
+                        files_dict[entry.name] = names
 
     return files_dict
@@ -4,43 +4,90 @@ Acts as a lightweight session replacement for Streamlit's session_state.
 """
 
 from __future__ import annotations
+import threading
+from collections import namedtuple
+from itertools import count
 from pathlib import Path
 from typing import Optional
 import pandas as pd
 import logging
 
+from core.config import INDICES, STOCKS, DATA_DIR
+from services.calculations import calculate_gex
+from services.upstox_service import get_available_files, load_data_file
+
 logger = logging.getLogger(__name__)
 
-# { index_name: {"df": DataFrame, "filepath": str} }
+# Immutable per-index record: a reader that grabbed one keeps a consistent
+# (df, filepath) pair while a writer swaps in the next.
+Entry = namedtuple("Entry", "df filepath")
+
+# { index_name: Entry }
 _store: dict = {}
 
+# { index_name: int } — bumped on every set/clear, from one global counter so
+# a number is never reused. Routers key derived-payload caches on it.
+_versions: dict = {}
+_version_seq = count(1)
+
+# { index_name: {key: value} } — values derived from the active DataFrame
+# (exposure frames, ...). Replaced, not cleared, on every set/clear so a
+# computation that straddles a reload lands in the discarded dict.
+_derived: dict = {}
+
+# Writers swap entry, version and derived dict together; readers take the
+# lock only for a dict lookup, never while a DataFrame is being built.
+_lock = threading.RLock()
+
 
 def set_data(index_name: str, df: pd.DataFrame, filepath: str = "") -> None:
-    _store[index_name] = {"df": df, "filepath": filepath}
+    entry = Entry(df, filepath)
+    with _lock:
+        _store[index_name] = entry
+        _versions[index_name] = next(_version_seq)
+        _derived[index_name] = {}
+
+
+def get_or_compute(index_name: str, key, fn):
+    """Return fn() memoized under key for the currently loaded DataFrame."""
+    with _lock:
+        derived = _derived.setdefault(index_name, {})
+    if key not in derived:
+        derived[key] = fn()
+    return derived[key]
+
+
+def version(index_name: str) -> int:
+    """Monotonic snapshot id for index_name (0 if nothing was ever loaded)."""
+    return _versions.get(index_name, 0)
 
 
 def get_data(index_name: str) -> Optional[pd.DataFrame]:
-    entry = _store.get(index_name)
-    return entry["df"] if entry else None
+    with _lock:
+        entry = _store.get(index_name)
+    return entry.df if entry else None
 
 
 def get_filepath(index_name: str) -> str:
-    entry = _store.get(index_name)
-    return entry["filepath"] if entry else ""
+    with _lock:
+        entry = _store.get(index_name)
+    return entry.filepath if entry else ""
 
 
 def clear_data(index_name: str) -> None:
-    _store.pop(index_name, None)
+    with _lock:
+        _store.pop(index_name, None)
+        _versions[index_name] = next(_version_seq)
+        _derived[index_name] = {}
 
 
 def has_data(index_name: str) -> bool:
-    return index_name in _store and _store[index_name]["df"] is not None
+    with _lock:
+        entry = _store.get(index_name)
+    return entry is not None and entry.df is not None
 
 def initialize_from_disk() -> None:
     """Bootstrap the store by loading the latest file for each index/stock from disk."""
-    from core.config import INDICES, STOCKS, DATA_DIR
-    from services.upstox_service import get_available_files, load_data_file
-    from services.calculations import calculate_gex
     
     logger.info("[BOOTSTRAP] Initializing store from disk...")
     
@@ -52,7 +99,7 @@ def initialize_from_disk() -> None:
                 continue
                 
             # Get latest expiry and latest file
-            latest_expiry = sorted(files_dict.keys(), reverse=True)[0]
+            latest_expiry = max(files_dict)
             latest_file = files_dict[latest_expiry][0]
             
             filepath = Path(DATA_DIR) / index_name / latest_expiry / latest_file
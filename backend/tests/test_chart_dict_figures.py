@@ -0,0 +1,142 @@
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import orjson
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+# Add backend to sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services import chart_service as cs
+
+SPOT  = 22510.0
+FLIP  = 22500.0
+ZONES = [22100.0, 22600.0, 22900.0]
+BW    = 40.0   # 0.8 * the 50-point strike step
+
+
+def _frame():
+    strikes = np.arange(22000.0, 23050.0, 50.0)
+    rng = np.random.default_rng(7)
+    net = rng.normal(size=strikes.size) * 1e6
+    df = pd.DataFrame({"Strike": strikes, "Spot": SPOT, "Total_GEX": net})
+    df["Call_GEX"] = np.abs(net) * 1.3
+    df["Put_GEX"]  = -np.abs(net) * 0.7
+    df["Abs_GEX"]  = df["Call_GEX"] - df["Put_GEX"]
+    return df
+
+
+def _plain(fig):
+    return orjson.loads(orjson.dumps(fig, option=orjson.OPT_SERIALIZE_NUMPY))
+
+
+def _assert_same_figure(got, ref):
+    """Same traces and layout; numeric arrays only to float32 precision."""
+    got, ref = _plain(got), _plain(ref)
+    assert len(got["data"]) == len(ref["data"])
+    for g, r in zip(got["data"], ref["data"]):
+        assert g.keys() == r.keys()
+        for key in g:
+            if key == "y":
+                np.testing.assert_allclose(g[key], r[key], rtol=1e-6)
+            else:
+                assert g[key] == r[key], key
+    assert got["layout"].keys() == ref["layout"].keys()
+    for key in got["layout"]:
+        assert got["layout"][key] == ref["layout"][key], key
+
+
+def _go_markers(fig, zones=()):
+    for x, label, color, dash in [
+        (SPOT, f"SPOT: {SPOT:.0f}", cs.C_SPOT, "solid"),
+        (FLIP, f"ZERO: {FLIP:.0f}", cs.C_FLIP, "dot"),
+    ]:
+        fig.add_vline(x=x, line_color=color, line_dash=dash, line_width=1.5,
+                      annotation_text=label, annotation_font_color=color,
+                      annotation_position="top left", annotation_font_size=10)
+    for z in zones:
+        fig.add_vrect(x0=z - BW / 2, x1=z + BW / 2,
+                      fillcolor=cs.C_ZONE, layer="below", line_width=0)
+
+
+def _go_bars(fig, df, mode):
+    x = df["Strike"].tolist()
+    if mode == "net":
+        bars = [
+            (df["Total_GEX"].clip(lower=0), BW, cs.C_POS, "+Dealer Gamma"),
+            (df["Total_GEX"].clip(upper=0), BW, cs.C_NEG, "-Dealer Gamma"),
+        ]
+    else:
+        bars = [
+            ( df["Call_GEX"].abs(), BW * 0.9, cs.C_POS, "Dealer Call Gamma ↑"),
+            (-df["Put_GEX"].abs(),  BW * 0.9, cs.C_NEG, "Dealer Put Gamma ↓"),
+        ]
+    for y, width, color, name in bars:
+        fig.add_trace(go.Bar(x=x, y=y.tolist(), width=width, marker_color=color,
+                             name=name, opacity=0.9), secondary_y=False)
+
+
+def _go_strike_layout(title):
+    layout = cs._base_layout(title)
+    layout["xaxis"]["tickmode"]  = "linear"
+    layout["xaxis"]["dtick"]     = 50.0
+    layout["xaxis"]["tickangle"] = -45
+    layout["barmode"] = "overlay"
+    return layout
+
+
+def test_exposure_chart_matches_graph_objects():
+    df = _frame()
+    for mode, title in [("net", "Nifty — Dealer Gamma Exposure"),
+                        ("split", "Nifty — Dealer Call vs Put Gamma")]:
+        got = cs._build_exposure_chart(
+            df, "Nifty", mode, "Total_GEX", "Call_GEX", "Put_GEX", "Abs_GEX",
+            "Gamma", "Dealer GEX", flip=FLIP, top_zones=ZONES,
+        )
+
+        fig = make_subplots(specs=[[{"secondary_y": True}]])
+        _go_bars(fig, df, mode)
+        fig.add_trace(go.Scatter(
+            x=df["Strike"].tolist(), y=df["Abs_GEX"].tolist(),
+            fill="tozeroy", fillcolor=cs.C_ABS,
+            line=dict(color="rgba(168,85,247,0.4)", width=2),
+            name="Absolute Dealer Gamma Heat", mode="lines",
+        ), secondary_y=True)
+        _go_markers(fig, ZONES)
+        layout = _go_strike_layout(title)
+        layout["yaxis2"] = dict(gridcolor=cs.GRID_CLR, zeroline=False, title="Absolute Dealer Gamma")
+        layout["yaxis"]["title"] = "Dealer GEX"
+        fig.update_layout(**layout)
+
+        _assert_same_figure(got, fig.to_dict())
+
+
+def test_cumulative_exposure_chart_matches_graph_objects():
+    # Shuffled rows exercise the strike-order path
+    df = _frame().sample(frac=1.0, random_state=3)
+    got = cs._build_cumulative_exposure_chart(
+        df, "Nifty", "net", "Total_GEX", "Call_GEX", "Put_GEX", "Cum_GEX",
+        "Gamma", flip=FLIP,
+    )
+
+    df_sorted = df.sort_values("Strike", kind="stable")
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    _go_bars(fig, df_sorted, "net")
+    fig.add_trace(go.Scatter(
+        x=df_sorted["Strike"].tolist(), y=df_sorted["Total_GEX"].cumsum().tolist(),
+        fill="tozeroy", fillcolor="rgba(99, 102, 241, 0.1)",
+        line=dict(color=cs.C_POS, width=3),
+        name="Cumulative Dealer Gamma", mode="lines",
+    ), secondary_y=True)
+    _go_markers(fig)
+    layout = _go_strike_layout("Nifty — Cumulative Dealer Gamma Profile")
+    layout["yaxis"]["title"] = "Strike-wise Dealer Gamma"
+    layout["yaxis2"] = dict(gridcolor=cs.GRID_CLR, zeroline=True, title="Cumulative Dealer Gamma",
+                            overlaying="y", side="right")
+    fig.update_layout(**layout)
+
+    _assert_same_figure(got, fig.to_dict())
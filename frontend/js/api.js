@@ -71,7 +71,7 @@ const API = {
 
   // ── Charts ──────────────────────────────────────────────
 
-  /** GET /api/charts/{index}/{chart_type}?mode=net|raw → { figure: "plotly-json-string" } */
+  /** GET /api/charts/{index}/{chart_type}?mode=net|raw → { figure: {data, layout}, summary? } */
   getChart: (index, chartType, mode = 'net') =>
     apiFetch(`/api/charts/${index}/${chartType}?mode=${mode}`),
 